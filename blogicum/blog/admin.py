@@ -1,16 +1,141 @@
+from urllib.parse import urlencode
+
 from django.contrib import admin
+from django.forms.models import BaseInlineFormSet
+from django.http import StreamingHttpResponse
+from django.urls import reverse
+from django.utils.html import format_html
 
+import blogicum.constans as const
+from . import export, search
+from .filters import AuthorFilter, CategoryFilter, LocationFilter, SlugFilter
 from .models import Category, Comment, Location, Post
+from .moderation import set_comments_published, set_posts_published
+from .pagination import EstimatedCountPaginator
+from .widgets import AutocompleteFormMixin, AutocompleteSelect
 
 admin.site.empty_value_display = 'Не задано'
 
+AUTOCOMPLETE_KINDS = {
+    'author': 'authors',
+    'category': 'categories',
+    'location': 'locations',
+}
+
+
+class CappedInlineFormSet(BaseInlineFormSet):
+    """Показывает не больше const.ADMIN_INLINE_POSTS последних постов."""
+
+    def get_queryset(self):
+        if not hasattr(self, '_capped_queryset'):
+            self._capped_queryset = super().get_queryset()[
+                :const.ADMIN_INLINE_POSTS
+            ]
+        return self._capped_queryset
+
 
-class PostInline(admin.StackedInline):
+class PostInline(admin.TabularInline):
     model = Post
+    formset = CappedInlineFormSet
+    fields = readonly_fields = ('title', 'pub_date', 'is_published', 'author')
+    extra = 0
+    max_num = 0
+    can_delete = False
+    show_change_link = True
+    verbose_name_plural = (
+        f'Последние публикации (не больше {const.ADMIN_INLINE_POSTS})'
+    )
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related('author')
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+class ModerationActionsMixin:
+    """Массовая публикация выбранных записей пачками UPDATE."""
+
+    actions = ('publish_selected', 'hide_selected')
+    moderate = None
+
+    def _moderate(self, request, queryset, is_published):
+        updated = self.moderate(queryset, is_published)
+        self.message_user(request, f'Изменено записей: {updated}.')
+
+    @admin.action(description='Опубликовать выбранные')
+    def publish_selected(self, request, queryset):
+        self._moderate(request, queryset, True)
+
+    @admin.action(description='Снять с публикации выбранные')
+    def hide_selected(self, request, queryset):
+        self._moderate(request, queryset, False)
+
+
+class ExportActionsMixin:
+    """Выгрузка выбранных записей потоком, без сборки файла в памяти."""
+
+    actions = ('export_csv', 'export_jsonl')
+
+    def _export(self, queryset, export_format):
+        content_type, extension = export.FORMATS[export_format]
+        response = StreamingHttpResponse(
+            export.stream(queryset, export_format),
+            content_type=f'{content_type}; charset=utf-8'
+        )
+        filename = f'{queryset.model._meta.model_name}s.{extension}'
+        response['Content-Disposition'] = (
+            f'attachment; filename="{filename}"'
+        )
+        return response
+
+    @admin.action(description='Выгрузить выбранные в CSV')
+    def export_csv(self, request, queryset):
+        return self._export(queryset, 'csv')
+
+    @admin.action(description='Выгрузить выбранные в JSONL')
+    def export_jsonl(self, request, queryset):
+        return self._export(queryset, 'jsonl')
+
+
+class RelatedPostsAdmin(admin.ModelAdmin):
+    """Посты связанной записи: короткий список и ссылка на все."""
+
+    related_lookup = None
+    inlines = (
+        PostInline,
+    )
+    readonly_fields = ('all_posts',)
+    actions = ('publish_posts', 'hide_posts')
+
+    @admin.display(description='Все публикации')
+    def all_posts(self, obj):
+        if obj.pk is None:
+            return self.get_empty_value_display()
+        url = reverse('admin:blog_post_changelist')
+        return format_html(
+            '<a href="{}?{}">Открыть список</a>',
+            url, urlencode({f'{self.related_lookup}__id__exact': obj.pk})
+        )
+
+    def _set_posts_published(self, request, queryset, is_published):
+        updated = set_posts_published(
+            Post.objects.filter(**{f'{self.related_lookup}__in': queryset}),
+            is_published
+        )
+        self.message_user(request, f'Изменено публикаций: {updated}.')
+
+    @admin.action(description='Опубликовать все посты')
+    def publish_posts(self, request, queryset):
+        self._set_posts_published(request, queryset, True)
+
+    @admin.action(description='Снять с публикации все посты')
+    def hide_posts(self, request, queryset):
+        self._set_posts_published(request, queryset, False)
 
 
 @admin.register(Category)
-class CategoryAdmin(admin.ModelAdmin):
+class CategoryAdmin(RelatedPostsAdmin):
     list_display = (
         'title',
         'slug',
@@ -20,15 +145,13 @@ class CategoryAdmin(admin.ModelAdmin):
     search_fields = ('title',)
     list_filter = (
         'is_published',
-        'slug'
-    )
-    inlines = (
-        PostInline,
+        SlugFilter
     )
+    related_lookup = 'category'
 
 
 @admin.register(Location)
-class LocationAdmin(admin.ModelAdmin):
+class LocationAdmin(RelatedPostsAdmin):
     list_display = (
         'name',
         'is_published'
@@ -36,13 +159,13 @@ class LocationAdmin(admin.ModelAdmin):
     list_editable = ('is_published',)
     search_fields = ('name',)
     list_filter = ('is_published',)
-    inlines = (
-        PostInline,
-    )
+    related_lookup = 'location'
 
 
 @admin.register(Post)
-class PostAdmin(admin.ModelAdmin):
+class PostAdmin(
+        ModerationActionsMixin, ExportActionsMixin, admin.ModelAdmin
+):
     date_hierarchy = 'pub_date'
     list_display = (
         'title',
@@ -57,16 +180,47 @@ class PostAdmin(admin.ModelAdmin):
         'is_published',
         'category'
     )
+    list_select_related = ('author', 'location', 'category')
     search_fields = ('title',)
     list_filter = (
         'is_published',
-        'category',
-        'location'
+        CategoryFilter,
+        LocationFilter,
+        AuthorFilter
     )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ModerationActionsMixin.actions + ExportActionsMixin.actions
+    moderate = staticmethod(set_posts_published)
+
+    def get_changelist_form(self, request, **kwargs):
+        form = super().get_changelist_form(request, **kwargs)
+        return type(form.__name__, (AutocompleteFormMixin, form), {})
+
+    def get_form(self, request, obj=None, **kwargs):
+        form = super().get_form(request, obj, **kwargs)
+        return type(form.__name__, (AutocompleteFormMixin, form), {})
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name in AUTOCOMPLETE_KINDS:
+            kwargs['widget'] = AutocompleteSelect(
+                AUTOCOMPLETE_KINDS[db_field.name], include_hidden=True
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
+
+    def get_search_results(self, request, queryset, search_term):
+        match = search.match_expression(search_term)
+        if not match or not search.is_available():
+            return super().get_search_results(
+                request, queryset, search_term
+            )
+        return queryset.filter(id__in=search.matching_ids(match)), False
 
 
 @admin.register(Comment)
-class CommentAdmin(admin.ModelAdmin):
+class CommentAdmin(
+        ModerationActionsMixin, ExportActionsMixin, admin.ModelAdmin
+):
     list_display = (
         'text',
         'is_published',
@@ -78,3 +232,8 @@ class CommentAdmin(admin.ModelAdmin):
     list_filter = (
         'is_published',
     )
+    list_select_related = ('author',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = ModerationActionsMixin.actions + ExportActionsMixin.actions
+    moderate = staticmethod(set_comments_published)
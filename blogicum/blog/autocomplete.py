@@ -0,0 +1,63 @@
+import time
+from functools import lru_cache
+
+from django.db.models import Q
+
+import blogicum.constans as const
+from .models import Category, Location, User
+
+# Вид подсказки: модель, поле для поиска по началу и фильтр «видимых».
+SOURCES = {
+    'categories': (Category, 'title', Q(is_published=True)),
+    'locations': (Location, 'name', Q(is_published=True)),
+    'authors': (User, 'username', Q(is_active=True)),
+}
+# Выше любого символа в UTF-8: граница диапазона для поиска по началу.
+MAX_CHAR = '\U0010ffff'
+
+_generation = 0
+
+
+def invalidate():
+    global _generation
+    _generation += 1
+
+
+def prefix_filter(field, prefix):
+    """Поиск по началу строки диапазоном, который обслуживает индекс.
+
+    LIKE в SQLite не различает регистр только для латиницы и не идёт
+    по обычному индексу, поэтому перебираем частые варианты регистра.
+    """
+    condition = Q()
+    for variant in {prefix, prefix.lower(), prefix.capitalize()}:
+        condition |= Q(**{
+            f'{field}__gte': variant, f'{field}__lt': variant + MAX_CHAR
+        })
+    return condition
+
+
+@lru_cache(maxsize=const.AUTOCOMPLETE_CACHE_SIZE)
+def _lookup(kind, prefix, page, include_hidden, generation, ttl_bucket):
+    model, field, visible = SOURCES[kind]
+    queryset = model.objects.all() if include_hidden else model.objects.filter(
+        visible
+    )
+    if prefix:
+        queryset = queryset.filter(prefix_filter(field, prefix))
+    size = const.AUTOCOMPLETE_PAGE_SIZE
+    offset = (page - 1) * size
+    rows = tuple(
+        queryset.order_by(field, 'pk').values_list('pk', field)[
+            offset:offset + size + 1
+        ]
+    )
+    return rows[:size], len(rows) > size
+
+
+def lookup(kind, prefix, page=1, include_hidden=False):
+    """Подсказки в виде ((pk, текст), ...) и признак следующей страницы."""
+    return _lookup(
+        kind, prefix.strip()[:const.MAX_LENGTH], page, include_hidden,
+        _generation, int(time.monotonic() // const.AUTOCOMPLETE_CACHE_TTL)
+    )
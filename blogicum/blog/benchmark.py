@@ -0,0 +1,332 @@
+import math
+import platform
+import time
+from statistics import median
+
+import django
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count
+from django.test import Client, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import urlencode
+
+import blogicum.constans as const
+from blog import urls as blog_urls
+from core.timing import measure
+from pages import urls as pages_urls
+from . import search
+from .cache import invalidate_pages
+from .models import Category, Comment, Post, User
+from .pagination import CursorPaginator
+from .views import (
+    CategoryPostsListView, PostListView, PostSearchView, ProfileDetailView
+)
+
+USERS = ('anonymous', 'authenticated')
+PAGES = ('first', 'middle', 'last')
+
+
+def percentile(values, share):
+    """Ближайший ранг: значение, не меньше которого share всех замеров."""
+    ordered = sorted(values)
+    return ordered[max(math.ceil(share * len(ordered)) - 1, 0)]
+
+
+def _url(name, query=None, **kwargs):
+    url = reverse(name, kwargs=kwargs)
+    return f'{url}?{urlencode(query)}' if query else url
+
+
+def _page_numbers(total, per_page):
+    pages = max(math.ceil(total / per_page), 1)
+    return pages, (pages + 1) // 2
+
+
+def _offset_pages(name, total, per_page, query=None, **kwargs):
+    """Первая страница — как её открывают по ссылке, дальше ?page=N."""
+    query = query or {}
+    _, middle = _page_numbers(total, per_page)
+    return [
+        ('first', _url(name, query, **kwargs)),
+        ('middle', _url(name, dict(query, page=middle), **kwargs)),
+        ('last', _url(name, dict(query, page='last'), **kwargs)),
+    ]
+
+
+def _cursor_pages(name, queryset, per_page, ordering, query=None,
+                  cursor='after', offset=True, **kwargs):
+    """Страницы, как по ним переходят в интерфейсе: по курсору.
+
+    Курсор средней и последней страницы — последняя запись перед ней.
+    С offset добавляется средняя страница через ?page=N: на неё
+    ведут старые ссылки.
+    """
+    query = query or {}
+    queryset = queryset.order_by(*ordering)
+    pages, middle = _page_numbers(queryset.count(), per_page)
+    paginator = CursorPaginator(queryset, per_page, ordering)
+    cases = []
+    for page, number in zip(PAGES, (1, middle, pages)):
+        page_query = query
+        if number > 1:
+            page_query = dict(query, **{cursor: paginator.encode(
+                queryset[(number - 1) * per_page - 1]
+            )})
+        cases.append((page, _url(name, page_query, **kwargs)))
+    if offset:
+        cases.append(
+            ('offset', _url(name, dict(query, page=middle), **kwargs))
+        )
+    return cases
+
+
+class Subjects:
+    """Объекты, на которых меряются страницы с параметрами в адресе.
+
+    Берутся самые тяжёлые случаи: пост с наибольшим числом
+    комментариев, его автор и самая большая категория.
+    """
+
+    def __init__(self):
+        self.post = Post.published_posts.order_by(
+            '-comment_count', 'pk'
+        ).select_related('author').first()
+        largest = Post.published_posts.filter(
+            category__isnull=False
+        ).order_by().values('category').annotate(
+            total=Count('pk')
+        ).order_by('-total').first()
+        if self.post is None or largest is None:
+            raise ValueError(
+                'Для замеров нужен видимый пост в видимой категории.'
+            )
+        self.user = self.post.author
+        self.comment = (
+            Comment.objects.filter(author=self.user).order_by('pk').first()
+            or Comment.objects.order_by('pk').first()
+        )
+        if self.comment is None:
+            raise ValueError('Для замеров нужен хотя бы один комментарий.')
+        self.category = Category.objects.get(pk=largest['category'])
+        self.query = max(self.post.title.split(), key=len)
+
+    def index(self, authenticated):
+        return _cursor_pages(
+            'blog:index', Post.published_posts.all(),
+            const.COUNT_POSTS_ON_PAGE, PostListView.cursor_ordering
+        )
+
+    def category_posts(self, authenticated):
+        return _cursor_pages(
+            'blog:category_posts',
+            Post.published_posts.filter(category=self.category),
+            const.COUNT_POSTS_ON_PAGE, CategoryPostsListView.cursor_ordering,
+            category_slug=self.category.slug
+        )
+
+    def profile(self, authenticated):
+        # Автор видит на своей странице и скрытые посты.
+        manager = 'objects' if authenticated else 'published_posts'
+        return _cursor_pages(
+            'blog:profile', self.user.posts(manager=manager).all(),
+            const.COUNT_POSTS_ON_PAGE, ProfileDetailView.cursor_ordering,
+            username=self.user.username
+        )
+
+    def post_detail(self, authenticated):
+        return _cursor_pages(
+            'blog:post_detail', self.post.comments.filter(is_published=True),
+            const.COUNT_COMMENTS_ON_PAGE, ('created_at', 'id'),
+            cursor='comments_after', offset=False, post_id=self.post.pk
+        )
+
+    def search(self, authenticated):
+        query = {'q': self.query}
+        match = search.match_expression(self.query)
+        if not match or not search.is_available():
+            # Без индекса поиск пуст: все страницы одинаковы.
+            return _offset_pages(
+                'blog:search', 0, const.COUNT_POSTS_ON_PAGE, query
+            )
+        return _cursor_pages(
+            'blog:search',
+            search.search(Post.published_posts.all(), match),
+            const.COUNT_POSTS_ON_PAGE, PostSearchView.cursor_ordering, query
+        )
+
+    def autocomplete(self, authenticated):
+        return _offset_pages(
+            'blog:autocomplete',
+            Category.objects.filter(is_published=True).count(),
+            const.AUTOCOMPLETE_PAGE_SIZE, kind='categories'
+        )
+
+    def edit_post(self, authenticated):
+        return [('first', _url('blog:edit_post', post_id=self.post.pk))]
+
+    def delete_post(self, authenticated):
+        return [('first', _url('blog:delete_post', post_id=self.post.pk))]
+
+    def add_comment(self, authenticated):
+        # Форма комментария открывается на странице поста, а сам адрес
+        # принимает только отправку формы.
+        return []
+
+    def edit_comment(self, authenticated):
+        return [('first', _url(
+            'blog:edit_comment', post_id=self.comment.post_id,
+            comment_id=self.comment.pk
+        ))]
+
+    def delete_comment(self, authenticated):
+        return [('first', _url(
+            'blog:delete_comment', post_id=self.comment.post_id,
+            comment_id=self.comment.pk
+        ))]
+
+    def edit_profile(self, authenticated):
+        return [('first', _url('blog:edit_profile'))]
+
+    def create_post(self, authenticated):
+        return [('first', _url('blog:create_post'))]
+
+    def cache_metrics(self, authenticated):
+        return [('first', _url('blog:cache_metrics'))]
+
+    def about(self, authenticated):
+        return [('first', _url('pages:about'))]
+
+    def rules(self, authenticated):
+        return [('first', _url('pages:rules'))]
+
+
+def route_names():
+    return [
+        pattern.name
+        for module in (blog_urls, pages_urls)
+        for pattern in module.urlpatterns
+    ]
+
+
+def uncovered_routes():
+    """Маршруты из blog/urls.py и pages/urls.py, которые не меряются."""
+    return [name for name in route_names() if not hasattr(Subjects, name)]
+
+
+def build_cases(subjects=None):
+    """Пары (ключ, адрес) для каждого маршрута, вида входа и страницы.
+
+    Меряются только GET: формы открываются, но не отправляются, чтобы
+    замер не менял данные.
+    """
+    subjects = subjects or Subjects()
+    cases = []
+    for user in USERS:
+        for name in route_names():
+            for page, url in getattr(subjects, name)(user != 'anonymous'):
+                cases.append(((user, name, page), url))
+    return cases, subjects
+
+
+def _request(client, url):
+    with measure() as timings:
+        start = time.perf_counter()
+        response = client.get(url)
+        body = (
+            b''.join(response.streaming_content) if response.streaming
+            else response.content
+        )
+        elapsed = time.perf_counter() - start
+    return response.status_code, len(body), elapsed, timings
+
+
+def run(repeat=const.BENCHMARK_REPEAT, warmup=1, cold_cache=True,
+        progress=None):
+    """Прогоняет все случаи; возвращает результаты для сохранения в JSON.
+
+    Время — в миллисекундах, запросы к БД — наибольшее число за прогон.
+    С cold_cache кеш страниц сбрасывается перед каждым запросом, иначе
+    анонимные страницы после разогрева отдаются из кеша.
+    """
+    cases, subjects = build_cases()
+    clients = {
+        'anonymous': Client(raise_request_exception=False),
+        'authenticated': Client(raise_request_exception=False),
+    }
+    clients['authenticated'].force_login(subjects.user)
+    results = {}
+    with override_settings(
+        DEBUG=False, ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver']
+    ):
+        for (user, name, page), url in cases:
+            samples = []
+            for attempt in range(warmup + repeat):
+                if cold_cache:
+                    invalidate_pages()
+                sample = _request(clients[user], url)
+                if attempt >= warmup:
+                    samples.append(sample)
+            latencies = [elapsed * 1000 for _, _, elapsed, _ in samples]
+            key = f'{user} {name} {page}'
+            results[key] = {
+                'url': url,
+                'status': samples[-1][0],
+                'p50_ms': round(median(latencies), 3),
+                'p95_ms': round(percentile(latencies, 0.95), 3),
+                'queries': max(timings.queries for *_, timings in samples),
+                'db_ms': round(median(
+                    timings.db_time * 1000 for *_, timings in samples
+                ), 3),
+                'template_ms': round(median(
+                    timings.template_time * 1000 for *_, timings in samples
+                ), 3),
+                'bytes': samples[-1][1],
+            }
+            if progress:
+                progress(key, results[key])
+    return {
+        'meta': {
+            'created_at': timezone.now().isoformat(),
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'database': connection.vendor,
+            'repeat': repeat,
+            'cold_cache': cold_cache,
+            'dataset': {
+                'users': User.objects.count(),
+                'posts': Post.objects.count(),
+                'comments': Comment.objects.count(),
+            },
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline, max_latency_regression=0.2,
+            min_latency_ms=1.0, max_query_increase=0):
+    """Случаи, где p95 или число запросов вышли за допуск к базовому.
+
+    Рост p95 считается регрессией, только если он больше доли
+    max_latency_regression и при этом не меньше min_latency_ms —
+    на быстрых страницах иначе срабатывает шум.
+    """
+    regressions = []
+    for key, result in current['results'].items():
+        base = baseline['results'].get(key)
+        if base is None:
+            continue
+        growth = result['p95_ms'] - base['p95_ms']
+        if (
+            growth > base['p95_ms'] * max_latency_regression
+            and growth >= min_latency_ms
+        ):
+            regressions.append(
+                f'{key}: p95 {base["p95_ms"]} → {result["p95_ms"]} мс'
+            )
+        if result['queries'] > base['queries'] + max_query_increase:
+            regressions.append(
+                f'{key}: запросов {base["queries"]} → {result["queries"]}'
+            )
+    return regressions
@@ -0,0 +1,87 @@
+import hashlib
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache, caches
+
+import blogicum.constans as const
+from .scheduler import get_visibility
+
+PAGE_GENERATION_KEY = 'page:generation'
+ALL_PAGES = 'all'
+
+card_cache_stats = Counter(hits=0, misses=0)
+
+
+def post_card_cache_key(post, viewer_is_author):
+    category = post.category
+    location = post.location
+    related = (
+        post.author.username,
+        category and (category.slug, category.title, category.is_published),
+        location and (location.name, location.is_published),
+        post.comment_count,
+        viewer_is_author,
+    )
+    digest = hashlib.md5(repr(related).encode()).hexdigest()
+    return f'post_card:{post.pk}:{post.updated_at.timestamp()}:{digest}'
+
+
+def get_or_render_post_card(post, viewer_is_author, render):
+    key = post_card_cache_key(post, viewer_is_author)
+    html = cache.get(key)
+    if html is not None:
+        card_cache_stats['hits'] += 1
+        return html
+    card_cache_stats['misses'] += 1
+    html = render()
+    cache.set(key, html, const.POST_CARD_CACHE_TIMEOUT)
+    return html
+
+
+def get_page_cache():
+    return caches[settings.PAGE_CACHE_ALIAS]
+
+
+def _generation_key(scope):
+    return f'{PAGE_GENERATION_KEY}:{scope}'
+
+
+def invalidate_pages(*scopes):
+    """Сбрасывает страницы областей scopes, а без них — все страницы.
+
+    Области: 'feed' — главная, 'post:<id>', 'category:<slug>' и
+    'author:<username>' — страница поста, категории и профиля.
+    """
+    get_page_cache().set_many({
+        _generation_key(scope): time.time_ns()
+        for scope in scopes or (ALL_PAGES,)
+    }, None)
+
+
+def _page_generations(scopes):
+    page_cache = get_page_cache()
+    keys = [_generation_key(scope) for scope in (ALL_PAGES, *scopes)]
+    generations = page_cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            generation = time.time_ns()
+            if not page_cache.add(key, generation, None):
+                generation = page_cache.get(key)
+            generations[key] = generation
+    return [generations[key] for key in keys]
+
+
+def page_cache_key(request, scopes=()):
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    generations = '.'.join(str(item) for item in _page_generations(scopes))
+    return f'page:{generations}:{get_visibility().schedule_epoch}:{digest}'
+
+
+def get_cached_page(key):
+    return get_page_cache().get(key)
+
+
+def cache_page_response(key, response, timeout):
+    get_page_cache().set(key, response, timeout)
@@ -0,0 +1,56 @@
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Now, TruncDate
+
+from .feed import sync_comment_counts
+from .models import Comment, Post, PostDateBucket
+
+
+def published_comments_count():
+    return Coalesce(
+        Subquery(
+            Comment.objects.filter(
+                post=OuterRef('pk'), is_published=True
+            ).order_by().values('post').annotate(
+                total=Count('pk')
+            ).values('total')
+        ),
+        Value(0),
+    )
+
+
+def update_comment_counts(posts=None):
+    if posts is None:
+        posts = Post.objects.all()
+    updated = posts.update(
+        comment_count=published_comments_count(),
+        updated_at=Now()
+    )
+    sync_comment_counts(posts)
+    return updated
+
+
+def shift_date_bucket(day, delta):
+    if delta > 0:
+        PostDateBucket.objects.get_or_create(day=day)
+        PostDateBucket.objects.filter(day=day).update(
+            post_count=F('post_count') + delta
+        )
+        return
+    # Сначала убираем опустевший день, иначе уменьшенный счётчик
+    # попадёт под условие удаления.
+    PostDateBucket.objects.filter(day=day, post_count__lte=-delta).delete()
+    PostDateBucket.objects.filter(day=day).update(
+        post_count=F('post_count') + delta
+    )
+
+
+@transaction.atomic
+def rebuild_date_buckets():
+    PostDateBucket.objects.all().delete()
+    return len(PostDateBucket.objects.bulk_create(
+        PostDateBucket(day=row['day'], post_count=row['total'])
+        for row in Post.objects.annotate(
+            day=TruncDate('pub_date')
+        ).order_by().values('day').annotate(total=Count('pk'))
+    ))
@@ -0,0 +1,252 @@
+import random
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from faker import Faker
+
+import blogicum.constans as const
+from . import search
+from .importer import recompute_derived
+from .models import Category, Comment, Location, Post, User
+
+# Тексты берутся из заранее собранного словаря: Faker на каждую из
+# миллионов строк — это часы вместо минут.
+TEXT_POOL_SIZE = 2000
+PAST_SPAN = timedelta(days=3 * 365).total_seconds()
+FUTURE_SPAN = timedelta(days=30).total_seconds()
+COMMENT_SPAN = timedelta(days=60).total_seconds()
+
+
+def default_anchor():
+    """Начало текущего дня: тот же seed в тот же день даёт те же данные."""
+    return timezone.make_aware(
+        datetime.combine(timezone.localdate(), time.min)
+    )
+
+
+def next_pk(model):
+    return (model.objects.aggregate(top=Max('pk'))['top'] or 0) + 1
+
+
+def comment_weights(count, skew):
+    """Накопленные веса степенного закона: у поста ранга r — 1 / r^skew."""
+    return list(accumulate(1 / rank ** skew for rank in range(1, count + 1)))
+
+
+def insert_rows(model, columns, rows):
+    """Вставляет готовые кортежи одним executemany.
+
+    Объекты моделей и компиляция запроса ORM на каждую пачку здесь
+    дороже самой вставки.
+    """
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(column) for column in columns),
+        ', '.join(['%s'] * len(columns)),
+    )
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+@contextmanager
+def deferred_indexes(model):
+    """Снимает вторичные индексы таблицы на время вставки (SQLite).
+
+    Построить индекс по готовой таблице в разы быстрее, чем вставлять
+    в него миллионы строк вразброс.
+    """
+    if connection.vendor != 'sqlite':
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = %s AND sql IS NOT NULL",
+            (model._meta.db_table,)
+        )
+        indexes = cursor.fetchall()
+        for name, _ in indexes:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            for _, sql in indexes:
+                cursor.execute(sql)
+
+
+class DatasetGenerator:
+
+    def __init__(
+            self, seed=0, batch_size=const.IMPORT_BATCH_SIZE, anchor=None,
+            future_share=0.05, hidden_share=0.05, skew=1.1, progress=None
+    ):
+        self.rng = random.Random(seed)
+        self.fake = Faker('ru_RU')
+        self.fake.seed_instance(seed)
+        self.batch_size = batch_size
+        self.anchor = anchor or default_anchor()
+        self.future_share = future_share
+        self.hidden_share = hidden_share
+        self.skew = skew
+        self.progress = progress
+        self.sentences = [
+            self.fake.sentence(nb_words=10) for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.titles = [
+            self.fake.sentence(nb_words=4)[:-1]
+            for _ in range(TEXT_POOL_SIZE)
+        ]
+        self.ids = {}
+        self.adapt = connection.ops.adapt_datetimefield_value
+        # SQLite хранит даты строкой в UTC: переводим anchor один раз,
+        # а не для каждой из миллионов дат.
+        self.base = (
+            timezone.make_naive(self.anchor, timezone.utc)
+            if connection.vendor == 'sqlite' else self.anchor
+        )
+        self.start = self.moment(-PAST_SPAN)
+
+    def moment(self, offset):
+        """Дата в offset секундах от anchor в том виде, как её хранит БД."""
+        return self.adapt(self.base + timedelta(seconds=offset))
+
+    def visible(self):
+        return self.rng.random() >= self.hidden_share
+
+    def _fill(self, model, columns, total, build):
+        start = next_pk(model)
+        self.ids[model] = range(start, start + total)
+        with deferred_indexes(model):
+            for offset in range(0, total, self.batch_size):
+                pks = range(
+                    start + offset,
+                    start + min(total, offset + self.batch_size)
+                )
+                with transaction.atomic():
+                    insert_rows(model, columns, [build(pk) for pk in pks])
+                if self.progress:
+                    self.progress(model, offset + len(pks), total)
+
+    def users(self, total):
+        password = make_password(None)
+        self._fill(User, (
+            'id', 'username', 'first_name', 'last_name', 'email',
+            'password', 'is_superuser', 'is_staff', 'is_active',
+            'date_joined',
+        ), total, lambda pk: (
+            pk, f'{self.fake.user_name()}_{pk}', self.fake.first_name(),
+            self.fake.last_name(), f'user{pk}@example.com', password,
+            False, False, True, self.start,
+        ))
+
+    def categories(self, total):
+        self._fill(Category, (
+            'id', 'is_published', 'created_at', 'updated_at', 'title',
+            'description', 'slug',
+        ), total, lambda pk: (
+            pk, self.visible(), self.start, self.start,
+            f'{self.fake.word().capitalize()} {pk}',
+            self.rng.choice(self.sentences), f'category-{pk}',
+        ))
+
+    def locations(self, total):
+        self._fill(Location, (
+            'id', 'is_published', 'created_at', 'updated_at', 'name',
+        ), total, lambda pk: (
+            pk, self.visible(), self.start, self.start,
+            f'{self.fake.city_name()} {pk}',
+        ))
+
+    def posts(self, total):
+        rng = self.rng
+        authors = self.ids[User]
+        categories = self.ids[Category]
+        locations = self.ids[Location]
+        image_meta = Post._meta.get_field('image_meta').get_db_prep_save(
+            {}, connection
+        )
+        # Секунды от anchor; по ним комментарии идут после поста.
+        self.post_offsets = array('d')
+
+        def build(pk):
+            if rng.random() < self.future_share:
+                offset = rng.uniform(0, FUTURE_SPAN)
+            else:
+                offset = -rng.uniform(0, PAST_SPAN)
+            self.post_offsets.append(offset)
+            created_at = self.moment(min(offset, 0))
+            return (
+                pk, self.visible(), created_at, created_at,
+                rng.choice(self.titles),
+                ' '.join(rng.sample(self.sentences, rng.randint(2, 12))),
+                self.moment(offset), '', rng.choice(authors),
+                (
+                    rng.choice(locations)
+                    if locations and rng.random() < 0.5 else None
+                ),
+                rng.choice(categories) if categories else None,
+                0, image_meta,
+            )
+        self._fill(Post, (
+            'id', 'is_published', 'created_at', 'updated_at', 'title',
+            'text', 'pub_date', 'image', 'author_id', 'location_id',
+            'category_id', 'comment_count', 'image_meta',
+        ), total, build)
+
+    def comments(self, total):
+        rng = self.rng
+        authors = self.ids[User]
+        posts = list(self.ids[Post])
+        offsets = self.post_offsets
+        first_post = posts[0]
+        # Ранги раздаются постам в случайном порядке.
+        rng.shuffle(posts)
+        weights = comment_weights(len(posts), self.skew)
+        targets = iter(())
+
+        def build(pk):
+            nonlocal targets
+            post_id = next(targets, None)
+            if post_id is None:
+                targets = iter(rng.choices(
+                    posts, cum_weights=weights, k=self.batch_size
+                ))
+                post_id = next(targets)
+            created_at = self.moment(
+                offsets[post_id - first_post] + rng.uniform(0, COMMENT_SPAN)
+            )
+            return (
+                pk, self.visible(), created_at, created_at,
+                rng.choice(self.sentences), rng.choice(authors), post_id,
+            )
+        self._fill(Comment, (
+            'id', 'is_published', 'created_at', 'updated_at', 'text',
+            'author_id', 'post_id',
+        ), total, build)
+
+
+def generate(users, categories, locations, posts, comments, **options):
+    """Создаёт набор данных и пересчитывает всё производное один раз.
+
+    Индексы таблиц и триггеры поиска возвращаются и при ошибке: уже
+    вставленные строки остаются, производные данные пересчитываются.
+    """
+    generator = DatasetGenerator(**options)
+    search.drop_triggers()
+    try:
+        generator.users(users)
+        generator.categories(categories)
+        generator.locations(locations)
+        generator.posts(posts)
+        if posts:
+            generator.comments(comments)
+    finally:
+        recompute_derived(generator.batch_size)
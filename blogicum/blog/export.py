@@ -0,0 +1,86 @@
+import csv
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+import blogicum.constans as const
+from .models import Comment, Post
+
+# Столбец выгрузки и путь к значению; связанные имена приходят
+# JOIN-ом в том же запросе.
+COLUMNS = {
+    Post: (
+        ('id', 'pk'),
+        ('title', 'title'),
+        ('text', 'text'),
+        ('pub_date', 'pub_date'),
+        ('is_published', 'is_published'),
+        ('author', 'author__username'),
+        ('category', 'category__slug'),
+        ('location', 'location__name'),
+        ('image', 'image'),
+        ('comment_count', 'comment_count'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ),
+    Comment: (
+        ('id', 'pk'),
+        ('post', 'post_id'),
+        ('author', 'author__username'),
+        ('text', 'text'),
+        ('is_published', 'is_published'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    ),
+}
+FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'jsonl': ('application/x-ndjson', 'jsonl'),
+}
+
+
+class Echo:
+    """Файлоподобный объект для csv.writer: строка сразу возвращается."""
+
+    def write(self, value):
+        return value
+
+
+def column_names(model):
+    return [name for name, _ in COLUMNS[model]]
+
+
+def export_rows(queryset, chunk_size=const.EXPORT_CHUNK_SIZE):
+    """Кортежи значений по порядку id, без загрузки выборки в память."""
+    return queryset.order_by('pk').values_list(
+        *(path for _, path in COLUMNS[queryset.model])
+    ).iterator(chunk_size=chunk_size)
+
+
+def _plain(value):
+    return value.isoformat() if hasattr(value, 'isoformat') else value
+
+
+def stream_csv(queryset, chunk_size=const.EXPORT_CHUNK_SIZE):
+    writer = csv.writer(Echo())
+    yield writer.writerow(column_names(queryset.model))
+    for row in export_rows(queryset, chunk_size):
+        yield writer.writerow([_plain(value) for value in row])
+
+
+def stream_jsonl(queryset, chunk_size=const.EXPORT_CHUNK_SIZE):
+    names = column_names(queryset.model)
+    for row in export_rows(queryset, chunk_size):
+        yield json.dumps(
+            dict(zip(names, row)), cls=DjangoJSONEncoder, ensure_ascii=False
+        ) + '\n'
+
+
+STREAMS = {
+    'csv': stream_csv,
+    'jsonl': stream_jsonl,
+}
+
+
+def stream(queryset, export_format, chunk_size=const.EXPORT_CHUNK_SIZE):
+    return STREAMS[export_format](queryset, chunk_size)
@@ -0,0 +1,106 @@
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.db.models.functions import Now
+
+from .models import FeedEntry, Post
+
+
+def build_entry(post):
+    category = post.category
+    location = post.location
+    return FeedEntry(
+        id=post.pk,
+        title=post.title,
+        excerpt=post.excerpt,
+        pub_date=post.pub_date,
+        updated_at=post.updated_at,
+        image=post.image.name,
+        image_meta=post.image_meta,
+        comment_count=post.comment_count,
+        is_published=post.is_published,
+        author_id=post.author_id,
+        author_username=post.author.username,
+        category_id=post.category_id,
+        category_slug=category.slug if category else '',
+        category_title=category.title if category else '',
+        category_is_published=bool(category and category.is_published),
+        location_name=location.name if location else None,
+        location_is_published=bool(location and location.is_published),
+    )
+
+
+def sync_post(post):
+    build_entry(post).save()
+
+
+def delete_post(post_id):
+    FeedEntry.objects.filter(pk=post_id).delete()
+
+
+def sync_category(category):
+    FeedEntry.objects.filter(category_id=category.pk).update(
+        category_slug=category.slug,
+        category_title=category.title,
+        category_is_published=category.is_published,
+        updated_at=Now(),
+    )
+
+
+def detach_category(category_id):
+    FeedEntry.objects.filter(category_id=category_id).update(
+        category_id=None,
+        category_slug='',
+        category_title='',
+        category_is_published=False,
+        updated_at=Now(),
+    )
+
+
+def sync_location(location, deleted=False):
+    FeedEntry.objects.filter(
+        pk__in=Post.objects.filter(location=location).values('pk')
+    ).update(
+        location_name=None if deleted else location.name,
+        location_is_published=not deleted and location.is_published,
+        updated_at=Now(),
+    )
+
+
+def sync_author(user):
+    FeedEntry.objects.filter(author_id=user.pk).update(
+        author_username=user.username,
+        updated_at=Now(),
+    )
+
+
+def sync_comment_counts(posts):
+    FeedEntry.objects.filter(pk__in=posts.values('pk')).update(
+        comment_count=Subquery(
+            Post.objects.filter(pk=OuterRef('pk')).values('comment_count')
+        ),
+        updated_at=Now(),
+    )
+
+
+def rebuild(batch_size=1000):
+    """Пересобирает ленту диапазонами по id и возвращает число записей."""
+    posts = Post.objects.select_related(
+        'author', 'category', 'location'
+    ).order_by('pk')
+    last_id = 0
+    total = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last_id)[:batch_size])
+        upper_id = batch[-1].pk if batch else None
+        with transaction.atomic():
+            stale = FeedEntry.objects.filter(pk__gt=last_id)
+            if upper_id is not None:
+                stale = stale.filter(pk__lte=upper_id)
+            stale.delete()
+            FeedEntry.objects.bulk_create(
+                [build_entry(post) for post in batch]
+            )
+        total += len(batch)
+        if upper_id is None:
+            return total
+        last_id = upper_id
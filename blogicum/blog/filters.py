@@ -0,0 +1,64 @@
+from django.contrib import admin
+from django.core.exceptions import ImproperlyConfigured
+
+from .autocomplete import prefix_filter
+
+
+class InputFilter(admin.SimpleListFilter):
+    """Фильтр-поле ввода: не перечисляет все значения из таблицы.
+
+    Ищет по началу значения поля field_path; его задают подклассы.
+    """
+
+    template = 'admin/input_filter.html'
+    field_path = None
+
+    def __init__(self, request, params, model, model_admin):
+        if self.field_path is None:
+            raise ImproperlyConfigured(
+                f'У фильтра {type(self).__name__} не задан field_path.'
+            )
+        super().__init__(request, params, model, model_admin)
+
+    def lookups(self, request, model_admin):
+        # Непустой список нужен, чтобы админка показала фильтр.
+        return ((None, None),)
+
+    def choices(self, changelist):
+        all_choice = next(super().choices(changelist))
+        all_choice['query_parts'] = tuple(
+            (key, value)
+            for key, value in changelist.get_filters_params().items()
+            if key != self.parameter_name
+        )
+        yield all_choice
+
+    def queryset(self, request, queryset):
+        value = (self.value() or '').strip()
+        if value:
+            return queryset.filter(prefix_filter(self.field_path, value))
+        return queryset
+
+
+class CategoryFilter(InputFilter):
+    title = 'категории'
+    parameter_name = 'category_title'
+    field_path = 'category__title'
+
+
+class LocationFilter(InputFilter):
+    title = 'местоположению'
+    parameter_name = 'location_name'
+    field_path = 'location__name'
+
+
+class AuthorFilter(InputFilter):
+    title = 'автору'
+    parameter_name = 'author_username'
+    field_path = 'author__username'
+
+
+class SlugFilter(InputFilter):
+    title = 'идентификатору'
+    parameter_name = 'slug_prefix'
+    field_path = 'slug'
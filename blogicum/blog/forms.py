@@ -1,15 +1,29 @@
 from django import forms
 
+import blogicum.constans as const
 from .models import Comment, Post
+from .widgets import AutocompleteSelect
 
 
 class PostForm(forms.ModelForm):
     class Meta:
         model = Post
         exclude = ('author', 'is_published')
+        widgets = {
+            'category': AutocompleteSelect('categories'),
+            'location': AutocompleteSelect('locations'),
+        }
 
 
 class CommentForm(forms.ModelForm):
     class Meta:
         model = Comment
         fields = ('text',)
+
+
+class SearchForm(forms.Form):
+    q = forms.CharField(
+        label='Поиск',
+        max_length=const.MAX_LENGTH,
+        required=False
+    )
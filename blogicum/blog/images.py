@@ -0,0 +1,283 @@
+import base64
+import io
+import logging
+import multiprocessing
+import posixpath
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connections, transaction
+from PIL import Image, ImageOps
+
+import blogicum.constans as const
+from core.storage import content_storage
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = 'post_variants'
+VARIANT_FORMATS = (
+    ('webp', 'WEBP', 'image/webp'),
+    ('jpg', 'JPEG', 'image/jpeg'),
+)
+
+# Ориентации EXIF, при которых кадр повёрнут на 90°.
+ROTATED_ORIENTATIONS = {5, 6, 7, 8}
+EXIF_ORIENTATION = 0x0112
+
+_executor = None
+
+
+def variant_widths():
+    return sorted({
+        width * density
+        for width in const.POST_IMAGE_SLOTS.values()
+        for density in (1, 2)
+    })
+
+
+def variant_name(name, width, extension):
+    stem = posixpath.splitext(posixpath.basename(name))[0]
+    return f'{VARIANTS_DIR}/{stem}_{width}w.{extension}'
+
+
+def variant_url(name, width, extension):
+    return default_storage.url(variant_name(name, width, extension))
+
+
+def generate_variants(name, force=False):
+    """Нарезает уменьшенные копии исходника и возвращает их ширины.
+
+    Копии шире исходника не делаются: растягивать картинку бессмысленно.
+    """
+    try:
+        with content_storage.open(name) as source:
+            image = ImageOps.exif_transpose(Image.open(source))
+            image.load()
+    except FileNotFoundError:
+        logger.warning('Исходник %s не найден', name)
+        return []
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    widths = [width for width in variant_widths() if width < image.width]
+    for width in widths:
+        height = max(1, round(image.height * width / image.width))
+        resized = None
+        for extension, image_format, _ in VARIANT_FORMATS:
+            target = variant_name(name, width, extension)
+            if default_storage.exists(target):
+                if not force:
+                    continue
+                default_storage.delete(target)
+            if resized is None:
+                resized = image.resize((width, height), Image.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(
+                buffer, image_format, quality=const.POST_IMAGE_QUALITY
+            )
+            default_storage.save(target, ContentFile(buffer.getvalue()))
+    return widths
+
+
+def describe_image(source):
+    """Размеры с учётом поворота EXIF и размытое превью в data URI."""
+    image = Image.open(source)
+    width, height = image.size
+    if image.getexif().get(EXIF_ORIENTATION) in ROTATED_ORIENTATIONS:
+        width, height = height, width
+    box = (const.POST_IMAGE_PLACEHOLDER_WIDTH,) * 2
+    image.draft('RGB', tuple(side * 4 for side in box))
+    preview = ImageOps.exif_transpose(image).convert('RGB')
+    preview.thumbnail(box)
+    buffer = io.BytesIO()
+    preview.save(buffer, 'JPEG', quality=40)
+    return {
+        'width': width,
+        'height': height,
+        'placeholder': 'data:image/jpeg;base64,' + base64.b64encode(
+            buffer.getvalue()
+        ).decode(),
+    }
+
+
+def read_image_meta(field_file):
+    """Сведения о фото, снятые при загрузке.
+
+    Дальше страницы рисуются без чтения исходника с диска.
+    """
+    committed = field_file._committed
+    try:
+        field_file.open('rb')
+        meta = {**describe_image(field_file), 'size': field_file.size}
+    except (OSError, SyntaxError, ValueError):
+        logger.warning('Не удалось прочитать фото %s', field_file.name)
+        return {}
+    finally:
+        if committed:
+            field_file.close()
+        else:
+            field_file.seek(0)
+    return meta
+
+
+def read_stored_image_meta(name):
+    try:
+        with content_storage.open(name) as source:
+            meta = describe_image(source)
+        return {**meta, 'size': content_storage.size(name)}
+    except (OSError, SyntaxError, ValueError):
+        logger.warning('Не удалось прочитать фото %s', name)
+        return {}
+
+
+def _setup_worker(databases, media_root):
+    # Процесс запускается с нуля: берём имена БД и каталог медиа
+    # родителя — в тестах они не такие, как в настройках.
+    for alias, name in databases.items():
+        settings.DATABASES[alias]['NAME'] = name
+    settings.MEDIA_ROOT = media_root
+    django.setup()
+
+
+def make_executor(workers):
+    # spawn, а не fork: веб-сервер может держать потоки и соединения с БД.
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_setup_worker,
+        initargs=(
+            {
+                alias: connections[alias].settings_dict['NAME']
+                for alias in connections
+            },
+            settings.MEDIA_ROOT,
+        ),
+    )
+
+
+def get_executor():
+    global _executor
+    if _executor is None:
+        _executor = make_executor(settings.IMAGE_VARIANT_WORKERS)
+    return _executor
+
+
+def update_image_meta(name, **values):
+    from .models import Post
+
+    for post in Post.objects.filter(image=name):
+        post.image_meta = {**post.image_meta, **values}
+        post.save(update_fields=('image_meta', 'updated_at'))
+
+
+def process_variants(name):
+    """Нарезает копии и записывает их ширины в image_meta постов."""
+    update_image_meta(name, variants=generate_variants(name))
+
+
+def _process_in_worker(name):
+    # Целиком в процессе пула: поток обратного вызова в БД не пишет.
+    try:
+        process_variants(name)
+    finally:
+        close_old_connections()
+
+
+def _log_failure(name, future):
+    error = future.exception()
+    if error is not None:
+        logger.error(
+            'Не удалось подготовить копии %s', name, exc_info=error
+        )
+
+
+def schedule_variants(name):
+    if not settings.IMAGE_VARIANT_WORKERS:
+        process_variants(name)
+        return
+    future = get_executor().submit(_process_in_worker, name)
+    future.add_done_callback(lambda future: _log_failure(name, future))
+
+
+def schedule_variants_on_commit(name):
+    transaction.on_commit(lambda: schedule_variants(name))
+
+
+def release_image(name):
+    """Удаляет файл и его копии, если на него больше никто не ссылается.
+
+    Файл, который недавно загрузили или отдали повторной загрузке,
+    остаётся сборщику сирот: запись с ним может быть ещё не сохранена.
+    """
+    from .models import Post
+
+    with content_storage.locked():
+        if Post.objects.filter(image=name).exists() or (
+            content_storage.touched_within(name, const.IMAGE_RELEASE_GRACE)
+        ):
+            return False
+        content_storage.delete(name)
+        for width in variant_widths():
+            for extension, _, _ in VARIANT_FORMATS:
+                default_storage.delete(
+                    variant_name(name, width, extension)
+                )
+    return True
+
+
+def release_image_on_commit(name):
+    transaction.on_commit(lambda: release_image(name))
+
+
+def map_images(function, names, workers, *args):
+    """Применяет function к каждому фото, при workers > 0 — в процессах.
+
+    Отдаёт пары (имя, результат) в исходном порядке.
+    """
+    arguments = [names] + [[arg] * len(names) for arg in args]
+    if not workers:
+        yield from zip(names, map(function, *arguments))
+        return
+    with make_executor(workers) as executor:
+        yield from zip(names, executor.map(
+            function, *arguments,
+            chunksize=max(1, len(names) // (workers * 4))
+        ))
+
+
+def image_sources(image, meta, slot):
+    """Данные для <picture>; без готовых копий отдаётся исходник."""
+    meta = meta or {}
+    dimensions = {
+        'width': meta.get('width'),
+        'height': meta.get('height'),
+        'placeholder': meta.get('placeholder'),
+    }
+    widths = meta.get('variants')
+    if not widths:
+        return {
+            'src': image.url, 'sources': (), 'srcset': '', 'sizes': '',
+            **dimensions,
+        }
+    slot_width = const.POST_IMAGE_SLOTS[slot]
+    srcsets = {
+        extension: ', '.join(
+            f'{variant_url(image.name, width, extension)} {width}w'
+            for width in widths
+        )
+        for extension, _, _ in VARIANT_FORMATS
+    }
+    fitting = [width for width in widths if width >= slot_width]
+    src = variant_url(image.name, fitting[0], 'jpg') if fitting else None
+    return {
+        'src': src or image.url,
+        'sources': tuple(
+            (mime, srcsets[extension])
+            for extension, _, mime in VARIANT_FORMATS if extension != 'jpg'
+        ),
+        'srcset': srcsets['jpg'],
+        'sizes': f'(max-width: {slot_width}px) 100vw, {slot_width}px',
+        **dimensions,
+    }
@@ -0,0 +1,297 @@
+import json
+import os
+import re
+from collections import Counter
+from itertools import chain
+
+from django.core.management.color import no_style
+from django.db import IntegrityError, connection, transaction
+from django.utils import timezone
+
+import blogicum.constans as const
+from . import autocomplete, feed, search
+from .cache import invalidate_pages
+from .counters import rebuild_date_buckets, update_comment_counts
+from .export import COLUMNS
+from .models import Category, Comment, Location, Post, User
+from .moderation import pk_ranges
+from .scheduler import advance_epoch
+
+# Порядок вставки внутри пачки: сначала те, на кого ссылаются.
+MODELS = (User, Category, Location, Post, Comment)
+FIXTURE_MODELS = {model._meta.label_lower: model for model in MODELS}
+FLAT_TARGETS = {
+    'posts': Post,
+    'comments': Comment,
+}
+DECODER = json.JSONDecoder()
+ARRAY_SEPARATORS = re.compile(r'[\s,]*')
+READ_SIZE = 64 * 1024
+
+
+def _iter_array(file, buffer):
+    position = 1
+    while True:
+        position = ARRAY_SEPARATORS.match(buffer, position).end()
+        if buffer.startswith(']', position):
+            return
+        try:
+            record, end = DECODER.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = file.read(READ_SIZE)
+            if not chunk:
+                raise
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield record
+        position = end
+
+
+def iter_records(file):
+    """Записи из JSON-массива или JSONL, не читая файл целиком."""
+    buffer = file.read(READ_SIZE).lstrip()
+    if buffer.startswith('['):
+        yield from _iter_array(file, buffer)
+        return
+    # Дочитываем оборванную строку, дальше файл идёт построчно.
+    head = (buffer + file.readline()).splitlines()
+    for line in chain(head, file):
+        line = line.strip()
+        if line:
+            yield json.loads(line)
+
+
+def raw_insert(model, objects):
+    """Как bulk_create, но raw: auto_now не затирает заданные даты.
+
+    Строки с занятым id или уникальным значением пропускаются.
+    """
+    fields = [
+        field for field in model._meta.concrete_fields
+        if not (field.primary_key and objects[0].pk is None)
+    ]
+    batch = connection.ops.bulk_batch_size(fields, objects)
+    for start in range(0, len(objects), batch):
+        model._base_manager._insert(
+            objects[start:start + batch], fields=fields, raw=True,
+            ignore_conflicts=True
+        )
+
+
+class Checkpoint:
+    """Число обработанных записей; пишется после каждой пачки."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def load(self):
+        if not self.path or not os.path.exists(self.path):
+            return 0
+        with open(self.path, encoding='utf-8') as file:
+            return json.load(file)['records']
+
+    def save(self, records):
+        if not self.path:
+            return
+        temporary = self.path + '.part'
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump({'records': records}, file)
+        os.replace(temporary, self.path)
+
+    def clear(self):
+        if self.path and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class Importer:
+    """Загрузка пачками без сигналов и проверок форм.
+
+    Записи фикстур (``model``/``pk``/``fields``) сохраняют свои id.
+    Плоские записи из export_content ссылаются на автора, категорию и
+    местоположение по имени; имена переводятся в id через словари,
+    которые дополняются одним запросом на пачку. Строки с занятым id
+    пропускаются, поэтому повтор пачки после сбоя безопасен.
+
+    Ссылки проверяются в транзакции пачки: запись может ссылаться на
+    уже загруженные строки и на строки своей пачки.
+    """
+
+    def __init__(self, target=None, batch_size=const.IMPORT_BATCH_SIZE):
+        self.flat_model = FLAT_TARGETS.get(target)
+        self.batch_size = batch_size
+        self.pending = {model: [] for model in MODELS}
+        self.size = 0
+        self.names = {}
+        self.stats = Counter()
+        self.references = {}
+        if self.flat_model is not None:
+            self.references = {
+                name: (
+                    self.flat_model._meta.get_field(name),
+                    path.split('__')[1],
+                )
+                for name, path in COLUMNS[self.flat_model]
+                if '__' in path
+            }
+
+    def add(self, record):
+        if 'model' in record:
+            model = FIXTURE_MODELS.get(record['model'])
+            if model is None:
+                self.stats['skipped'] += 1
+                return
+            values = dict(record['fields'], pk=record.get('pk'))
+        elif self.flat_model is not None:
+            model = self.flat_model
+            values = dict(record, pk=record.get('id'))
+        else:
+            self.stats['skipped'] += 1
+            return
+        self.pending[model].append(values)
+        self.size += 1
+
+    @property
+    def full(self):
+        return self.size >= self.batch_size
+
+    def _resolve_names(self, rows):
+        for name, (field, lookup) in self.references.items():
+            mapping = self.names.setdefault(name, {})
+            missing = sorted({
+                row[name] for row in rows
+                if row.get(name) is not None and row[name] not in mapping
+            })
+            for start in range(0, len(missing), 500):
+                mapping.update(
+                    field.related_model.objects.filter(**{
+                        f'{lookup}__in': missing[start:start + 500]
+                    }).values_list(lookup, 'pk')
+                )
+            for row in rows:
+                row[field.attname] = mapping.get(row.pop(name, None))
+
+    def _build(self, model, values):
+        now = timezone.now()
+        data = {}
+        for field in model._meta.concrete_fields:
+            if field.primary_key:
+                continue
+            for key in (field.name, field.attname):
+                if key in values:
+                    data[field.attname] = values[key]
+                    break
+            else:
+                if getattr(field, 'auto_now', False) or getattr(
+                    field, 'auto_now_add', False
+                ):
+                    data[field.attname] = now
+        return model(pk=values['pk'], **data)
+
+    def check_references(self, model, objects):
+        """Ссылки пачки на несуществующие строки — IntegrityError.
+
+        Проверяются только значения из пачки: check_constraints
+        просматривал бы всю таблицу после каждой пачки.
+        """
+        for field in model._meta.concrete_fields:
+            if not field.is_relation:
+                continue
+            ids = list({getattr(item, field.attname) for item in objects})
+            ids = [pk for pk in ids if pk is not None]
+            found = set()
+            for start in range(0, len(ids), 500):
+                found.update(
+                    field.related_model._base_manager.filter(
+                        pk__in=ids[start:start + 500]
+                    ).values_list('pk', flat=True)
+                )
+            missing = [pk for pk in ids if pk not in found]
+            if missing:
+                raise IntegrityError(
+                    f'{model._meta.label}.{field.name}: нет строк '
+                    f'{field.related_model._meta.label} с id '
+                    + ', '.join(map(str, missing[:10]))
+                )
+
+    def _objects(self, model, rows):
+        if model is not self.flat_model:
+            return [self._build(model, row) for row in rows]
+        self._resolve_names(rows)
+        objects = [
+            self._build(model, row) for row in rows
+            if row.get('author_id') is not None
+        ]
+        self.stats['skipped'] += len(rows) - len(objects)
+        return objects
+
+    def flush(self):
+        inserted = []
+        with transaction.atomic():
+            for model in MODELS:
+                if not self.pending[model]:
+                    continue
+                objects = self._objects(model, self.pending[model])
+                with_pk = [item for item in objects if item.pk is not None]
+                without_pk = [item for item in objects if item.pk is None]
+                for group in (with_pk, without_pk):
+                    if group:
+                        raw_insert(model, group)
+                inserted.append((model, objects))
+            for model, objects in inserted:
+                if objects:
+                    self.check_references(model, objects)
+        for model, objects in inserted:
+            self.stats[model._meta.model_name] += len(objects)
+            self.pending[model].clear()
+        self.size = 0
+
+
+def load(file, target=None, batch_size=const.IMPORT_BATCH_SIZE,
+         checkpoint=None, progress=None):
+    """Загружает записи из file; возвращает счётчики по моделям.
+
+    Отметка пишется только после пачки, прошедшей проверку ссылок:
+    после ошибки --resume начнёт с неё. Индекс поиска и производные
+    данные восстанавливаются и при ошибке.
+    """
+    checkpoint = Checkpoint(checkpoint)
+    done = checkpoint.load()
+    importer = Importer(target, batch_size)
+    importer.stats['resumed'] = done
+    search.drop_triggers()
+    try:
+        records = 0
+        with connection.constraint_checks_disabled():
+            for records, record in enumerate(iter_records(file), start=1):
+                if records <= done:
+                    continue
+                importer.add(record)
+                if importer.full:
+                    importer.flush()
+                    checkpoint.save(records)
+                    if progress:
+                        progress(records)
+            importer.flush()
+        checkpoint.save(records)
+    finally:
+        recompute_derived()
+    checkpoint.clear()
+    return importer.stats
+
+
+def recompute_derived(batch_size=const.IMPORT_BATCH_SIZE):
+    """Производные данные после загрузки: один проход вместо сигналов."""
+    with connection.cursor() as cursor:
+        for statement in connection.ops.sequence_reset_sql(
+            no_style(), MODELS
+        ):
+            cursor.execute(statement)
+    for batch in pk_ranges(Post.objects.all(), batch_size):
+        update_comment_counts(batch)
+    feed.rebuild(batch_size=batch_size)
+    search.rebuild()
+    rebuild_date_buckets()
+    autocomplete.invalidate()
+    advance_epoch()
+    invalidate_pages()
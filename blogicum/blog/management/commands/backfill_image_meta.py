@@ -0,0 +1,43 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.images import map_images, read_stored_image_meta, update_image_meta
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Сохраняет размеры, вес и превью-заглушку фото у публикаций, '
+        'загруженных до появления этих сведений.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.IMAGE_VARIANT_WORKERS,
+            help='Число процессов; 0 — обрабатывать в текущем процессе.'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Перечитать сведения и у уже обработанных фото.'
+        )
+
+    def handle(self, *args, workers, force, verbosity, **options):
+        posts = Post.objects.exclude(image='')
+        if not force:
+            posts = posts.exclude(image_meta__has_key='width')
+        names = list(
+            posts.order_by('image').values_list('image', flat=True).distinct()
+        )
+        done = 0
+        for name, meta in map_images(read_stored_image_meta, names, workers):
+            if meta:
+                update_image_meta(name, **meta)
+                done += 1
+            elif verbosity > 0:
+                self.stderr.write(f'Пропущено: {name}')
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано фото: {done} из {len(names)}.')
+        )
@@ -0,0 +1,118 @@
+import json
+
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+import blogicum.constans as const
+from blog import benchmark
+
+
+class Command(BaseCommand):
+    help = (
+        'Меряет каждую страницу из blog/urls.py и pages/urls.py для гостя '
+        'и автора: p50/p95 времени ответа, запросы и время БД, время '
+        'шаблонов и размер ответа; сравнивает с сохранённым прогоном.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat', type=int, default=const.BENCHMARK_REPEAT,
+            help='Сколько замеров на каждый адрес.'
+        )
+        parser.add_argument(
+            '--warmup', type=int, default=1,
+            help='Сколько запросов на адрес сделать до замеров.'
+        )
+        parser.add_argument(
+            '--warm-cache', action='store_true',
+            help='Не сбрасывать кеш страниц перед запросами.'
+        )
+        parser.add_argument(
+            '--generate', type=int, metavar='POSTS',
+            help='Сначала создать набор данных из стольких постов '
+                 '(см. generate_dataset).'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--output', '-o', help='Файл для результатов в JSON.'
+        )
+        parser.add_argument(
+            '--baseline', help='JSON прошлого прогона для сравнения.'
+        )
+        parser.add_argument(
+            '--max-latency-regression', type=float, default=0.2,
+            help='Допустимый рост p95, доля от базового (0.2 — 20%%).'
+        )
+        parser.add_argument(
+            '--min-latency-ms', type=float, default=1.0,
+            help='Рост p95 меньше этого не считается регрессией.'
+        )
+        parser.add_argument(
+            '--max-query-increase', type=int, default=0,
+            help='Допустимый рост числа запросов к БД на страницу.'
+        )
+
+    def generate(self, posts, seed):
+        call_command(
+            'generate_dataset',
+            users=max(posts // 10, 1),
+            posts=posts,
+            comments=posts * 10,
+            seed=seed,
+            stdout=self.stdout,
+        )
+
+    def report(self, key, result):
+        self.stdout.write(
+            f'{key}: {result["status"]}, p50 {result["p50_ms"]} мс, '
+            f'p95 {result["p95_ms"]} мс, запросов {result["queries"]}, '
+            f'БД {result["db_ms"]} мс, шаблоны {result["template_ms"]} '
+            f'мс, {result["bytes"]} байт'
+        )
+
+    def handle(self, *args, **options):
+        if options['repeat'] < 1:
+            raise CommandError('--repeat должен быть не меньше 1.')
+        missing = benchmark.uncovered_routes()
+        if missing:
+            raise CommandError(
+                'Нет замеров для маршрутов: ' + ', '.join(missing)
+            )
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+        if options['generate']:
+            self.generate(options['generate'], options['seed'])
+        try:
+            current = benchmark.run(
+                repeat=options['repeat'],
+                warmup=options['warmup'],
+                cold_cache=not options['warm_cache'],
+                progress=self.report if options['verbosity'] else None,
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        current['meta']['options'] = {
+            name: options[name] for name in (
+                'max_latency_regression', 'min_latency_ms',
+                'max_query_increase',
+            )
+        }
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                json.dump(current, file, ensure_ascii=False, indent=2)
+        if baseline is None:
+            return
+        regressions = benchmark.compare(
+            current, baseline,
+            max_latency_regression=options['max_latency_regression'],
+            min_latency_ms=options['min_latency_ms'],
+            max_query_increase=options['max_query_increase'],
+        )
+        if regressions:
+            raise CommandError(
+                'Регрессии относительно базового прогона:\n'
+                + '\n'.join(regressions)
+            )
+        self.stdout.write(self.style.SUCCESS('Регрессий нет.'))
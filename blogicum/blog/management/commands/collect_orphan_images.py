@@ -0,0 +1,139 @@
+import os
+import posixpath
+import re
+import shutil
+import sqlite3
+import tempfile
+import time
+from itertools import islice
+
+from django.core.management.base import BaseCommand
+from django.template.defaultfilters import filesizeformat
+
+import blogicum.constans as const
+from blog.images import VARIANTS_DIR
+from blog.models import Post
+from core.storage import content_storage
+
+VARIANT_NAME = re.compile(r'^(?P<stem>.+)_\d+w\.\w+$')
+
+
+def stem_key(name):
+    return 'stem:' + posixpath.splitext(posixpath.basename(name))[0]
+
+
+def reference_key(relative_name):
+    if relative_name.startswith(VARIANTS_DIR + '/'):
+        match = VARIANT_NAME.match(posixpath.basename(relative_name))
+        return match and 'stem:' + match['stem']
+    return relative_name
+
+
+def walk_files(root, directory):
+    for current, _, files in os.walk(os.path.join(root, directory)):
+        relative = os.path.relpath(current, root).replace(os.sep, '/')
+        for filename in files:
+            yield (
+                posixpath.join(relative, filename),
+                os.path.join(current, filename),
+            )
+
+
+class Command(BaseCommand):
+    help = (
+        'Удаляет или переносит в карантин фото и их копии, '
+        'на которые не ссылается ни одна публикация.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-hours',
+            type=float,
+            default=const.ORPHAN_IMAGE_GRACE_HOURS,
+            help='Не трогать файлы моложе этого срока.'
+        )
+        parser.add_argument(
+            '--quarantine',
+            help='Каталог, куда переносить найденные файлы вместо удаления.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только посчитать, ничего не удаляя.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько имён читать из БД за один запрос.'
+        )
+
+    def handle(
+            self, *args, grace_hours, quarantine, dry_run, batch_size,
+            verbosity, **options
+    ):
+        root = content_storage.location
+        cutoff = time.time() - grace_hours * 60 * 60
+        scanned = orphans = reclaimed = 0
+        # Множество ссылок живёт во временной БД на диске, а не в памяти.
+        with tempfile.TemporaryDirectory() as workdir:
+            references = sqlite3.connect(os.path.join(workdir, 'refs.db'))
+            try:
+                self.collect_references(references, batch_size)
+                for directory in (
+                    Post._meta.get_field('image').upload_to, VARIANTS_DIR
+                ):
+                    for name, path in walk_files(root, directory):
+                        scanned += 1
+                        stat = os.stat(path)
+                        if stat.st_mtime > cutoff or self.is_referenced(
+                            references, name
+                        ):
+                            continue
+                        orphans += 1
+                        reclaimed += stat.st_size
+                        if verbosity > 1:
+                            self.stdout.write(name)
+                        if not dry_run:
+                            self.dispose(path, name, quarantine)
+            finally:
+                references.close()
+        action = 'Можно освободить' if dry_run else 'Освобождено'
+        self.stdout.write(self.style.SUCCESS(
+            f'Просмотрено файлов: {scanned}, без ссылок: {orphans}. '
+            f'{action}: {filesizeformat(reclaimed)} ({reclaimed} байт).'
+        ))
+
+    def collect_references(self, references, batch_size):
+        references.execute(
+            'CREATE TABLE refs (name TEXT PRIMARY KEY) WITHOUT ROWID'
+        )
+        names = Post.objects.exclude(image='').values_list(
+            'image', flat=True
+        ).iterator(chunk_size=batch_size)
+        while True:
+            batch = list(islice(names, batch_size))
+            if not batch:
+                break
+            references.executemany(
+                'INSERT OR IGNORE INTO refs VALUES (?)',
+                [(key,) for name in batch for key in (name, stem_key(name))]
+            )
+        references.commit()
+
+    def is_referenced(self, references, name):
+        key = reference_key(name)
+        if key is None:
+            # Посторонний файл в каталоге копий не трогаем.
+            return True
+        return references.execute(
+            'SELECT 1 FROM refs WHERE name = ?', (key,)
+        ).fetchone() is not None
+
+    def dispose(self, path, name, quarantine):
+        if quarantine:
+            target = os.path.join(quarantine, *name.split('/'))
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            shutil.move(path, target)
+        else:
+            os.remove(path)
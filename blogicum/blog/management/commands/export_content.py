@@ -0,0 +1,68 @@
+from django.core.management.base import BaseCommand
+
+import blogicum.constans as const
+from blog import export
+from blog.models import Comment, Post
+from blog.moderation import filter_content
+
+TARGETS = {
+    'posts': Post,
+    'comments': Comment,
+}
+
+
+class Command(BaseCommand):
+    help = (
+        'Выгружает посты или комментарии в CSV или JSONL потоком, '
+        'не держа выборку в памяти.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', choices=tuple(TARGETS))
+        parser.add_argument(
+            '--format',
+            dest='export_format',
+            choices=tuple(export.FORMATS),
+            default='jsonl'
+        )
+        parser.add_argument(
+            '--output', '-o',
+            help='Файл для выгрузки; по умолчанию — стандартный вывод.'
+        )
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument('--category', help='Слаг категории.')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=const.EXPORT_CHUNK_SIZE,
+            help='Сколько строк читать из БД за раз.'
+        )
+
+    def handle(
+            self, *args, target, export_format, output, author, category,
+            chunk_size, **options
+    ):
+        queryset = filter_content(
+            TARGETS[target].objects.all(), author, category
+        )
+        target_file = (
+            open(output, 'w', encoding='utf-8', newline='')
+            if output else None
+        )
+        total = 0
+        try:
+            for line in export.stream(queryset, export_format, chunk_size):
+                if target_file:
+                    target_file.write(line)
+                else:
+                    self.stdout.write(line, ending='')
+                total += 1
+        finally:
+            if target_file:
+                target_file.close()
+        if target_file:
+            if export_format == 'csv':
+                total -= 1
+            self.stdout.write(
+                self.style.SUCCESS(f'Выгружено строк: {total}.')
+            )
@@ -0,0 +1,94 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+import blogicum.constans as const
+from blog import dataset
+
+
+def parse_anchor(value):
+    day = parse_date(value)
+    if day is None:
+        raise CommandError(f'Не удалось разобрать дату «{value}».')
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def share(value):
+    value = float(value)
+    if not 0 <= value <= 1:
+        raise CommandError('Доля должна быть от 0 до 1.')
+    return value
+
+
+class Command(BaseCommand):
+    help = (
+        'Создаёт воспроизводимый набор пользователей, категорий, '
+        'местоположений, постов и комментариев для нагрузочных замеров.'
+    )
+
+    def add_arguments(self, parser):
+        for name, default in (
+            ('users', 1000),
+            ('categories', 20),
+            ('locations', 50),
+            ('posts', 10000),
+            ('comments', 100000),
+        ):
+            parser.add_argument(
+                f'--{name}', type=int, default=default,
+                help=f'Сколько создать (по умолчанию {default}).'
+            )
+        parser.add_argument(
+            '--future-share', type=share, default=0.05,
+            help='Доля отложенных постов.'
+        )
+        parser.add_argument(
+            '--hidden-share', type=share, default=0.05,
+            help='Доля снятых с публикации записей.'
+        )
+        parser.add_argument(
+            '--skew', type=float, default=1.1,
+            help='Показатель степенного закона для числа комментариев: '
+                 'чем больше, тем сильнее они собраны у немногих постов.'
+        )
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument(
+            '--anchor', type=parse_anchor,
+            help='День, от которого отсчитываются даты (ГГГГ-ММ-ДД); '
+                 'по умолчанию — сегодня.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=const.IMPORT_BATCH_SIZE,
+            help='Сколько строк вставлять за одну транзакцию.'
+        )
+
+    def handle(self, *args, **options):
+        if options['posts'] and not options['users']:
+            raise CommandError('Для постов нужен хотя бы один пользователь.')
+        verbosity = options['verbosity']
+
+        def progress(model, done, total):
+            if verbosity > 1:
+                self.stdout.write(
+                    f'{model._meta.verbose_name_plural}: {done}/{total}'
+                )
+
+        dataset.generate(
+            options['users'],
+            options['categories'],
+            options['locations'],
+            options['posts'],
+            options['comments'],
+            seed=options['seed'],
+            batch_size=options['batch_size'],
+            anchor=options['anchor'],
+            future_share=options['future_share'],
+            hidden_share=options['hidden_share'],
+            skew=options['skew'],
+            progress=progress,
+        )
+        self.stdout.write(self.style.SUCCESS('Набор данных создан.'))
@@ -0,0 +1,41 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.images import generate_variants, map_images, update_image_meta
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Готовит уменьшенные копии фото публикаций в WebP и JPEG.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.IMAGE_VARIANT_WORKERS,
+            help='Число процессов; 0 — обрабатывать в текущем процессе.'
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Пересоздать копии, даже если они уже есть.'
+        )
+
+    def handle(self, *args, workers, force, verbosity, **options):
+        posts = Post.objects.exclude(image='')
+        if not force:
+            posts = posts.exclude(image_meta__has_key='variants')
+        names = list(
+            posts.order_by('image').values_list('image', flat=True).distinct()
+        )
+        done = 0
+        for name, widths in map_images(
+            generate_variants, names, workers, force
+        ):
+            update_image_meta(name, variants=widths)
+            done += 1
+            if verbosity > 1:
+                self.stdout.write(name)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обработано фото: {done}.')
+        )
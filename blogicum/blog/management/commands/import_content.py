@@ -0,0 +1,77 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from django.utils.text import capfirst
+
+import blogicum.constans as const
+from blog import importer
+
+
+class Command(BaseCommand):
+    help = (
+        'Загружает пользователей, категории, местоположения, посты и '
+        'комментарии из JSON или JSONL пачками, без сигналов.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'source',
+            help='Фикстура Django, JSONL или «-» для стандартного ввода.'
+        )
+        parser.add_argument(
+            '--target',
+            choices=tuple(importer.FLAT_TARGETS),
+            help='Модель для плоских записей из export_content.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=const.IMPORT_BATCH_SIZE,
+            help='Сколько записей вставлять за одну транзакцию.'
+        )
+        parser.add_argument(
+            '--checkpoint',
+            help='Файл отметки; при повторном запуске загрузка '
+                 'продолжится с места остановки.'
+        )
+
+    def handle(
+            self, *args, source, target, batch_size, checkpoint, **options
+    ):
+        verbosity = options['verbosity']
+
+        def progress(records):
+            if verbosity > 1:
+                self.stdout.write(f'Обработано записей: {records}.')
+
+        file = (
+            sys.stdin if source == '-'
+            else open(source, encoding='utf-8')
+        )
+        try:
+            stats = importer.load(
+                file, target, batch_size, checkpoint, progress
+            )
+        except IntegrityError as error:
+            raise CommandError(
+                f'Пачка не загружена: {error}. Исправьте источник и '
+                'повторите загрузку с той же отметкой.'
+            )
+        finally:
+            if file is not sys.stdin:
+                file.close()
+        if stats['resumed']:
+            self.stdout.write(
+                f'Пропущено уже загруженных записей: {stats["resumed"]}.'
+            )
+        for model in importer.MODELS:
+            name = model._meta.model_name
+            if stats[name]:
+                self.stdout.write(
+                    f'{capfirst(model._meta.verbose_name_plural)}: '
+                    f'{stats[name]}.'
+                )
+        self.stdout.write(self.style.SUCCESS(
+            f'Загрузка завершена, пропущено записей: {stats["skipped"]}.'
+        ))
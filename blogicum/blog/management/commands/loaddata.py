@@ -0,0 +1,16 @@
+from django.core.management.commands import loaddata
+
+from blog import importer
+
+
+class Command(loaddata.Command):
+    help = (
+        loaddata.Command.help
+        + ' Затем пересчитывает производные данные блога: сигналы '
+        'при загрузке фикстур не срабатывают.'
+    )
+
+    def handle(self, *fixture_labels, **options):
+        super().handle(*fixture_labels, **options)
+        if self.loaded_object_count:
+            importer.recompute_derived()
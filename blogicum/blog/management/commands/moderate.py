@@ -0,0 +1,91 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+import blogicum.constans as const
+from blog.models import Comment, Post
+from blog.moderation import (
+    filter_content, set_comments_published, set_posts_published
+)
+
+TARGETS = {
+    'posts': (Post, set_posts_published),
+    'comments': (Comment, set_comments_published),
+}
+
+
+def parse_moment(value):
+    """Дата или время из командной строки; без зоны — в TIME_ZONE."""
+    try:
+        moment = parse_datetime(value)
+        if moment is None:
+            day = parse_date(value)
+            moment = day and datetime.combine(day, time.min)
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise CommandError(f'Не удалось разобрать дату «{value}».')
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+class Command(BaseCommand):
+    help = (
+        'Публикует или снимает с публикации посты и комментарии '
+        'пачками UPDATE по автору, категории и датам.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('target', choices=tuple(TARGETS))
+        action = parser.add_mutually_exclusive_group(required=True)
+        action.add_argument(
+            '--publish', dest='is_published', action='store_true'
+        )
+        action.add_argument(
+            '--unpublish', dest='is_published', action='store_false'
+        )
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument('--category', help='Слаг категории.')
+        parser.add_argument(
+            '--since', type=parse_moment,
+            help='Дата публикации поста или создания комментария, '
+                 'не раньше (включительно).'
+        )
+        parser.add_argument(
+            '--until', type=parse_moment,
+            help='Та же дата, раньше (не включительно).'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=const.MODERATION_BATCH_SIZE,
+            help='Сколько строк менять одним UPDATE.'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Только посчитать, ничего не меняя.'
+        )
+
+    def handle(
+            self, *args, target, is_published, author, category, since,
+            until, batch_size, dry_run, **options
+    ):
+        if not any((author, category, since, until)):
+            raise CommandError(
+                'Укажите хотя бы один отбор: --author, --category, '
+                '--since или --until.'
+            )
+        model, moderate = TARGETS[target]
+        queryset = filter_content(
+            model.objects.all(), author, category, since, until
+        )
+        if dry_run:
+            total = queryset.exclude(is_published=is_published).count()
+            self.stdout.write(f'Будет изменено: {total}.')
+            return
+        updated = moderate(queryset, is_published, batch_size=batch_size)
+        self.stdout.write(self.style.SUCCESS(f'Изменено: {updated}.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import rebuild_date_buckets
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает число публикаций по дням для фильтра по датам.'
+
+    def handle(self, *args, **options):
+        days = rebuild_date_buckets()
+        self.stdout.write(self.style.SUCCESS(f'Дней с публикациями: {days}.'))
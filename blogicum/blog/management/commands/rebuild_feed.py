@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from blog import feed
+
+
+class Command(BaseCommand):
+    help = 'Пересобирает таблицу записей ленты по публикациям.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько публикаций переносить за одну транзакцию.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        total = feed.rebuild(batch_size=batch_size)
+        self.stdout.write(
+            self.style.SUCCESS(f'Записей в ленте: {total}.')
+        )
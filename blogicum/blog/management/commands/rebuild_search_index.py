@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import search
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает полнотекстовый индекс публикаций и восстанавливает '
+        'триггеры, которые поддерживают его в актуальном состоянии.'
+    )
+
+    def handle(self, *args, **options):
+        if not search.is_available():
+            raise CommandError(
+                'Полнотекстовый поиск доступен только в SQLite.'
+            )
+        search.rebuild()
+        self.stdout.write(self.style.SUCCESS('Индекс поиска пересобран.'))
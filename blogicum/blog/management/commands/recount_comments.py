@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import update_comment_counts
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает счётчики комментариев у публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Сколько публикаций обновлять одним запросом.'
+        )
+
+    def handle(self, *args, batch_size, **options):
+        last_id = 0
+        updated = 0
+        while True:
+            upper_id = Post.objects.filter(pk__gt=last_id).order_by(
+                'pk'
+            ).values_list('pk', flat=True)[batch_size - 1:batch_size].first()
+            batch = Post.objects.filter(pk__gt=last_id)
+            if upper_id is not None:
+                batch = batch.filter(pk__lte=upper_id)
+            updated += update_comment_counts(batch)
+            if upper_id is None:
+                break
+            last_id = upper_id
+        self.stdout.write(
+            self.style.SUCCESS(f'Пересчитано публикаций: {updated}.')
+        )
@@ -0,0 +1,46 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+import blogicum.constans as const
+from blog.scheduler import get_visibility
+
+
+class Command(BaseCommand):
+    help = (
+        'Следит за отложенными публикациями и меняет эпоху видимости '
+        'точно в момент их выхода.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Проверить расписание один раз и выйти (для cron).'
+        )
+        parser.add_argument(
+            '--max-sleep',
+            type=float,
+            default=const.VISIBILITY_RECHECK_INTERVAL,
+            help='Наибольшая пауза между проверками, в секундах.'
+        )
+
+    def handle(self, *args, once, max_sleep, **options):
+        epoch = None
+        while True:
+            state = get_visibility()
+            if state.epoch != epoch:
+                epoch = state.epoch
+                self.stdout.write(
+                    f'Эпоха {state.epoch}: граница {state.cutoff:%c}, '
+                    f'следующая публикация {state.next_publication or "—"}.'
+                )
+            if once:
+                return
+            delay = max_sleep
+            if state.next_publication is not None:
+                delay = min(delay, (
+                    state.next_publication - timezone.now()
+                ).total_seconds())
+            time.sleep(max(delay, 0))
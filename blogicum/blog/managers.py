@@ -1,13 +1,28 @@
 from django.db import models
-from django.utils import timezone
+
+from blog.scheduler import get_visibility
+
+
+def published_filter() -> models.Q:
+    """Условие видимости поста для всех, кроме автора."""
+    return models.Q(
+        pub_date__lte=get_visibility().cutoff,
+        is_published=True,
+        category__is_published=True,
+    )
 
 
 class PostsManager(models.Manager):
     def get_queryset(self) -> models.QuerySet:
         return super().get_queryset().select_related(
             'author', 'category', 'location'
-        ).filter(
-            pub_date__lte=timezone.now(),
+        ).filter(published_filter())
+
+
+class FeedEntriesManager(models.Manager):
+    def get_queryset(self) -> models.QuerySet:
+        return super().get_queryset().filter(
+            pub_date__lte=get_visibility().cutoff,
             is_published=True,
-            category__is_published=True,
+            category_is_published=True,
         )
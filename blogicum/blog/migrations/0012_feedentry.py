@@ -0,0 +1,47 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_published_model_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=256)),
+                ('excerpt', models.TextField()),
+                ('pub_date', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('image', models.ImageField(blank=True, upload_to='posts_images')),
+                ('comment_count', models.PositiveIntegerField(default=0)),
+                ('is_published', models.BooleanField()),
+                ('author_id', models.BigIntegerField()),
+                ('author_username', models.CharField(max_length=150)),
+                ('category_id', models.BigIntegerField(null=True)),
+                ('category_slug', models.SlugField(blank=True)),
+                ('category_title', models.CharField(blank=True, max_length=256)),
+                ('category_is_published', models.BooleanField(default=False)),
+                ('location_name', models.CharField(max_length=256, null=True)),
+                ('location_is_published', models.BooleanField(default=False)),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Записи ленты',
+                'ordering': ('-pub_date', 'title'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(condition=models.Q(('category_is_published', True), ('is_published', True)), fields=['-pub_date', 'title', 'id'], name='feed_entry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(condition=models.Q(('category_is_published', True), ('is_published', True)), fields=['category_id', '-pub_date', 'title', 'id'], name='feed_entry_category_idx'),
+        ),
+    ]
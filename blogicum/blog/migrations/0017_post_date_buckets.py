@@ -0,0 +1,39 @@
+# Generated by Django 3.2.16 on 2026-10-18 19:30
+
+from django.db import migrations, models
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+
+
+def fill_date_buckets(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostDateBucket = apps.get_model('blog', 'PostDateBucket')
+    PostDateBucket.objects.bulk_create(
+        PostDateBucket(day=row['day'], post_count=row['total'])
+        for row in Post.objects.annotate(
+            day=TruncDate('pub_date')
+        ).order_by().values('day').annotate(total=Count('pk'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostDateBucket',
+            fields=[
+                ('day', models.DateField(primary_key=True, serialize=False, verbose_name='День')),
+                ('post_count', models.PositiveIntegerField(default=0, verbose_name='Число публикаций')),
+            ],
+            options={
+                'verbose_name': 'день публикаций',
+                'verbose_name_plural': 'Дни публикаций',
+                'ordering': ('day',),
+            },
+        ),
+        migrations.RunPython(fill_date_buckets, migrations.RunPython.noop),
+    ]
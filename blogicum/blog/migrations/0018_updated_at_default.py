@@ -0,0 +1,30 @@
+# Generated by Django 3.2.16 on 2026-10-18 21:07
+
+import core.models
+from django.db import migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0017_post_date_buckets'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='category',
+            name='updated_at',
+            field=core.models.ModifiedAtField(default=django.utils.timezone.now, editable=False, verbose_name='Изменено'),
+        ),
+        migrations.AlterField(
+            model_name='location',
+            name='updated_at',
+            field=core.models.ModifiedAtField(default=django.utils.timezone.now, editable=False, verbose_name='Изменено'),
+        ),
+        migrations.AlterField(
+            model_name='post',
+            name='updated_at',
+            field=core.models.ModifiedAtField(default=django.utils.timezone.now, editable=False, verbose_name='Изменено'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 3.2.16 on 2026-10-18 21:09
+
+import core.models
+from django.db import migrations
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0018_updated_at_default'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='updated_at',
+            field=core.models.ModifiedAtField(default=django.utils.timezone.now, editable=False, verbose_name='Изменено'),
+        ),
+    ]
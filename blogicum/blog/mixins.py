@@ -1,11 +1,39 @@
+import hashlib
+from http import HTTPStatus
+
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.db import transaction
+from django.db.models import Max
+from django.core.paginator import InvalidPage
+from django.http import Http404, HttpResponse
 from django.shortcuts import redirect
+from django.template.response import SimpleTemplateResponse
 from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+
+import blogicum.constans as const
+from .cache import cache_page_response, get_cached_page, page_cache_key
+from .models import Comment, Post
+from .pagination import CursorPaginator, InvalidCursor
+from .scheduler import get_visibility
+
 
-from .models import Comment
+class CachedObjectMixin:
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return self.load_object(queryset)
+        if not hasattr(self, '_object_cache'):
+            self._object_cache = self.load_object()
+        return self._object_cache
 
+    def load_object(self, queryset=None):
+        return super().get_object(queryset)
 
-class OnlyAuthorMixin(UserPassesTestMixin, LoginRequiredMixin):
+
+class OnlyAuthorMixin(
+    CachedObjectMixin, UserPassesTestMixin, LoginRequiredMixin
+):
     def test_func(self):
         return self.get_object().author == self.request.user
 
@@ -18,8 +46,149 @@ class ChangingCommentMixin:
     template_name = 'blog/comment.html'
     pk_url_kwarg = 'comment_id'
 
+    @transaction.atomic
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
+
     def get_success_url(self):
         return reverse(
             'blog:post_detail',
             kwargs={'post_id': self.object.pk}
         )
+
+
+class CursorPaginationMixin:
+    cursor_ordering = ('-pub_date', 'title', 'id')
+
+    def paginate_queryset(self, queryset, page_size):
+        if self.page_kwarg in self.request.GET:
+            return super().paginate_queryset(queryset, page_size)
+        paginator = CursorPaginator(queryset, page_size, self.cursor_ordering)
+        try:
+            page = paginator.page(
+                after=self.request.GET.get('after'),
+                before=self.request.GET.get('before'),
+            )
+        except InvalidCursor:
+            raise Http404('Неверный курсор страницы.')
+        return paginator, page, page.object_list, page.has_other_pages()
+
+    def check_pagination(self):
+        """Ошибки номера страницы и курсора без выборки самой страницы."""
+        if self.page_kwarg in self.request.GET:
+            page = self.request.GET[self.page_kwarg]
+            if page == 'last':
+                return
+            paginator = self.get_paginator(
+                self.get_queryset(), self.paginate_by,
+                allow_empty_first_page=self.get_allow_empty()
+            )
+            try:
+                paginator.validate_number(page)
+            except InvalidPage:
+                raise Http404('Неверный номер страницы.')
+            return
+        paginator = CursorPaginator(
+            self.get_queryset(), self.paginate_by, self.cursor_ordering
+        )
+        for name in ('after', 'before'):
+            cursor = self.request.GET.get(name)
+            if cursor:
+                try:
+                    paginator.decode(cursor)
+                except InvalidCursor:
+                    raise Http404('Неверный курсор страницы.')
+
+
+class AnonymousPageCacheMixin:
+    page_cache_timeout = const.PAGE_CACHE_TIMEOUT
+
+    def get_page_cache_scopes(self):
+        """Области, при изменении которых страница сбрасывается.
+
+        Считаются по адресу: на попадание в кеш не нужно ни запроса.
+        """
+        return ()
+
+    def dispatch(self, request, *args, **kwargs):
+        if (
+            not self.page_cache_timeout
+            or request.method not in ('GET', 'HEAD')
+            or request.user.is_authenticated
+        ):
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request, self.get_page_cache_scopes())
+        response = get_cached_page(key)
+        if response is not None:
+            return get_conditional_response(
+                request,
+                etag=response.get('ETag'),
+                last_modified=parse_http_date_safe(
+                    response.get('Last-Modified', '')
+                ),
+                response=response,
+            )
+        response = super().dispatch(request, *args, **kwargs)
+        # Ответ на HEAD без отрисовки шаблона не кешируется.
+        if response.status_code == HTTPStatus.OK and isinstance(
+            response, SimpleTemplateResponse
+        ):
+            response.add_post_render_callback(
+                lambda response: self._cache_page(key, response)
+            )
+        return response
+
+    def _cache_page(self, key, response):
+        if response.cookies or self.request.META.get('CSRF_COOKIE_USED'):
+            return
+        cache_page_response(key, response, self.page_cache_timeout)
+
+
+class ConditionalGetMixin:
+    def get_last_modified(self):
+        return Post.objects.aggregate(
+            last_modified=Max('updated_at')
+        )['last_modified']
+
+    def get_etag(self, last_modified):
+        raw = '|'.join(str(part) for part in (
+            self.request.get_full_path(),
+            self.request.user.pk,
+            get_visibility().epoch,
+            last_modified.timestamp(),
+        ))
+        return f'"{hashlib.md5(raw.encode()).hexdigest()}"'
+
+    def check_request(self):
+        """Всё, из-за чего GET ответил бы 404, — до ответа по меткам.
+
+        Объект страницы загружается здесь один раз и переиспользуется.
+        """
+        if hasattr(self, 'load_object'):
+            self.get_object()
+        check_pagination = getattr(self, 'check_pagination', None)
+        if check_pagination is not None:
+            check_pagination()
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        self.check_request()
+        last_modified = self.get_last_modified()
+        if last_modified is None:
+            return super().dispatch(request, *args, **kwargs)
+        etag = self.get_etag(last_modified)
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified.timestamp()
+        )
+        if response is None and request.method == 'HEAD':
+            response = HttpResponse()
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != HTTPStatus.OK:
+                return response
+        response.setdefault('ETag', etag)
+        response.setdefault(
+            'Last-Modified', http_date(last_modified.timestamp())
+        )
+        return response
@@ -1,11 +1,16 @@
+from typing import NamedTuple, Optional
+
 from django.contrib.auth import get_user_model
 from django.db import models
 from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.text import Truncator
 
 import blog.utils
-from blog.managers import PostsManager
+from blog.managers import FeedEntriesManager, PostsManager
 import blogicum.constans as const
 from core.models import PublishedModel
+from core.storage import content_storage
 
 User = get_user_model()
 
@@ -30,6 +35,13 @@ class Category(PublishedModel):
     class Meta(PublishedModel.Meta):
         verbose_name = 'категория'
         verbose_name_plural = 'Категории'
+        indexes = (
+            models.Index(
+                fields=('title',),
+                name='category_title_idx',
+                condition=models.Q(is_published=True)
+            ),
+        )
 
     def __str__(self):
         return blog.utils.get_first_words(self.title)
@@ -44,6 +56,13 @@ class Location(PublishedModel):
     class Meta(PublishedModel.Meta):
         verbose_name = 'местоположение'
         verbose_name_plural = 'Местоположения'
+        indexes = (
+            models.Index(
+                fields=('name',),
+                name='location_name_idx',
+                condition=models.Q(is_published=True)
+            ),
+        )
 
     def __str__(self):
         return self.name
@@ -67,6 +86,7 @@ class Post(PublishedModel):
     image = models.ImageField(
         verbose_name='Фото',
         upload_to='posts_images',
+        storage=content_storage,
         blank=True
     )
     author = models.ForeignKey(
@@ -89,6 +109,17 @@ class Post(PublishedModel):
         related_name='posts',
         verbose_name='Категория'
     )
+    comment_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        verbose_name='Число комментариев'
+    )
+    image_meta = models.JSONField(
+        default=dict,
+        blank=True,
+        editable=False,
+        verbose_name='Сведения о фото'
+    )
 
     objects = models.Manager()
     published_posts = PostsManager()
@@ -97,6 +128,30 @@ class Post(PublishedModel):
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date', 'title')
+        indexes = (
+            models.Index(
+                fields=('-pub_date', 'title', 'id'),
+                name='post_feed_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('category', '-pub_date', 'title', 'id'),
+                name='post_category_feed_idx',
+                condition=models.Q(is_published=True)
+            ),
+            models.Index(
+                fields=('author', '-pub_date', 'title', 'id'),
+                name='post_author_feed_idx'
+            ),
+            models.Index(
+                fields=('updated_at',),
+                name='post_updated_idx'
+            ),
+            models.Index(
+                fields=('image',),
+                name='post_image_idx'
+            ),
+        )
 
     def __str__(self):
         return blog.utils.get_first_words(self.title)
@@ -107,6 +162,12 @@ class Post(PublishedModel):
             kwargs={'username': self.author.username}
         )
 
+    @property
+    def excerpt(self):
+        return Truncator(self.text).words(
+            const.COUNT_WORDS_IN_EXCERPT, truncate=' …'
+        )
+
 
 class Comment(PublishedModel):
     text = models.TextField('Текст комментария')
@@ -126,6 +187,116 @@ class Comment(PublishedModel):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ('created_at', 'text')
+        indexes = (
+            models.Index(
+                fields=('post', 'created_at'),
+                name='comment_post_created_idx'
+            ),
+        )
 
     def __str__(self):
         return blog.utils.get_first_words(self.text)
+
+
+class PostDateBucket(models.Model):
+    day = models.DateField(primary_key=True, verbose_name='День')
+    post_count = models.PositiveIntegerField(
+        default=0,
+        verbose_name='Число публикаций'
+    )
+
+    class Meta:
+        verbose_name = 'день публикаций'
+        verbose_name_plural = 'Дни публикаций'
+        ordering = ('day',)
+
+    def __str__(self):
+        return f'{self.day}: {self.post_count}'
+
+
+class FeedAuthor(NamedTuple):
+    username: str
+
+
+class FeedCategory(NamedTuple):
+    slug: str
+    title: str
+    is_published: bool
+
+
+class FeedLocation(NamedTuple):
+    name: str
+    is_published: bool
+
+
+class FeedEntry(models.Model):
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=const.MAX_LENGTH)
+    excerpt = models.TextField()
+    pub_date = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    image = models.ImageField(
+        upload_to='posts_images',
+        storage=content_storage,
+        blank=True
+    )
+    image_meta = models.JSONField(default=dict)
+    comment_count = models.PositiveIntegerField(default=0)
+    is_published = models.BooleanField()
+    author_id = models.BigIntegerField()
+    author_username = models.CharField(max_length=150)
+    category_id = models.BigIntegerField(null=True)
+    category_slug = models.SlugField(blank=True)
+    category_title = models.CharField(max_length=const.MAX_LENGTH, blank=True)
+    category_is_published = models.BooleanField(default=False)
+    location_name = models.CharField(
+        max_length=const.MAX_LENGTH,
+        null=True
+    )
+    location_is_published = models.BooleanField(default=False)
+
+    objects = models.Manager()
+    visible = FeedEntriesManager()
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Записи ленты'
+        ordering = ('-pub_date', 'title')
+        indexes = (
+            models.Index(
+                fields=('-pub_date', 'title', 'id'),
+                name='feed_entry_idx',
+                condition=models.Q(
+                    is_published=True, category_is_published=True
+                )
+            ),
+            models.Index(
+                fields=('category_id', '-pub_date', 'title', 'id'),
+                name='feed_entry_category_idx',
+                condition=models.Q(
+                    is_published=True, category_is_published=True
+                )
+            ),
+        )
+
+    def __str__(self):
+        return blog.utils.get_first_words(self.title)
+
+    @cached_property
+    def author(self):
+        return FeedAuthor(self.author_username)
+
+    @cached_property
+    def category(self) -> Optional[FeedCategory]:
+        if self.category_id is None:
+            return None
+        return FeedCategory(
+            self.category_slug, self.category_title,
+            self.category_is_published
+        )
+
+    @cached_property
+    def location(self) -> Optional[FeedLocation]:
+        if self.location_name is None:
+            return None
+        return FeedLocation(self.location_name, self.location_is_published)
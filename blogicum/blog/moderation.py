@@ -0,0 +1,93 @@
+from django.db import transaction
+from django.db.models.functions import Now
+
+import blogicum.constans as const
+from .cache import invalidate_pages
+from .counters import update_comment_counts
+from .models import Comment, FeedEntry, Post
+from .scheduler import advance_epoch
+
+
+def pk_ranges(queryset, batch_size):
+    """Делит выборку на поддиапазоны по id не больше batch_size строк."""
+    last_id = 0
+    while True:
+        upper_id = queryset.filter(pk__gt=last_id).order_by(
+            'pk'
+        ).values_list('pk', flat=True)[batch_size - 1:batch_size].first()
+        batch = queryset.filter(pk__gt=last_id)
+        if upper_id is not None:
+            batch = batch.filter(pk__lte=upper_id)
+        yield batch
+        if upper_id is None:
+            return
+        last_id = upper_id
+
+
+def filter_content(
+        queryset, author=None, category=None, since=None, until=None
+):
+    """Отбор по автору, слагу категории и полуинтервалу дат."""
+    prefix = 'post__' if queryset.model is Comment else ''
+    date_field = 'created_at' if queryset.model is Comment else 'pub_date'
+    if author is not None:
+        queryset = queryset.filter(author__username=author)
+    if category is not None:
+        queryset = queryset.filter(**{f'{prefix}category__slug': category})
+    if since is not None:
+        queryset = queryset.filter(**{f'{date_field}__gte': since})
+    if until is not None:
+        queryset = queryset.filter(**{f'{date_field}__lt': until})
+    return queryset
+
+
+def set_posts_published(
+        posts, is_published, batch_size=const.MODERATION_BATCH_SIZE
+):
+    """Публикует или снимает посты пачками UPDATE, минуя сигналы.
+
+    Ленту обновляет вместе с каждой пачкой, эпоху видимости и кеш
+    страниц — один раз за вызов.
+    """
+    updated = 0
+    for batch in pk_ranges(
+        posts.exclude(is_published=is_published), batch_size
+    ):
+        with transaction.atomic():
+            FeedEntry.objects.filter(pk__in=batch.values('pk')).update(
+                is_published=is_published, updated_at=Now()
+            )
+            updated += batch.update(
+                is_published=is_published, updated_at=Now()
+            )
+    if updated:
+        transaction.on_commit(advance_epoch)
+        transaction.on_commit(invalidate_pages)
+    return updated
+
+
+def set_comments_published(
+        comments, is_published, batch_size=const.MODERATION_BATCH_SIZE
+):
+    """Публикует или снимает комментарии пачками UPDATE.
+
+    Счётчики затронутых постов пересчитываются после всех пачек.
+    """
+    updated = 0
+    post_ids = set()
+    for batch in pk_ranges(
+        comments.exclude(is_published=is_published), batch_size
+    ):
+        with transaction.atomic():
+            post_ids.update(
+                batch.order_by().values_list('post_id', flat=True).distinct()
+            )
+            updated += batch.update(is_published=is_published)
+    if updated:
+        post_ids = sorted(post_ids)
+        for start in range(0, len(post_ids), batch_size):
+            update_comment_counts(Post.objects.filter(
+                pk__in=post_ids[start:start + batch_size]
+            ))
+        transaction.on_commit(invalidate_pages)
+    return updated
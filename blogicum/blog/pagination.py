@@ -0,0 +1,207 @@
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from datetime import date, datetime
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import Max, Q
+from django.utils.functional import cached_property
+
+import blogicum.constans as const
+
+
+class InvalidCursor(Exception):
+    pass
+
+
+class CursorPage(Sequence):
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __repr__(self):
+        return f'<CursorPage: {len(self)} objects>'
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator:
+    """Постраничный вывод по ключу сортировки вместо OFFSET.
+
+    Поля ``ordering`` не должны допускать NULL, а последним из них
+    должен идти уникальный ключ, разрешающий совпадения.
+    """
+
+    def __init__(self, queryset, per_page, ordering):
+        self.queryset = queryset.order_by(*ordering)
+        self.per_page = per_page
+        self.ordering = tuple(
+            (name.lstrip('-'), name.startswith('-')) for name in ordering
+        )
+
+    def page(self, after=None, before=None):
+        if before:
+            return self._page_before(self.decode(before))
+        values = self.decode(after) if after else None
+        queryset = self.queryset
+        if values is not None:
+            queryset = queryset.filter(self._seek(values, backwards=False))
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        return CursorPage(
+            rows,
+            next_cursor=self.encode(rows[-1]) if has_more else None,
+            previous_cursor=(
+                self.encode(rows[0]) if values is not None and rows else None
+            ),
+        )
+
+    def _page_before(self, values):
+        queryset = self.queryset.filter(
+            self._seek(values, backwards=True)
+        ).order_by(*(
+            name if desc else f'-{name}' for name, desc in self.ordering
+        ))
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page][::-1]
+        return CursorPage(
+            rows,
+            next_cursor=self.encode(rows[-1]) if rows else None,
+            previous_cursor=self.encode(rows[0]) if has_more else None,
+        )
+
+    def _seek(self, values, backwards):
+        condition = Q()
+        for index, (name, desc) in enumerate(self.ordering):
+            lookup = 'lt' if desc != backwards else 'gt'
+            step = Q(**{f'{name}__{lookup}': values[index]})
+            for prev_index, (prev_name, _) in enumerate(
+                self.ordering[:index]
+            ):
+                step &= Q(**{prev_name: values[prev_index]})
+            condition |= step
+        return condition
+
+    def encode(self, obj):
+        raw = []
+        for name, _ in self.ordering:
+            value = getattr(obj, name)
+            if isinstance(value, (date, datetime)):
+                value = value.isoformat()
+            raw.append(value)
+        return base64.urlsafe_b64encode(
+            json.dumps(raw, ensure_ascii=False).encode()
+        ).decode().rstrip('=')
+
+    def decode(self, cursor):
+        try:
+            raw = json.loads(base64.urlsafe_b64decode(
+                cursor + '=' * (-len(cursor) % 4)
+            ))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise InvalidCursor(cursor)
+        if not isinstance(raw, list) or len(raw) != len(self.ordering):
+            raise InvalidCursor(cursor)
+        values = []
+        for (name, _), value in zip(self.ordering, raw):
+            # Курсор приходит от клиента: в нём может оказаться что угодно.
+            if isinstance(value, bool) or not isinstance(
+                value, (str, int, float)
+            ):
+                raise InvalidCursor(cursor)
+            try:
+                value = self._field(name).to_python(value)
+            except (TypeError, ValidationError):
+                raise InvalidCursor(cursor)
+            if value is None:
+                raise InvalidCursor(cursor)
+            values.append(value)
+        return values
+
+    def _field(self, name):
+        try:
+            return self.queryset.model._meta.get_field(name)
+        except FieldDoesNotExist:
+            # Сортировка по аннотации, например по рангу поиска.
+            return self.queryset.query.annotations[name].output_field
+
+
+def estimate_row_count(model, using='default'):
+    """Примерное число строк без полного прохода по таблице.
+
+    Берётся из статистики ANALYZE, а без неё — по наибольшему ключу.
+    """
+    connection = connections[using]
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            )
+            if cursor.fetchone():
+                cursor.execute(
+                    'SELECT stat FROM sqlite_stat1 WHERE tbl = %s LIMIT 1',
+                    (model._meta.db_table,)
+                )
+                row = cursor.fetchone()
+                if row:
+                    return int(row[0].split()[0])
+    return model._default_manager.using(using).aggregate(
+        total=Max('pk')
+    )['total'] or 0
+
+
+class EstimatedCountPaginator(Paginator):
+    """Не считает COUNT(*) по большим выборкам.
+
+    Счёт идёт не дальше const.ADMIN_COUNT_LIMIT; если строк больше
+    и фильтров нет, число строк оценивается. С фильтром счёт по
+    открытой странице продлевается на одну строку дальше неё: за
+    пределом лимита всегда видна ссылка на следующую страницу.
+    """
+
+    limit = const.ADMIN_COUNT_LIMIT
+
+    def count_up_to(self, limit):
+        return self.object_list.order_by()[:limit].count()
+
+    @property
+    def truncated(self):
+        return self.count >= self.limit and bool(self.object_list.query.where)
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        count = self.count_up_to(self.limit)
+        if count < self.limit or queryset.query.where:
+            return count
+        return max(count, estimate_row_count(queryset.model, queryset.db))
+
+    def page(self, number):
+        if self.truncated:
+            try:
+                window = int(number) * self.per_page + 1
+            except (TypeError, ValueError):
+                window = 0
+            if window > self.count:
+                self.count = self.count_up_to(window)
+                self.__dict__.pop('num_pages', None)
+        return super().page(number)
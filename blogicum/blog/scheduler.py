@@ -0,0 +1,79 @@
+import time
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from django.core.cache import cache
+from django.utils import timezone
+
+import blogicum.constans as const
+
+VISIBILITY_KEY = 'visibility:state'
+
+
+class Visibility(NamedTuple):
+    epoch: int
+    cutoff: datetime
+    next_publication: Optional[datetime]
+    checked_at: float
+    # Меняется, только когда посты стали видны по времени, а не от
+    # правки: страницы из кеша при правке сбрасываются по областям.
+    schedule_epoch: int
+
+
+def get_visibility():
+    """Текущая эпоха видимости публикаций.
+
+    Пока эпоха не сменилась, граница ``cutoff`` не двигается, поэтому
+    запросы к опубликованным постам одинаковы и их можно кешировать.
+    Эпоха меняется при выходе отложенной публикации и при изменении
+    видимости постов или категорий. Раз в
+    ``VISIBILITY_RECHECK_INTERVAL`` секунд граница сверяется с базой
+    на случай, если пост добавил процесс с другим локальным кешем.
+    """
+    now = timezone.now()
+    state = cache.get(VISIBILITY_KEY)
+    if state is None or (
+        state.next_publication is not None
+        and now >= state.next_publication
+    ):
+        return advance_epoch(now, scheduled=True)
+    if time.time() - state.checked_at > const.VISIBILITY_RECHECK_INTERVAL:
+        if _published_since(state.cutoff, now):
+            return advance_epoch(now, scheduled=True)
+        state = state._replace(checked_at=time.time())
+        cache.set(VISIBILITY_KEY, state, None)
+    return state
+
+
+def advance_epoch(now=None, scheduled=False):
+    from .models import Post
+
+    now = now or timezone.now()
+    epoch = time.time_ns()
+    previous = cache.get(VISIBILITY_KEY)
+    if not scheduled and previous is not None and (
+        previous.next_publication is None
+        or previous.next_publication > now
+    ):
+        schedule_epoch = previous.schedule_epoch
+    else:
+        schedule_epoch = epoch
+    state = Visibility(
+        epoch=epoch,
+        cutoff=now,
+        next_publication=Post.objects.filter(
+            is_published=True, pub_date__gt=now
+        ).order_by('pub_date').values_list('pub_date', flat=True).first(),
+        checked_at=time.time(),
+        schedule_epoch=schedule_epoch,
+    )
+    cache.set(VISIBILITY_KEY, state, None)
+    return state
+
+
+def _published_since(cutoff, now):
+    from .models import Post
+
+    return Post.objects.filter(
+        is_published=True, pub_date__gt=cutoff, pub_date__lte=now
+    ).exists()
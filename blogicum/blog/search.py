@@ -0,0 +1,151 @@
+import re
+
+from django.db import connection, connections
+from django.db.models import FloatField, TextField
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+import blogicum.constans as const
+
+FTS_TABLE = 'blog_post_fts'
+TERM = re.compile(r'\w+')
+# Служебные символы вместо <mark>: разметку вставляем после экранирования.
+MARK_START, MARK_END = '\x02', '\x03'
+
+
+# Совпадают с триггерами из миграции 0015. SQLite удаляет триггеры,
+# когда миграция пересоздаёт blog_post, поэтому после migrate они
+# восстанавливаются (см. ensure_triggers).
+TRIGGERS_SQL = (
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert
+    AFTER INSERT ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete
+    AFTER DELETE ON blog_post BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update
+    AFTER UPDATE OF title, text ON blog_post
+    WHEN old.title IS NOT new.title OR old.text IS NOT new.text BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, text)
+        VALUES ('delete', old.id, old.title, old.text);
+        INSERT INTO {FTS_TABLE}(rowid, title, text)
+        VALUES (new.id, new.title, new.text);
+    END
+    """,
+)
+
+
+def is_available():
+    return connection.vendor == 'sqlite'
+
+
+def match_expression(text):
+    """Запрос FTS5 из пользовательского ввода: все слова, по префиксу.
+
+    Операторы FTS5 из ввода не пропускаются, поэтому ошибка синтаксиса
+    MATCH невозможна.
+    """
+    terms = TERM.findall(text.lower())[:const.SEARCH_MAX_TERMS]
+    return ' '.join(f'"{term}"*' for term in terms)
+
+
+def matching_ids(match):
+    return RawSQL(
+        f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s',
+        (match,)
+    )
+
+
+def search(queryset, match):
+    """Публикации, подходящие под match, с рангом и подсветкой.
+
+    Меньший rank — более релевантный результат (bm25 в FTS5
+    отрицателен); заголовок весит больше текста.
+    """
+    return queryset.extra(
+        tables=(FTS_TABLE,),
+        where=(
+            f'{FTS_TABLE}.rowid = {queryset.model._meta.db_table}.id',
+            f'{FTS_TABLE} MATCH %s',
+        ),
+        params=(match,),
+    ).annotate(
+        rank=RawSQL(
+            f'bm25({FTS_TABLE}, %s, 1.0)', (const.SEARCH_TITLE_WEIGHT,),
+            output_field=FloatField()
+        ),
+        title_highlight=RawSQL(
+            f'highlight({FTS_TABLE}, 0, %s, %s)', (MARK_START, MARK_END),
+            output_field=TextField()
+        ),
+        text_snippet=RawSQL(
+            f'snippet({FTS_TABLE}, 1, %s, %s, %s, %s)',
+            (MARK_START, MARK_END, '…', const.SEARCH_SNIPPET_TOKENS),
+            output_field=TextField()
+        ),
+    )
+
+
+def render_highlight(value):
+    return mark_safe(
+        escape(value).replace(MARK_START, '<mark>').replace(
+            MARK_END, '</mark>'
+        )
+    )
+
+
+def ensure_triggers(using=None):
+    """Восстанавливает триггеры; возвращает True, если чего-то не было."""
+    target = connections[using] if using else connection
+    if target.vendor != 'sqlite':
+        return False
+    with target.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' "
+            "AND name LIKE %s",
+            (f'{FTS_TABLE}_%',)
+        )
+        if cursor.fetchone()[0] == len(TRIGGERS_SQL):
+            return False
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = %s", (FTS_TABLE,)
+        )
+        if cursor.fetchone() is None:
+            return False
+        for statement in TRIGGERS_SQL:
+            cursor.execute(statement)
+    return True
+
+
+def drop_triggers():
+    """Отключает индексацию на время массовой загрузки.
+
+    Вернуть её нужно через rebuild(); после migrate триггеры
+    восстанавливаются сами.
+    """
+    if not is_available():
+        return
+    with connection.cursor() as cursor:
+        for action in ('insert', 'delete', 'update'):
+            cursor.execute(f'DROP TRIGGER IF EXISTS {FTS_TABLE}_{action}')
+
+
+def rebuild():
+    ensure_triggers()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+        )
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('optimize')"
+        )
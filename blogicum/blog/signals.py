@@ -0,0 +1,376 @@
+from functools import wraps
+
+from django.db import connections
+from django.db.models.signals import (
+    post_delete, post_migrate, post_save, pre_delete, pre_save
+)
+from django.db.models.functions import Now
+from django.dispatch import receiver
+from django.utils import timezone
+
+from . import autocomplete, feed, search
+from .cache import invalidate_pages
+from .counters import shift_date_bucket, update_comment_counts
+from .images import (
+    read_image_meta, release_image_on_commit, schedule_variants_on_commit
+)
+from .models import Category, Comment, Location, Post, User
+from .scheduler import advance_epoch
+
+VISIBILITY_FIELDS = {
+    Post: ('is_published', 'pub_date', 'category_id'),
+    Category: ('is_published',),
+}
+# Поля пользователя на странице профиля; username есть и на карточках.
+PROFILE_FIELDS = ('username', 'first_name', 'last_name', 'is_staff')
+PUB_DATE = Post._meta.get_field('pub_date')
+TRACKED_FIELDS = {
+    Post: VISIBILITY_FIELDS[Post] + ('author_id', 'image'),
+    Category: VISIBILITY_FIELDS[Category],
+}
+
+
+def skip_raw(handler):
+    """Не вызывает обработчик для сохранений из фикстур (raw).
+
+    loaddata пишет строки как есть и в любом порядке: автора поста может
+    ещё не быть. Производные данные пересчитываются после загрузки.
+    """
+    @wraps(handler)
+    def wrapper(sender, **kwargs):
+        if kwargs.get('raw'):
+            return None
+        return handler(sender, **kwargs)
+    return wrapper
+
+
+def _pub_date(value):
+    # В атрибуте может остаться строка или наивное время, с которыми
+    # пост сохранили; в БД они попадают как время TIME_ZONE.
+    value = PUB_DATE.to_python(value)
+    if value is not None and timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value
+
+
+@receiver(pre_save, sender=Comment)
+@skip_raw
+def remember_comment_post(sender, instance, **kwargs):
+    instance._previous_comment = (
+        Comment.objects.filter(pk=instance.pk).values_list(
+            'post_id', 'is_published'
+        ).first() if instance.pk else None
+    )
+    instance._previous_post_id = (
+        instance._previous_comment and instance._previous_comment[0]
+    )
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@skip_raw
+def refresh_post_comment_count(sender, instance, **kwargs):
+    post_ids = {instance.post_id}
+    previous_post_id = getattr(instance, '_previous_post_id', None)
+    if previous_post_id is not None:
+        post_ids.add(previous_post_id)
+    update_comment_counts(Post.objects.filter(pk__in=post_ids))
+
+
+def post_page_scopes(states):
+    """Области кеша страниц, где видны посты в состояниях states.
+
+    Состояние — словарь с id, author_id, category_id, is_published и
+    pub_date. Главная затрагивается, только если пост на ней виден.
+    """
+    states = [state for state in states if state]
+    categories = {
+        pk: (slug, is_published)
+        for pk, slug, is_published in Category.objects.filter(
+            pk__in={state['category_id'] for state in states}
+        ).values_list('pk', 'slug', 'is_published')
+    }
+    authors = dict(User.objects.filter(
+        pk__in={state['author_id'] for state in states}
+    ).values_list('pk', 'username'))
+    now = timezone.now()
+    scopes = set()
+    for state in states:
+        scopes.add(f'post:{state["id"]}')
+        if state['author_id'] in authors:
+            scopes.add(f'author:{authors[state["author_id"]]}')
+        slug, category_is_published = categories.get(
+            state['category_id'], (None, False)
+        )
+        if slug is not None:
+            scopes.add(f'category:{slug}')
+        if (
+            state['is_published'] and category_is_published
+            and _pub_date(state['pub_date']) <= now
+        ):
+            scopes.add('feed')
+    return scopes
+
+
+def _post_state(post):
+    return {
+        field: getattr(post, field)
+        for field in ('id', 'author_id') + VISIBILITY_FIELDS[Post]
+    }
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+@skip_raw
+def invalidate_post_pages(sender, instance, **kwargs):
+    previous = getattr(instance, '_previous_state', None)
+    if previous:
+        previous = dict(previous, id=instance.pk)
+    invalidate_pages(*post_page_scopes((_post_state(instance), previous)))
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@skip_raw
+def invalidate_comment_pages(sender, instance, created=False, **kwargs):
+    previous = getattr(instance, '_previous_comment', None)
+    if previous and previous == (instance.post_id, instance.is_published):
+        # Правка текста видна только на странице поста.
+        invalidate_pages(f'post:{instance.post_id}')
+        return
+    # Изменилось число комментариев, а его показывают карточки в лентах.
+    post_ids = {instance.post_id, previous and previous[0]} - {None}
+    invalidate_pages(*post_page_scopes(
+        Post.objects.filter(pk__in=post_ids).values(
+            'id', 'author_id', *VISIBILITY_FIELDS[Post]
+        )
+    ))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+@skip_raw
+def invalidate_pages_on_related_change(sender, created, **kwargs):
+    # Названия категорий и мест есть на карточках во всех лентах.
+    if not created:
+        invalidate_pages()
+
+
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=User)
+def invalidate_pages_on_delete(sender, **kwargs):
+    invalidate_pages()
+
+
+@receiver(post_save, sender=User)
+@skip_raw
+def invalidate_pages_on_user_change(sender, instance, created, **kwargs):
+    # Имя автора есть на карточках; новые пользователи и вход на сайт
+    # страниц не меняют.
+    if created:
+        return
+    if getattr(instance, '_previous_username', None) != instance.username:
+        invalidate_pages()
+    elif _profile_changed(instance):
+        invalidate_pages(f'author:{instance.username}')
+
+
+@receiver(pre_save, sender=User)
+@skip_raw
+def remember_username(sender, instance, update_fields, **kwargs):
+    current = _profile(instance)
+    if update_fields and not set(update_fields) & set(PROFILE_FIELDS):
+        previous = current
+    elif instance.pk:
+        previous = User.objects.filter(pk=instance.pk).values_list(
+            *PROFILE_FIELDS
+        ).first() or current
+    else:
+        previous = current
+    instance._previous_profile = previous
+    instance._previous_username = previous[0]
+
+
+def _profile(user):
+    return tuple(getattr(user, field) for field in PROFILE_FIELDS)
+
+
+def _profile_changed(user):
+    return getattr(user, '_previous_profile', None) != _profile(user)
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+@skip_raw
+def touch_posts_of_related(sender, instance, created, **kwargs):
+    if not created:
+        Post.objects.filter(
+            **{sender._meta.model_name: instance}
+        ).update(updated_at=Now())
+
+
+@receiver(post_save, sender=User)
+@skip_raw
+def touch_posts_of_changed_author(sender, instance, created, **kwargs):
+    # Метка изменений профиля и карточек — Post.updated_at его постов;
+    # имя автора есть и у его комментариев на страницах чужих постов.
+    if not created and _profile_changed(instance):
+        instance.posts.update(updated_at=Now())
+        instance.comments.update(updated_at=Now())
+
+
+@receiver(pre_save, sender=Post)
+@receiver(pre_save, sender=Category)
+@skip_raw
+def remember_previous_state(sender, instance, **kwargs):
+    fields = TRACKED_FIELDS[sender]
+    previous = (
+        sender.objects.filter(pk=instance.pk).values(*fields).first()
+        if instance.pk else None
+    )
+    instance._previous_state = previous
+    instance._previous_visibility = previous and tuple(
+        previous[field] for field in VISIBILITY_FIELDS[sender]
+    )
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_save, sender=Category)
+@skip_raw
+def advance_epoch_on_visibility_change(sender, instance, **kwargs):
+    current = tuple(
+        getattr(instance, field) for field in VISIBILITY_FIELDS[sender]
+    )
+    if getattr(instance, '_previous_visibility', None) != current:
+        advance_epoch()
+
+
+@receiver(pre_save, sender=Post)
+@skip_raw
+def reset_image_meta_on_change(sender, instance, update_fields, **kwargs):
+    if update_fields and 'image' not in update_fields:
+        instance._image_changed = False
+        return
+    previous = getattr(instance, '_previous_state', None) or {}
+    instance._image_changed = (
+        not instance.image._committed
+        or previous.get('image') != instance.image.name
+    )
+    if instance._image_changed:
+        instance.image_meta = (
+            read_image_meta(instance.image) if instance.image else {}
+        )
+
+
+@receiver(post_save, sender=Post)
+@skip_raw
+def schedule_image_variants(sender, instance, **kwargs):
+    if not getattr(instance, '_image_changed', False):
+        return
+    if instance.image:
+        schedule_variants_on_commit(instance.image.name)
+    previous = (getattr(instance, '_previous_state', None) or {}).get('image')
+    if previous and previous != instance.image.name:
+        release_image_on_commit(previous)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_image(sender, instance, **kwargs):
+    if instance.image:
+        release_image_on_commit(instance.image.name)
+
+
+@receiver(post_delete, sender=Post)
+@receiver(post_delete, sender=Category)
+def advance_epoch_on_delete(sender, **kwargs):
+    advance_epoch()
+
+
+@receiver(post_save, sender=Post)
+@skip_raw
+def sync_feed_entry(sender, instance, **kwargs):
+    feed.sync_post(instance)
+
+
+@receiver(post_delete, sender=Post)
+def delete_feed_entry(sender, instance, **kwargs):
+    feed.delete_post(instance.pk)
+
+
+@receiver(post_save, sender=Category)
+@skip_raw
+def sync_feed_category(sender, instance, created, **kwargs):
+    if not created:
+        feed.sync_category(instance)
+
+
+@receiver(post_delete, sender=Category)
+def detach_feed_category(sender, instance, **kwargs):
+    feed.detach_category(instance.pk)
+
+
+@receiver(post_save, sender=Location)
+@skip_raw
+def sync_feed_location(sender, instance, created, **kwargs):
+    if not created:
+        feed.sync_location(instance)
+
+
+@receiver(pre_delete, sender=Location)
+def detach_feed_location(sender, instance, **kwargs):
+    feed.sync_location(instance, deleted=True)
+
+
+@receiver(post_save, sender=User)
+@skip_raw
+def sync_feed_author(sender, instance, **kwargs):
+    if getattr(instance, '_previous_username', None) != instance.username:
+        feed.sync_author(instance)
+
+
+@receiver(post_migrate)
+def restore_search_triggers(sender, using, **kwargs):
+    if sender.name == 'blog' and search.ensure_triggers(using):
+        # Пока триггеров не было, индекс мог отстать от таблицы.
+        with connections[using].cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {search.FTS_TABLE}({search.FTS_TABLE}) "
+                "VALUES ('rebuild')"
+            )
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=User)
+@skip_raw
+def invalidate_autocomplete(sender, **kwargs):
+    autocomplete.invalidate()
+
+
+@receiver(post_save, sender=User)
+@skip_raw
+def invalidate_autocomplete_on_user_change(sender, update_fields, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    autocomplete.invalidate()
+
+
+@receiver(post_save, sender=Post)
+@skip_raw
+def move_post_date_bucket(sender, instance, created, **kwargs):
+    day = timezone.localdate(_pub_date(instance.pub_date))
+    previous = getattr(instance, '_previous_state', None)
+    if previous:
+        previous_day = timezone.localdate(_pub_date(previous['pub_date']))
+        if previous_day == day:
+            return
+        shift_date_bucket(previous_day, -1)
+    shift_date_bucket(day, 1)
+
+
+@receiver(post_delete, sender=Post)
+def release_post_date_bucket(sender, instance, **kwargs):
+    shift_date_bucket(timezone.localdate(_pub_date(instance.pub_date)), -1)
@@ -0,0 +1,19 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from blog.cache import get_or_render_post_card
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def post_card(context, post):
+    user = context.get('user')
+    card_template = context.template.engine.get_template(
+        'includes/post_card.html'
+    )
+    return mark_safe(get_or_render_post_card(
+        post,
+        viewer_is_author=getattr(user, 'pk', None) == post.author_id,
+        render=lambda: card_template.render(context.new({'post': post})),
+    ))
@@ -0,0 +1,111 @@
+import datetime
+
+from django import template
+from django.contrib.admin.templatetags.base import InclusionAdminNode
+from django.db.models import Max, Min
+from django.utils import formats
+from django.utils.text import capfirst
+
+from blog.models import PostDateBucket
+
+register = template.Library()
+
+
+def bucket_date_hierarchy(cl):
+    """То же, что date_hierarchy админки, но по таблице дней публикаций.
+
+    Вместо DISTINCT по датам всех публикаций читается PostDateBucket —
+    одна строка на день.
+    """
+    field_name = cl.date_hierarchy
+    year_field = f'{field_name}__year'
+    month_field = f'{field_name}__month'
+    day_field = f'{field_name}__day'
+    year_lookup = cl.params.get(year_field)
+    month_lookup = cl.params.get(month_field)
+    day_lookup = cl.params.get(day_field)
+    buckets = PostDateBucket.objects.all()
+
+    def link(filters):
+        return cl.get_query_string(filters, [f'{field_name}__'])
+
+    if not (year_lookup or month_lookup or day_lookup):
+        date_range = buckets.aggregate(first=Min('day'), last=Max('day'))
+        first, last = date_range['first'], date_range['last']
+        if first and last and first.year == last.year:
+            year_lookup = first.year
+            if first.month == last.month:
+                month_lookup = first.month
+
+    if year_lookup and month_lookup and day_lookup:
+        day = datetime.date(
+            int(year_lookup), int(month_lookup), int(day_lookup)
+        )
+        return {
+            'show': True,
+            'back': {
+                'link': link({
+                    year_field: year_lookup, month_field: month_lookup
+                }),
+                'title': capfirst(formats.date_format(
+                    day, 'YEAR_MONTH_FORMAT'
+                )),
+            },
+            'choices': [{
+                'title': capfirst(formats.date_format(day, 'MONTH_DAY_FORMAT'))
+            }],
+        }
+    if year_lookup and month_lookup:
+        days = buckets.filter(
+            day__year=year_lookup, day__month=month_lookup
+        ).values_list('day', flat=True)
+        return {
+            'show': True,
+            'back': {'link': link({year_field: year_lookup}),
+                     'title': str(year_lookup)},
+            'choices': [{
+                'link': link({
+                    year_field: year_lookup, month_field: month_lookup,
+                    day_field: day.day,
+                }),
+                'title': capfirst(formats.date_format(day, 'MONTH_DAY_FORMAT'))
+            } for day in days],
+        }
+    if year_lookup:
+        # Не больше 366 строк: месяцы проще собрать здесь, чем DISTINCT.
+        months = sorted({
+            day.replace(day=1) for day in buckets.filter(
+                day__year=year_lookup
+            ).values_list('day', flat=True)
+        })
+        return {
+            'show': True,
+            'back': {'link': link({}), 'title': 'Все даты'},
+            'choices': [{
+                'link': link({
+                    year_field: year_lookup, month_field: month.month
+                }),
+                'title': capfirst(formats.date_format(
+                    month, 'YEAR_MONTH_FORMAT'
+                )),
+            } for month in months],
+        }
+    years = buckets.dates('day', 'year')
+    return {
+        'show': True,
+        'back': None,
+        'choices': [{
+            'link': link({year_field: str(year.year)}),
+            'title': str(year.year),
+        } for year in years],
+    }
+
+
+@register.tag(name='bucket_date_hierarchy')
+def bucket_date_hierarchy_tag(parser, token):
+    return InclusionAdminNode(
+        parser, token,
+        func=bucket_date_hierarchy,
+        template_name='date_hierarchy.html',
+        takes_context=False,
+    )
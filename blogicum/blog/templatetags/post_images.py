@@ -0,0 +1,10 @@
+from django import template
+
+from blog.images import image_sources
+
+register = template.Library()
+
+
+@register.inclusion_tag('includes/post_image.html')
+def post_image(post, slot):
+    return image_sources(post.image, post.image_meta, slot)
@@ -0,0 +1,10 @@
+from django import template
+
+from blog.search import render_highlight
+
+register = template.Library()
+
+
+@register.filter
+def search_highlight(value):
+    return render_highlight(value)
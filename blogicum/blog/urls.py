@@ -55,5 +55,12 @@ urlpatterns = [
         views.CategoryPostsListView.as_view(),
         name='category_posts'
     ),
+    path('search/', views.PostSearchView.as_view(), name='search'),
+    path(
+        'autocomplete/<slug:kind>/',
+        views.autocomplete_lookup,
+        name='autocomplete'
+    ),
+    path('metrics/', views.cache_metrics, name='cache_metrics'),
     path('', views.PostListView.as_view(), name='index'),
 ]
@@ -1,34 +1,64 @@
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db.models import Count
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max, Q
+from django.http import Http404, HttpResponse, JsonResponse
 from django.shortcuts import get_object_or_404
 from django.urls import reverse
+from django.utils.http import urlencode
 from django.views.generic import (
     CreateView, DeleteView, DetailView, ListView, UpdateView
 )
 from django.views.generic.edit import ModelFormMixin
 
 import blogicum.constans as const
-from .forms import CommentForm, PostForm
-from .mixins import ChangingCommentMixin, OnlyAuthorMixin
-from .models import Category, Comment, Post, User
+from . import autocomplete, search
+from .cache import card_cache_stats
+from .forms import CommentForm, PostForm, SearchForm
+from .managers import published_filter
+from .mixins import (
+    AnonymousPageCacheMixin, CachedObjectMixin, ChangingCommentMixin,
+    ConditionalGetMixin, CursorPaginationMixin, OnlyAuthorMixin
+)
+from .models import Category, Comment, FeedEntry, Post, User
+from .pagination import CursorPaginator, InvalidCursor
 
 
-class CategoryPostsListView(ListView):
+class CategoryPostsListView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, CachedObjectMixin,
+    CursorPaginationMixin, ListView
+):
     model = Category
     paginate_by = const.COUNT_POSTS_ON_PAGE
     template_name = 'blog/category.html'
     slug_url_kwarg = 'category_slug'
 
-    def get_object(self):
+    def get_page_cache_scopes(self):
+        return (f'category:{self.kwargs["category_slug"]}',)
+
+    def load_object(self, queryset=None):
+        # Метка изменений постов категории приходит тем же запросом.
         return get_object_or_404(
             Category.objects.filter(
                 slug=self.kwargs.get('category_slug', None),
                 is_published=True
-            )
+            ).annotate(posts_updated_at=Max('posts__updated_at'))
         )
 
+    def get_last_modified(self):
+        category = self.get_object()
+        return max(filter(None, (
+            category.updated_at, category.posts_updated_at
+        )))
+
     def get_queryset(self):
-        return self.get_object().posts(manager='published_posts').all()
+        if settings.FEED_FROM_READ_MODEL:
+            return FeedEntry.visible.filter(
+                category_id=self.get_object().pk
+            ).order_by(*self.cursor_ordering)
+        return self.get_object().posts(
+            manager='published_posts'
+        ).all().order_by(*self.cursor_ordering)
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -36,26 +66,63 @@ class CategoryPostsListView(ListView):
         return context
 
 
-class PostDetailView(DetailView):
+class PostDetailView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, CachedObjectMixin,
+    DetailView
+):
     model = Post
+    queryset = Post.objects.select_related('author', 'category', 'location')
     template_name = 'blog/detail.html'
     pk_url_kwarg = 'post_id'
 
-    def get_object(self):
-        post = super().get_object()
-        if post.author != self.request.user:
-            return get_object_or_404(
-                Post.published_posts,
-                pk=self.kwargs.get('post_id', None)
-            )
-        return post
+    def get_page_cache_scopes(self):
+        return (f'post:{self.kwargs["post_id"]}',)
+
+    def load_object(self, queryset=None):
+        # Автор видит и скрытый пост; одна выборка для всех.
+        visible = published_filter()
+        if self.request.user.is_authenticated:
+            visible |= Q(author=self.request.user)
+        return get_object_or_404(
+            self.get_queryset().filter(visible).annotate(
+                comments_updated_at=Max(
+                    'comments__updated_at',
+                    filter=Q(comments__is_published=True)
+                )
+            ),
+            pk=self.kwargs.get('post_id', None)
+        )
+
+    def get_last_modified(self):
+        post = self.get_object()
+        return max(filter(None, (post.updated_at, post.comments_updated_at)))
+
+    def get_comment_paginator(self):
+        return CursorPaginator(
+            self.get_object().comments.filter(
+                is_published=True
+            ).select_related('author'),
+            const.COUNT_COMMENTS_ON_PAGE,
+            ('created_at', 'id')
+        )
+
+    def check_pagination(self):
+        cursor = self.request.GET.get('comments_after')
+        if cursor:
+            try:
+                self.get_comment_paginator().decode(cursor)
+            except InvalidCursor:
+                raise Http404('Неверный курсор комментариев.')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentForm()
-        context['comments'] = (
-            self.get_object().comments.select_related('author')
-        )
+        try:
+            context['comments'] = self.get_comment_paginator().page(
+                after=self.request.GET.get('comments_after')
+            )
+        except InvalidCursor:
+            raise Http404('Неверный курсор комментариев.')
         return context
 
 
@@ -82,13 +149,21 @@ class PostDeleteView(OnlyAuthorMixin, ModelFormMixin, DeleteView):
         return reverse('blog:index')
 
 
-class PostListView(ListView):
+class PostListView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, CursorPaginationMixin,
+    ListView
+):
     model = Post
     template_name = 'blog/index.html'
     paginate_by = const.COUNT_POSTS_ON_PAGE
-    queryset = Post.published_posts.all().annotate(
-        comment_count=Count('comments')
-    ).order_by('-pub_date', 'title')
+
+    def get_page_cache_scopes(self):
+        return ('feed',)
+
+    def get_queryset(self):
+        if settings.FEED_FROM_READ_MODEL:
+            return FeedEntry.visible.order_by(*self.cursor_ordering)
+        return Post.published_posts.all().order_by(*self.cursor_ordering)
 
 
 class PostCreateView(LoginRequiredMixin, CreateView):
@@ -111,6 +186,10 @@ class CommentCreateView(LoginRequiredMixin, CreateView):
         self.post_model = get_object_or_404(Post, pk=kwargs['post_id'])
         return super().dispatch(request, *args, **kwargs)
 
+    @transaction.atomic
+    def post(self, request, *args, **kwargs):
+        return super().post(request, *args, **kwargs)
+
     def form_valid(self, form):
         form.instance.author = self.request.user
         form.instance.post = self.post_model
@@ -146,29 +225,98 @@ class ProfileUpdateView(LoginRequiredMixin, UpdateView):
         )
 
 
-class ProfileDetailView(ListView):
+class ProfileDetailView(
+    AnonymousPageCacheMixin, ConditionalGetMixin, CachedObjectMixin,
+    CursorPaginationMixin, ListView
+):
     model = User
     paginate_by = const.COUNT_POSTS_ON_PAGE
     template_name = 'blog/profile.html'
     slug_url_kwarg = 'username'
     slug_field = 'username'
 
-    def get_object(self):
+    def get_page_cache_scopes(self):
+        return (f'author:{self.kwargs["username"]}',)
+
+    def load_object(self, queryset=None):
+        # Правки профиля отмечаются в Post.updated_at его постов.
         return get_object_or_404(
-            User.objects.filter(username=self.kwargs.get('username', None))
+            User.objects.filter(
+                username=self.kwargs.get('username', None)
+            ).annotate(posts_updated_at=Max('posts__updated_at'))
         )
 
+    def get_last_modified(self):
+        return self.get_object().posts_updated_at
+
     def get_queryset(self):
         user = self.get_object()
-        if self.get_object() == self.request.user:
-            return user.posts(manager='objects').all().annotate(
-                comment_count=Count('comments')
-            ).order_by('-pub_date', 'title')
-        return user.posts(manager='published_posts').all().annotate(
-            comment_count=Count('comments')
-        ).order_by('-pub_date', 'title')
+        if user == self.request.user:
+            return user.posts(manager='objects').select_related(
+                'category', 'location'
+            ).order_by(*self.cursor_ordering)
+        return user.posts(manager='published_posts').all().order_by(
+            *self.cursor_ordering
+        )
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['profile'] = self.get_object()
         return context
+
+
+class PostSearchView(CursorPaginationMixin, ListView):
+    template_name = 'blog/search.html'
+    paginate_by = const.COUNT_POSTS_ON_PAGE
+    cursor_ordering = ('rank', 'id')
+
+    def get_queryset(self):
+        self.form = SearchForm(self.request.GET)
+        self.query = (
+            self.form.cleaned_data['q'] if self.form.is_valid() else ''
+        )
+        match = search.match_expression(self.query)
+        if not match or not search.is_available():
+            return Post.objects.none()
+        return search.search(
+            Post.published_posts.all(), match
+        ).order_by(*self.cursor_ordering)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['form'] = self.form
+        context['query'] = urlencode({'q': self.query})
+        return context
+
+
+def autocomplete_lookup(request, kind):
+    if kind not in autocomplete.SOURCES:
+        raise Http404
+    try:
+        page = max(int(request.GET.get('page', 1)), 1)
+    except ValueError:
+        page = 1
+    rows, more = autocomplete.lookup(
+        kind,
+        request.GET.get('q', ''),
+        page=page,
+        include_hidden=bool(
+            request.user.is_staff and request.GET.get('all')
+        ),
+    )
+    return JsonResponse({
+        'results': [{'id': pk, 'text': text} for pk, text in rows],
+        'pagination': {'more': more},
+    })
+
+
+def cache_metrics(request):
+    if request.META.get('REMOTE_ADDR') not in settings.INTERNAL_IPS:
+        raise Http404
+    return HttpResponse(
+        ''.join(
+            f'blog_post_card_cache_{name}_total {value}\n'
+            for name, value in card_cache_stats.items()
+        ),
+        content_type='text/plain; version=0.0.4'
+    )
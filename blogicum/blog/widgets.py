@@ -0,0 +1,98 @@
+from django import forms
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.urls import reverse
+from django.utils.http import urlencode
+
+
+class AutocompleteSelect(forms.Select):
+    """Список, который не выводит все варианты, а подгружает их по вводу.
+
+    В разметке остаётся только выбранное значение; остальное отдаёт
+    blog:autocomplete в формате select2.
+    """
+
+    def __init__(self, kind, include_hidden=False, attrs=None):
+        super().__init__(attrs)
+        self.kind = kind
+        self.include_hidden = include_hidden
+        # Уже загруженные объекты по pk: подпись без лишнего запроса.
+        self.known_objects = {}
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        url = reverse('blog:autocomplete', kwargs={'kind': self.kind})
+        if self.include_hidden:
+            url += '?' + urlencode({'all': 1})
+        attrs['data-autocomplete-url'] = url
+        attrs['data-placeholder'] = attrs.get('data-placeholder', '')
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        choices = self.choices
+        selected = [item for item in value if item not in ('', None)]
+        options = []
+        if not self.is_required or not selected:
+            options.append(self.create_option(
+                name, '', choices.field.empty_label or '', not selected, 0
+            ))
+        objects = [
+            self.known_objects[str(item)] for item in selected
+            if str(item) in self.known_objects
+        ]
+        missing = self.clean_values(
+            item for item in selected if str(item) not in self.known_objects
+        )
+        if missing:
+            objects += list(choices.queryset.filter(pk__in=missing))
+        for index, obj in enumerate(objects, start=1):
+            options.append(self.create_option(
+                name, choices.field.prepare_value(obj),
+                choices.field.label_from_instance(obj), True, index
+            ))
+        return [(None, options, 0)]
+
+    def clean_values(self, values):
+        """Значения, приведённые к типу pk; негодные отбрасываются.
+
+        Форму с ошибкой выводят снова с тем, что прислал пользователь,
+        а ?category=abc в запросе к БД закончился бы ошибкой 500.
+        """
+        pk = self.choices.queryset.model._meta.pk
+        cleaned = []
+        for value in values:
+            try:
+                cleaned.append(pk.to_python(value))
+            except ValidationError:
+                continue
+        return cleaned
+
+    @property
+    def media(self):
+        extra = '' if settings.DEBUG else '.min'
+        return forms.Media(
+            css={'all': (f'admin/css/vendor/select2/select2{extra}.css',)},
+            js=(
+                f'admin/js/vendor/jquery/jquery{extra}.js',
+                f'admin/js/vendor/select2/select2.full{extra}.js',
+                'admin/js/jquery.init.js',
+                'js/autocomplete.js',
+            ),
+        )
+
+
+class AutocompleteFormMixin:
+    """Передаёт виджетам связанные объекты, уже загруженные у instance."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        opts = self.instance._meta
+        for name, field in self.fields.items():
+            widget = getattr(field.widget, 'widget', field.widget)
+            if not isinstance(widget, AutocompleteSelect):
+                continue
+            model_field = opts.get_field(name)
+            if model_field.is_cached(self.instance):
+                related = getattr(self.instance, name)
+                if related is not None:
+                    widget.known_objects = {str(related.pk): related}
@@ -1,3 +1,27 @@
 MAX_LENGTH = 256
 COUNT_POSTS_ON_PAGE = 10
+COUNT_COMMENTS_ON_PAGE = 50
 COUNT_WORDS_DISPLAYED_IN_TITLE = 5
+COUNT_WORDS_IN_EXCERPT = 10
+POST_CARD_CACHE_TIMEOUT = 60 * 60
+PAGE_CACHE_TIMEOUT = 5 * 60
+VISIBILITY_RECHECK_INTERVAL = 60
+POST_IMAGE_SLOTS = {'card': 640, 'detail': 960}
+POST_IMAGE_QUALITY = 80
+POST_IMAGE_PLACEHOLDER_WIDTH = 16
+MEDIA_MAX_AGE = 60 * 60
+MEDIA_IMMUTABLE_MAX_AGE = 365 * 24 * 60 * 60
+ORPHAN_IMAGE_GRACE_HOURS = 24
+IMAGE_RELEASE_GRACE = 60 * 60
+SEARCH_MAX_TERMS = 8
+SEARCH_SNIPPET_TOKENS = 24
+SEARCH_TITLE_WEIGHT = 10.0
+AUTOCOMPLETE_PAGE_SIZE = 20
+AUTOCOMPLETE_CACHE_SIZE = 1024
+AUTOCOMPLETE_CACHE_TTL = 60
+ADMIN_COUNT_LIMIT = 10000
+ADMIN_INLINE_POSTS = 20
+MODERATION_BATCH_SIZE = 1000
+EXPORT_CHUNK_SIZE = 2000
+IMPORT_BATCH_SIZE = 5000
+BENCHMARK_REPEAT = 20
@@ -27,6 +27,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'core.middleware.ServerTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -43,7 +44,7 @@ TEMPLATES_DIR = BASE_DIR / 'templates'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'BACKEND': 'core.templates.TimedDjangoTemplates',
         'DIRS': [TEMPLATES_DIR],
         'APP_DIRS': True,
         'OPTIONS': {
@@ -66,6 +67,37 @@ DATABASES = {
     }
 }
 
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'pages': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'pages',
+    },
+}
+
+PAGE_CACHE_ALIAS = 'pages'
+
+FEED_FROM_READ_MODEL = False
+
+# Доля запросов, для которых пишутся Server-Timing и строка в лог;
+# для разбора одной страницы её можно поднять до 1.
+SERVER_TIMING_SAMPLE_RATE = 0.01
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'core.middleware': {'handlers': ['console'], 'level': 'INFO'},
+    },
+}
+
+IMAGE_VARIANT_WORKERS = 2
+
 
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -108,6 +140,13 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_URL = '/media/'
+
+# None, 'x-sendfile' (Apache, lighttpd) или 'x-accel-redirect' (nginx).
+MEDIA_SENDFILE_BACKEND = None
+
+MEDIA_ACCEL_REDIRECT_LOCATION = '/protected-media/'
+
 LOGIN_REDIRECT_URL = 'blog:index'
 
 LOGIN_URL = 'login'
@@ -1,10 +1,11 @@
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
 from django.urls import include, path, reverse_lazy
 from django.views.generic.edit import CreateView
 
+from core.views import serve_media
+
 urlpatterns = [
     path('pages/', include('pages.urls', namespace='pages')),
     path(
@@ -18,6 +19,11 @@ urlpatterns = [
     ),
     path('auth/', include('django.contrib.auth.urls')),
     path('admin/', admin.site.urls),
+    path(
+        f'{settings.MEDIA_URL.strip("/")}/<path:path>',
+        serve_media,
+        name='media'
+    ),
     path('', include('blog.urls', namespace='blog')),
 ]
 
@@ -28,5 +34,3 @@ if settings.DEBUG:
     import debug_toolbar
 
     urlpatterns += (path('__debug__/', include(debug_toolbar.urls)),)
-
-urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
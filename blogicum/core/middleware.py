@@ -0,0 +1,59 @@
+import logging
+import random
+import time
+
+from django.conf import settings
+from django.utils.encoding import escape_uri_path
+
+from .timing import measure
+
+logger = logging.getLogger(__name__)
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 1)
+
+
+class ServerTimingMiddleware:
+    """Запросы к БД, время БД, шаблонов и остального кода на запрос.
+
+    Числа уходят в заголовок Server-Timing и строкой key=value в лог.
+    Меряется доля запросов SERVER_TIMING_SAMPLE_RATE; остальные
+    проходят без обёрток. tpl — время шаблонов без запросов из них,
+    view — время обработки без БД и шаблонов.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        rate = settings.SERVER_TIMING_SAMPLE_RATE
+        if rate <= 0 or (rate < 1 and random.random() >= rate):
+            return self.get_response(request)
+        start = time.perf_counter()
+        with measure() as timings:
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+        view = max(total - timings.db_time - timings.render_time, 0)
+        response['Server-Timing'] = ', '.join((
+            f'db;dur={_ms(timings.db_time)};desc="{timings.queries} queries"',
+            f'tpl;dur={_ms(timings.render_time)}',
+            f'view;dur={_ms(view)}',
+            f'total;dur={_ms(total)}',
+        ))
+        if logger.isEnabledFor(logging.INFO):
+            fields = {
+                'method': request.method,
+                'path': escape_uri_path(request.path),
+                'status': response.status_code,
+                'total_ms': _ms(total),
+                'view_ms': _ms(view),
+                'db_ms': _ms(timings.db_time),
+                'queries': timings.queries,
+                'template_ms': _ms(timings.render_time),
+            }
+            logger.info(
+                ' '.join(f'{name}={value}' for name, value in fields.items()),
+                extra={'timing': fields},
+            )
+        return response
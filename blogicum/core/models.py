@@ -1,4 +1,23 @@
 from django.db import models
+from django.utils import timezone
+
+
+class ModifiedAtField(models.DateTimeField):
+    """Время последнего сохранения, как auto_now, но со значением default.
+
+    Сохранения из фикстур (raw) pre_save не вызывают: строка без этого
+    поля получает default, а не NULL.
+    """
+
+    def __init__(self, *args, **kwargs):
+        kwargs.setdefault('default', timezone.now)
+        kwargs.setdefault('editable', False)
+        super().__init__(*args, **kwargs)
+
+    def pre_save(self, model_instance, add):
+        value = timezone.now()
+        setattr(model_instance, self.attname, value)
+        return value
 
 
 class PublishedModel(models.Model):
@@ -13,6 +32,7 @@ class PublishedModel(models.Model):
         blank=False,
         verbose_name='Добавлено'
     )
+    updated_at = ModifiedAtField(verbose_name='Изменено')
 
     class Meta:
         abstract = True
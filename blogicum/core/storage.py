@@ -0,0 +1,93 @@
+import hashlib
+import os
+import posixpath
+import tempfile
+import time
+from contextlib import contextmanager
+
+from django.core.files import locks
+from django.core.files.move import file_move_safe
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит файлы под хешем содержимого: ``<каталог>/ab/cd/abcd….jpg``.
+
+    Одинаковые загрузки превращаются в один файл, поэтому удалять его
+    можно только когда на него не ссылается ни одна запись.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # Имя всё равно определяется содержимым в _save.
+        return name
+
+    def content_name(self, name, digest):
+        directory = posixpath.dirname(name)
+        extension = posixpath.splitext(name)[1].lower()
+        return posixpath.join(
+            directory, digest[:2], digest[2:4], digest + extension
+        )
+
+    @property
+    def lock_path(self):
+        # Файл блокировки не кладётся в MEDIA_ROOT, чтобы не смешиваться
+        # с загрузками; общий для всех процессов с этим же каталогом.
+        key = hashlib.sha256(os.fsencode(self.location)).hexdigest()[:16]
+        return os.path.join(tempfile.gettempdir(), f'content-{key}.lock')
+
+    @contextmanager
+    def locked(self):
+        """Межпроцессная блокировка повторного использования и удаления.
+
+        Без неё файл, который только что отдали новой загрузке, мог бы
+        удалить освобождающий его процесс.
+        """
+        with open(self.lock_path, 'ab') as lock:
+            locks.lock(lock, locks.LOCK_EX)
+            try:
+                yield
+            finally:
+                locks.unlock(lock)
+
+    def touched_within(self, name, seconds):
+        """Сохраняли ли файл (или отдавали повторно) за последние seconds."""
+        try:
+            return time.time() - os.stat(self.path(name)).st_mtime < seconds
+        except FileNotFoundError:
+            return False
+
+    def _save(self, name, content):
+        directory = self.path(posixpath.dirname(name))
+        os.makedirs(directory, exist_ok=True)
+        digest = hashlib.sha256()
+        descriptor, temporary = tempfile.mkstemp(
+            dir=directory, suffix='.part'
+        )
+        try:
+            with os.fdopen(descriptor, 'wb') as target:
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    target.write(chunk)
+            name = self.content_name(name, digest.hexdigest())
+            path = self.path(name)
+            with self.locked():
+                if os.path.exists(path):
+                    os.remove(temporary)
+                    # Свежая дата защищает файл от освобождения и от
+                    # сборщика сирот, пока новая запись не сохранена.
+                    os.utime(path)
+                    return name
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            if self.file_permissions_mode is not None:
+                os.chmod(temporary, self.file_permissions_mode)
+            file_move_safe(temporary, path, allow_overwrite=True)
+        except BaseException:
+            if os.path.exists(temporary):
+                os.remove(temporary)
+            raise
+        return name
+
+
+content_storage = ContentAddressedStorage()
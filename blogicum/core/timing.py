@@ -0,0 +1,90 @@
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.db import connections
+
+_current = ContextVar('request_timings', default=None)
+
+
+class Timings:
+    """Запросы к БД и время, набранные за один замер; время в секундах.
+
+    template_time — всё время отрисовки, template_db_time — его часть,
+    ушедшая на запросы из шаблонов (они входят и в db_time).
+    """
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_db_time = 0.0
+        self._rendering = False
+
+    @property
+    def render_time(self):
+        """Время шаблонов без запросов к БД, сделанных при отрисовке."""
+        return max(self.template_time - self.template_db_time, 0)
+
+    def add(self, other):
+        self.queries += other.queries
+        self.db_time += other.db_time
+        self.template_time += other.template_time
+        self.template_db_time += other.template_db_time
+
+    @contextmanager
+    def rendering(self):
+        # Вложенные шаблоны уже входят во время внешнего.
+        if self._rendering:
+            yield
+            return
+        self._rendering = True
+        start = time.perf_counter()
+        db_time = self.db_time
+        try:
+            yield
+        finally:
+            self.template_time += time.perf_counter() - start
+            self.template_db_time += self.db_time - db_time
+            self._rendering = False
+
+
+def current():
+    return _current.get()
+
+
+def _record_query(execute, sql, params, many, context):
+    # Обёртка для connection.execute_wrapper: пишет в текущий замер.
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings = _current.get()
+        if timings is not None:
+            timings.db_time += time.perf_counter() - start
+            timings.queries += 1
+
+
+@contextmanager
+def measure():
+    """Считает запросы, время БД и шаблонов внутри блока.
+
+    Время шаблонов набирается, только если подключён бэкенд
+    core.templates.TimedDjangoTemplates. Вложенный замер по выходе
+    добавляет свои числа во внешний.
+    """
+    outer = _current.get()
+    timings = Timings()
+    token = _current.set(timings)
+    try:
+        with ExitStack() as stack:
+            if outer is None:
+                for alias in connections:
+                    stack.enter_context(
+                        connections[alias].execute_wrapper(_record_query)
+                    )
+            yield timings
+    finally:
+        _current.reset(token)
+        if outer is not None:
+            outer.add(timings)
@@ -0,0 +1,142 @@
+import mimetypes
+import os
+import re
+from http import HTTPStatus
+
+from django.conf import settings
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe
+from django.views.decorators.http import require_safe
+
+import blogicum.constans as const
+
+# Имена из ContentAddressedStorage и копии фото: содержимое по такому
+# имени никогда не меняется.
+CONTENT_HASHED_NAME = re.compile(r'(^|/)[0-9a-f]{64}(_\d+w)?\.\w+$')
+RANGE_HEADER = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class RangeFile:
+    """Отдаёт не больше length байт файла, начиная с текущей позиции."""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def _parse_range(header, size):
+    match = RANGE_HEADER.match(header)
+    if not match or match.groups() == ('', ''):
+        return None
+    start, end = match.groups()
+    if not start:
+        start, end = max(size - int(end), 0), size - 1
+    else:
+        start = int(start)
+        end = min(int(end), size - 1) if end else size - 1
+    if start > end:
+        raise ValueError(header)
+    return start, end
+
+
+def _cache_control(path):
+    if CONTENT_HASHED_NAME.search(path):
+        return f'public, max-age={const.MEDIA_IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={const.MEDIA_MAX_AGE}'
+
+
+def _offload(path, full_path, content_type):
+    backend = settings.MEDIA_SENDFILE_BACKEND
+    if backend == 'x-accel-redirect':
+        header = 'X-Accel-Redirect'
+        value = settings.MEDIA_ACCEL_REDIRECT_LOCATION + path
+    elif backend == 'x-sendfile':
+        header, value = 'X-Sendfile', full_path
+    else:
+        return None
+    # Range веб-сервер обработает сам.
+    response = HttpResponse(content_type=content_type)
+    response[header] = value
+    return response
+
+
+def _file_response(
+        request, full_path, content_type, size, etag, last_modified
+):
+    file = open(full_path, 'rb')
+    byte_range = None
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if 'HTTP_RANGE' in request.META and (
+        not if_range or if_range == etag
+        or parse_http_date_safe(if_range) == last_modified
+    ):
+        try:
+            byte_range = _parse_range(request.META['HTTP_RANGE'], size)
+        except ValueError:
+            file.close()
+            response = HttpResponse(
+                status=HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+            )
+            response['Content-Range'] = f'bytes */{size}'
+            return response
+    if byte_range is None:
+        response = FileResponse(file, content_type=content_type)
+    else:
+        start, end = byte_range
+        file.seek(start)
+        length = end - start + 1
+        # До конца файла отдаём сам файл, чтобы сохранить sendfile.
+        response = FileResponse(
+            file if end == size - 1 else RangeFile(file, length),
+            content_type=content_type,
+            status=HTTPStatus.PARTIAL_CONTENT,
+        )
+        response['Content-Length'] = length
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+@require_safe
+def serve_media(request, path):
+    """Раздача загруженных файлов в боевом режиме.
+
+    При MEDIA_SENDFILE_BACKEND файл отдаёт веб-сервер, иначе —
+    FileResponse, которому WSGI-сервер может отдать файл через sendfile.
+    """
+    try:
+        full_path = safe_join(settings.MEDIA_ROOT, path)
+        stat = os.stat(full_path)
+    except (OSError, ValueError, SuspiciousFileOperation):
+        raise Http404(path)
+    if not os.path.isfile(full_path):
+        raise Http404(path)
+    etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+    response = get_conditional_response(
+        request, etag=etag, last_modified=int(stat.st_mtime)
+    )
+    if response is None:
+        content_type = (
+            mimetypes.guess_type(full_path)[0] or 'application/octet-stream'
+        )
+        response = _offload(path, full_path, content_type) or _file_response(
+            request, full_path, content_type, stat.st_size, etag,
+            int(stat.st_mtime)
+        )
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(stat.st_mtime)
+    response['Cache-Control'] = _cache_control(path)
+    return response
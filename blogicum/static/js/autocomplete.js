@@ -0,0 +1,25 @@
+'use strict';
+{
+  const $ = django.jQuery;
+
+  function init(root) {
+    $(root).find('select[data-autocomplete-url]').not('[name*=__prefix__]').each(function () {
+      const $select = $(this);
+      $select.select2({
+        allowClear: !$select.prop('required'),
+        placeholder: $select.data('placeholder'),
+        width: '100%',
+        ajax: {
+          url: $select.data('autocomplete-url'),
+          dataType: 'json',
+          delay: 250,
+          cache: true,
+          data: (params) => ({q: params.term || '', page: params.page || 1}),
+        },
+      });
+    });
+  }
+
+  $(() => init(document));
+  $(document).on('formset:added', (event, $row) => init($row));
+}
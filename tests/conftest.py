@@ -1,6 +1,7 @@
 import os
 import re
 import time
+from datetime import timedelta
 from http import HTTPStatus
 from inspect import getsource
 from pathlib import Path
@@ -18,12 +19,14 @@ from typing import (
 
 import pytest
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
 from django.test import override_settings
 from django.test.client import Client
+from django.utils import timezone
 from mixer.backend.django import mixer as _mixer
 
 N_PER_FIXTURE = 3
@@ -41,6 +44,17 @@ def enable_debug_false():
         yield
 
 
+@pytest.fixture(scope='session')
+def django_db_modify_db_settings(
+        django_db_modify_db_settings_parallel_suffix, tmp_path_factory
+):
+    # Пул нарезки копий фото работает в других процессах: тестовая БД
+    # в памяти им не видна.
+    settings.DATABASES['default']['TEST']['NAME'] = str(
+        tmp_path_factory.mktemp('db') / 'test.sqlite3'
+    )
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -133,6 +147,36 @@ def another_user_client(another_user):
     return client
 
 
+@pytest.fixture
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.IMAGE_VARIANT_WORKERS = 0
+    return tmp_path
+
+
+@pytest.fixture
+def disable_page_cache(monkeypatch):
+    monkeypatch.setattr(
+        'blog.mixins.AnonymousPageCacheMixin.page_cache_timeout', 0
+    )
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    # Две с лишним страницы; по три поста на одно время публикации.
+    now = timezone.now()
+    pub_dates = (
+        now - timedelta(hours=n // 3) for n in range(N_PER_PAGE * 2 + 5)
+    )
+    return mixer.cycle(N_PER_PAGE * 2 + 5).blend(
+        'blog.Post',
+        author=user,
+        is_published=True,
+        category=published_category,
+        pub_date=pub_dates,
+    )
+
+
 def get_post_list_context_key(
         user_client, page_url, page_load_err_msg, key_missing_msg
 ):
@@ -0,0 +1,169 @@
+from datetime import date, timedelta
+
+import pytest
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.admin import PostAdmin
+from blog.counters import rebuild_date_buckets
+from blog.models import Post, PostDateBucket
+from blog.pagination import EstimatedCountPaginator
+
+
+def _blend_posts(mixer, n):
+    now = timezone.now()
+    for i in range(n):
+        mixer.blend(
+            'blog.Post',
+            author=mixer.blend('auth.User'),
+            category=mixer.blend('blog.Category'),
+            location=mixer.blend('blog.Location'),
+            pub_date=now - timedelta(days=40 * i),
+        )
+
+
+def _changelist_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return [query['sql'] for query in context.captured_queries]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url, model', (
+    ('/admin/blog/post/', 'blog.Post'),
+    ('/admin/blog/comment/', 'blog.Comment'),
+))
+def test_changelist_query_count_does_not_grow(admin_client, mixer, url, model):
+    _blend_posts(mixer, 3)
+    if model == 'blog.Comment':
+        mixer.cycle(3).blend(model, author=mixer.blend('auth.User'))
+    few = _changelist_queries(admin_client, url)
+    _blend_posts(mixer, 12)
+    if model == 'blog.Comment':
+        mixer.cycle(12).blend(
+            model, author=mixer.SELECT, post=mixer.SELECT
+        )
+    many = _changelist_queries(admin_client, url)
+    assert len(many) == len(few), (
+        'Убедитесь, что число запросов к списку в админке не зависит '
+        'от числа строк на странице.'
+    )
+    assert not [
+        sql for sql in many
+        if 'DISTINCT' in sql.upper() and 'FROM "blog_post"' in sql
+    ], (
+        'Убедитесь, что иерархия дат строится без DISTINCT по публикациям.'
+    )
+
+
+@pytest.mark.django_db
+def test_post_changelist_filters_do_not_list_all_values(
+        admin_client, mixer
+):
+    _blend_posts(mixer, 5)
+    category = Post.objects.first().category
+    response = admin_client.get(
+        '/admin/blog/post/', {'category_title': category.title[:3]}
+    )
+    content = response.content.decode('utf-8')
+    assert set(response.context['cl'].result_list) == set(
+        Post.objects.filter(category__title__startswith=category.title[:3])
+    )
+    others = Post.objects.exclude(category=category).select_related(
+        'category'
+    )
+    assert not any(
+        f'>{post.category.title}</a></li>' in content for post in others
+    )
+
+
+@pytest.mark.django_db
+def test_date_buckets_follow_posts(mixer, user, published_category):
+    now = timezone.now()
+    posts = mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category, pub_date=now
+    )
+    posts[0].pub_date = now - timedelta(days=3)
+    posts[0].save()
+    posts[1].delete()
+    counts = dict(PostDateBucket.objects.values_list('day', 'post_count'))
+    assert counts == {
+        timezone.localdate(now): 1,
+        timezone.localdate(now - timedelta(days=3)): 1,
+    }
+    rebuild_date_buckets()
+    assert dict(
+        PostDateBucket.objects.values_list('day', 'post_count')
+    ) == counts
+
+
+@pytest.mark.django_db
+def test_date_buckets_accept_unparsed_pub_date(user, published_category):
+    post = Post.objects.create(
+        title='Заголовок', text='Текст', author=user,
+        category=published_category, pub_date='2020-01-01T00:00Z',
+    )
+    Post.objects.create(
+        title='Заголовок', text='Текст', author=user,
+        category=published_category, pub_date='2020-01-01 12:00',
+    )
+    day = date(2020, 1, 1)
+    assert PostDateBucket.objects.get(day=day).post_count == 2, (
+        'Убедитесь, что дата публикации, переданная строкой, '
+        'учитывается в счётчиках по дням.'
+    )
+    post.delete()
+    assert PostDateBucket.objects.get(day=day).post_count == 1
+
+
+@pytest.mark.django_db
+def test_estimated_paginator_caps_filtered_counts(
+        mixer, user, published_category, monkeypatch
+):
+    mixer.cycle(7).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True
+    )
+    monkeypatch.setattr(EstimatedCountPaginator, 'limit', 5)
+    paginator = EstimatedCountPaginator(
+        Post.objects.filter(is_published=True), 2
+    )
+    assert paginator.count == 5
+    unfiltered = EstimatedCountPaginator(Post.objects.all(), 2)
+    assert unfiltered.count >= 7
+
+
+@pytest.mark.django_db
+def test_estimated_paginator_walks_past_limit(
+        admin_client, mixer, user, published_category, monkeypatch
+):
+    mixer.cycle(11).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True
+    )
+    monkeypatch.setattr(EstimatedCountPaginator, 'limit', 5)
+    paginator = EstimatedCountPaginator(
+        Post.objects.filter(is_published=True).order_by('pk'), 2
+    )
+    assert paginator.count == 5
+    assert len(paginator.page(3)) == 2
+    assert paginator.num_pages == 4, (
+        'Убедитесь, что за пределом лимита видна следующая страница.'
+    )
+    assert len(paginator.page(6)) == 1
+    assert paginator.count == 11
+    with pytest.raises(EmptyPage):
+        paginator.page(7)
+
+    monkeypatch.setattr(PostAdmin, 'list_per_page', 2)
+    response = admin_client.get(
+        '/admin/blog/post/', {'is_published__exact': 1, 'p': 6}
+    )
+    assert response.status_code == 200, (
+        'Убедитесь, что в отфильтрованном списке админки открываются '
+        'страницы за пределом лимита подсчёта.'
+    )
+    assert len(response.context['cl'].result_list) == 1
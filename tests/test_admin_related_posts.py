@@ -0,0 +1,97 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+import blogicum.constans as const
+from blog.models import FeedEntry, Post
+
+
+def _change_view_queries(admin_client, url):
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.get(url)
+    assert response.status_code == 200
+    return response, [query['sql'] for query in context.captured_queries]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('model', ('category', 'location'))
+def test_change_view_caps_inline_posts(admin_client, mixer, model):
+    related = mixer.blend(f'blog.{model.capitalize()}')
+    url = f'/admin/blog/{model}/{related.pk}/change/'
+    mixer.cycle(2).blend(
+        'blog.Post', author=mixer.blend('auth.User'), **{model: related}
+    )
+    # Первый запрос заполняет кеш ContentType.
+    _change_view_queries(admin_client, url)
+    _, few = _change_view_queries(admin_client, url)
+    mixer.cycle(const.ADMIN_INLINE_POSTS + 5).blend(
+        'blog.Post', author=mixer.blend('auth.User'), **{model: related}
+    )
+    response, many = _change_view_queries(admin_client, url)
+    assert len(many) == len(few), (
+        'Убедитесь, что число запросов к странице категории и '
+        'местоположения не зависит от числа её публикаций.'
+    )
+    formset = response.context['inline_admin_formsets'][0].formset
+    assert len(formset.forms) == const.ADMIN_INLINE_POSTS, (
+        'Убедитесь, что на странице категории показано не больше '
+        '`ADMIN_INLINE_POSTS` публикаций.'
+    )
+    assert f'{model}__id__exact={related.pk}' in response.content.decode(
+        'utf-8'
+    ), 'Убедитесь, что со страницы ведёт ссылка на список всех публикаций.'
+
+
+@pytest.mark.django_db
+def test_related_post_changelist_link_filters_posts(admin_client, mixer):
+    category, other = mixer.cycle(2).blend('blog.Category')
+    mixer.cycle(3).blend('blog.Post', category=category)
+    mixer.cycle(2).blend('blog.Post', category=other)
+    response = admin_client.get(
+        '/admin/blog/post/', {'category__id__exact': category.pk}
+    )
+    assert response.status_code == 200
+    assert set(response.context['cl'].result_list) == set(
+        Post.objects.filter(category=category)
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('action, published', (
+    ('hide_posts', False), ('publish_posts', True),
+))
+def test_related_posts_action_is_single_update(
+        admin_client, mixer, action, published
+):
+    category = mixer.blend('blog.Category')
+    mixer.cycle(5).blend(
+        'blog.Post', category=category, is_published=not published
+    )
+    untouched = mixer.blend(
+        'blog.Post', category=mixer.blend('blog.Category'),
+        is_published=not published
+    )
+    with CaptureQueriesContext(connection) as context:
+        response = admin_client.post('/admin/blog/category/', {
+            'action': action, '_selected_action': [category.pk],
+        })
+    assert response.status_code == 302
+    updates = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('UPDATE "blog_post"')
+    ]
+    assert len(updates) == 1, (
+        'Убедитесь, что массовое действие меняет посты одним UPDATE.'
+    )
+    assert set(
+        Post.objects.filter(category=category).values_list(
+            'is_published', flat=True
+        )
+    ) == {published}
+    assert set(
+        FeedEntry.objects.filter(category_id=category.pk).values_list(
+            'is_published', flat=True
+        )
+    ) == {published}
+    untouched.refresh_from_db()
+    assert untouched.is_published is not published
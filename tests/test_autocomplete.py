@@ -0,0 +1,120 @@
+from http import HTTPStatus
+
+import pytest
+
+from blog import autocomplete
+
+
+@pytest.fixture
+def locations(mixer):
+    autocomplete.invalidate()
+    return {
+        'moscow': mixer.blend('blog.Location', name='Москва', is_published=True),
+        'mozhaisk': mixer.blend(
+            'blog.Location', name='Можайск', is_published=True
+        ),
+        'hidden': mixer.blend(
+            'blog.Location', name='Мосальск', is_published=False
+        ),
+        'other': mixer.blend('blog.Location', name='Тверь', is_published=True),
+    }
+
+
+@pytest.mark.django_db
+def test_autocomplete_returns_published_prefix_matches(client, locations):
+    response = client.get('/autocomplete/locations/', {'q': 'мо'})
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {
+        'results': [
+            {'id': locations['mozhaisk'].id, 'text': 'Можайск'},
+            {'id': locations['moscow'].id, 'text': 'Москва'},
+        ],
+        'pagination': {'more': False},
+    }, (
+        'Убедитесь, что подсказки ищут по началу названия без учёта '
+        'регистра первой буквы и не показывают снятые с публикации места.'
+    )
+    assert client.get('/autocomplete/unknown/').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+
+
+@pytest.mark.django_db
+def test_autocomplete_cache_is_invalidated(client, locations):
+    client.get('/autocomplete/locations/', {'q': 'Мос'})
+    locations['hidden'].is_published = True
+    locations['hidden'].save()
+    texts = [
+        item['text'] for item in client.get(
+            '/autocomplete/locations/', {'q': 'Мос'}
+        ).json()['results']
+    ]
+    assert texts == ['Мосальск', 'Москва']
+
+
+@pytest.mark.django_db
+def test_autocomplete_pagination_and_authors(client, mixer):
+    autocomplete.invalidate()
+    mixer.cycle(25).blend(
+        'auth.User', username=(f'writer{n:02}' for n in range(25))
+    )
+    first = client.get('/autocomplete/authors/', {'q': 'writer'}).json()
+    assert len(first['results']) == 20 and first['pagination']['more']
+    second = client.get(
+        '/autocomplete/authors/', {'q': 'writer', 'page': 2}
+    ).json()
+    assert [item['text'] for item in second['results']] == [
+        f'writer{n:02}' for n in range(20, 25)
+    ]
+    assert not second['pagination']['more']
+
+
+@pytest.mark.django_db
+def test_post_form_renders_only_selected_options(
+        user_client, post_with_published_location, locations
+):
+    post = post_with_published_location
+    content = user_client.get(
+        f'/posts/{post.id}/edit/'
+    ).content.decode('utf-8')
+    assert 'data-autocomplete-url="/autocomplete/locations/"' in content
+    assert post.location.name in content
+    assert 'Тверь' not in content, (
+        'Убедитесь, что форма публикации не выводит все местоположения '
+        'в выпадающем списке.'
+    )
+
+
+@pytest.mark.django_db
+def test_admin_uses_autocomplete_widgets(
+        admin_client, post_with_published_location
+):
+    content = admin_client.get('/admin/blog/post/').content.decode('utf-8')
+    assert 'data-autocomplete-url="/autocomplete/categories/?all=1"' in (
+        content
+    )
+    content = admin_client.get(
+        f'/admin/blog/post/{post_with_published_location.id}/change/'
+    ).content.decode('utf-8')
+    assert 'data-autocomplete-url="/autocomplete/authors/?all=1"' in content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('field, value', (
+    ('category', 'abc'),
+    ('location', '99x'),
+))
+def test_post_form_with_invalid_choice_shows_error(
+        user_client, published_category, field, value
+):
+    data = {
+        'title': 'Заголовок', 'text': 'Текст',
+        'pub_date': '2020-01-01 00:00', 'category': published_category.id,
+        field: value,
+    }
+    response = user_client.post('/posts/create/', data)
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что форма с неверным значением связанного поля '
+        'выводится снова с ошибкой, а не падает.'
+    )
+    assert field in response.context['form'].errors
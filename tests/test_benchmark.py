@@ -0,0 +1,93 @@
+import io
+import json
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog import benchmark
+from core.timing import measure
+
+DATASET = (
+    '--users', '5', '--categories', '2', '--locations', '2',
+    '--posts', '60', '--comments', '300', '--hidden-share', '0',
+    '--future-share', '0', '--anchor', '2024-01-01',
+)
+
+
+@pytest.fixture
+def dataset():
+    call_command('generate_dataset', *DATASET, stdout=io.StringIO())
+
+
+def test_every_route_is_benchmarked():
+    assert benchmark.uncovered_routes() == [], (
+        'Убедитесь, что для каждого маршрута blog и pages есть замер.'
+    )
+
+
+def test_percentile_is_nearest_rank():
+    assert benchmark.percentile([5, 1, 4, 2, 3], 0.95) == 5
+    assert benchmark.percentile([5, 1, 4, 2, 3], 0.5) == 3
+
+
+@pytest.mark.django_db
+def test_measure_counts_queries_and_templates(client, dataset):
+    with measure() as timings:
+        response = client.get('/')
+    assert response.status_code == 200
+    assert timings.queries > 0
+    assert timings.db_time > 0
+    assert timings.template_time > 0
+
+
+@pytest.mark.django_db
+def test_benchmark_writes_results(dataset, tmp_path):
+    output = tmp_path / 'bench.json'
+    call_command(
+        'benchmark', '--repeat', '2', '--output', str(output),
+        stdout=io.StringIO()
+    )
+    results = json.loads(output.read_text(encoding='utf-8'))['results']
+    for user in benchmark.USERS:
+        for page in benchmark.PAGES:
+            assert f'{user} index {page}' in results
+            assert f'{user} post_detail {page}' in results
+    index = results['anonymous index middle']
+    assert index['status'] == 200
+    assert '?after=' in index['url'], (
+        'Убедитесь, что страницы лент меряются по курсору, как в интерфейсе.'
+    )
+    for name in ('index', 'category_posts', 'profile'):
+        assert 'after=' in results[f'anonymous {name} last']['url']
+    for name in ('index', 'category_posts', 'profile', 'search'):
+        assert 'page=' in results[f'anonymous {name} offset']['url']
+        assert results[f'anonymous {name} last']['status'] == 200
+    assert index['queries'] > 0
+    assert index['template_ms'] > 0
+    assert index['p95_ms'] >= index['p50_ms'] > 0
+    assert index['bytes'] > 0
+    assert results['authenticated edit_post first']['status'] == 200
+    assert results['anonymous edit_post first']['status'] == 302
+
+
+@pytest.mark.django_db
+def test_benchmark_fails_on_regression(dataset, tmp_path):
+    baseline = tmp_path / 'baseline.json'
+    call_command(
+        'benchmark', '--repeat', '1', '--output', str(baseline),
+        stdout=io.StringIO()
+    )
+    data = json.loads(baseline.read_text(encoding='utf-8'))
+    call_command(
+        'benchmark', '--repeat', '1', '--baseline', str(baseline),
+        '--max-latency-regression', '100', '--min-latency-ms', '1000',
+        stdout=io.StringIO()
+    )
+    data['results']['anonymous index first']['queries'] -= 1
+    baseline.write_text(json.dumps(data), encoding='utf-8')
+    with pytest.raises(CommandError, match='anonymous index first'):
+        call_command(
+            'benchmark', '--repeat', '1', '--baseline', str(baseline),
+            '--max-latency-regression', '100', '--min-latency-ms', '1000',
+            stdout=io.StringIO()
+        )
@@ -0,0 +1,44 @@
+import pytest
+from django.core.management import call_command
+
+from blog.models import Post
+
+
+@pytest.mark.django_db
+def test_comment_count_follows_comment_changes(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    comments = mixer.cycle(3).blend(
+        'blog.Comment', post=post, is_published=True
+    )
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        'Убедитесь, что счётчик комментариев увеличивается при их создании.'
+    )
+
+    comments[0].is_published = False
+    comments[0].save()
+    comments[1].delete()
+    post.refresh_from_db()
+    assert post.comment_count == 1, (
+        'Убедитесь, что снятые с публикации и удалённые комментарии '
+        'не учитываются в счётчике.'
+    )
+
+
+@pytest.mark.django_db
+def test_recount_comments_repairs_counters(
+        mixer, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.cycle(2).blend('blog.Comment', post=post, is_published=True)
+    Post.objects.update(comment_count=100)
+
+    call_command('recount_comments', batch_size=1)
+
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        'Убедитесь, что команда `recount_comments` восстанавливает '
+        'счётчики комментариев.'
+    )
@@ -0,0 +1,32 @@
+import pytest
+
+import blogicum.constans as const
+
+
+@pytest.mark.django_db
+def test_comments_are_paginated(
+        user_client, mixer, post_with_published_location
+):
+    post = post_with_published_location
+    total = const.COUNT_COMMENTS_ON_PAGE + 5
+    mixer.cycle(total).blend('blog.Comment', post=post, is_published=True)
+    url = f'/posts/{post.id}/'
+
+    response = user_client.get(url)
+    first_page = response.context['comments']
+    assert len(first_page) == const.COUNT_COMMENTS_ON_PAGE, (
+        'Убедитесь, что на странице поста выводится не больше '
+        '`COUNT_COMMENTS_ON_PAGE` комментариев.'
+    )
+    content = response.content.decode('utf-8')
+    assert f'Комментарии ({total})' in content, (
+        'Убедитесь, что на странице поста выводится общее число '
+        'комментариев.'
+    )
+    assert '?comments_after=' in content
+
+    second_page = user_client.get(
+        url, {'comments_after': first_page.next_cursor}
+    ).context['comments']
+    assert len(second_page) == 5 and not second_page.has_next()
+    assert not {c.id for c in first_page} & {c.id for c in second_page}
@@ -0,0 +1,149 @@
+from http import HTTPStatus
+
+import pytest
+
+
+@pytest.fixture
+def urls(post_with_published_location):
+    post = post_with_published_location
+    return (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('disable_page_cache')
+def test_not_modified_without_rendering(
+        client, urls, django_assert_num_queries
+):
+    for url in urls:
+        response = client.get(url)
+        assert response.has_header('ETag'), (
+            f'Убедитесь, что страница `{url}` отдаёт заголовок ETag.'
+        )
+        assert response.has_header('Last-Modified')
+        with django_assert_num_queries(1):
+            not_modified = client.get(
+                url, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        assert not_modified.status_code == HTTPStatus.NOT_MODIFIED, (
+            f'Убедитесь, что страница `{url}` отвечает 304 на запрос '
+            'с совпадающим ETag.'
+        )
+        with django_assert_num_queries(1):
+            head = client.head(url)
+        assert head.status_code == HTTPStatus.OK
+        assert head['ETag'] == response['ETag']
+        assert not head.content
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('disable_page_cache')
+def test_etag_changes_with_content(
+        client, mixer, urls, post_with_published_location
+):
+    etags = {url: client.get(url)['ETag'] for url in urls}
+    mixer.blend('blog.Comment', post=post_with_published_location)
+    for url in urls:
+        response = client.get(url, HTTP_IF_NONE_MATCH=etags[url])
+        assert response.status_code == HTTPStatus.OK, (
+            f'Убедитесь, что новый комментарий меняет ETag страницы `{url}`.'
+        )
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('disable_page_cache')
+def test_hidden_post_is_not_validated(
+        client, user_client, post_with_published_location
+):
+    post = post_with_published_location
+    post.is_published = False
+    post.save()
+    url = f'/posts/{post.id}/'
+    assert client.head(url).status_code == HTTPStatus.NOT_FOUND
+    assert user_client.head(url).status_code == HTTPStatus.OK
+
+
+@pytest.mark.django_db
+def test_head_and_validators_check_the_request_first(client, urls):
+    etag = client.get('/')['ETag']
+    for url in (
+        '/category/nope/', '/profile/nobody/', '/posts/999999/',
+        '/?after=garbage', '/?page=999', f'{urls[3]}?comments_after=x',
+    ):
+        assert client.head(url).status_code == HTTPStatus.NOT_FOUND, (
+            f'Убедитесь, что HEAD `{url}` отвечает 404, как и GET.'
+        )
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_profile_edit_changes_validator(
+        client, user, post_with_published_location
+):
+    url = f'/profile/{user.username}/'
+    response = client.get(url)
+    user.first_name = 'Новое имя'
+    user.save()
+    response = client.get(
+        url, HTTP_IF_NONE_MATCH=response['ETag'],
+        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+    )
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что правка профиля меняет метки страницы профиля.'
+    )
+    assert 'Новое имя' in response.content.decode()
+
+
+@pytest.mark.django_db
+@pytest.mark.usefixtures('disable_page_cache')
+def test_commenter_profile_edit_changes_post_validator(
+        client, mixer, another_user, post_with_published_location
+):
+    post = post_with_published_location
+    mixer.blend(
+        'blog.Comment', post=post, author=another_user, is_published=True
+    )
+    url = f'/posts/{post.id}/'
+    response = client.get(url)
+    another_user.username = 'renamed_commenter'
+    another_user.save()
+    response = client.get(
+        url, HTTP_IF_NONE_MATCH=response['ETag'],
+        HTTP_IF_MODIFIED_SINCE=response['Last-Modified'],
+    )
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что правка профиля комментатора меняет метки '
+        'страницы поста.'
+    )
+    assert 'renamed_commenter' in response.content.decode()
+
+
+@pytest.mark.django_db
+def test_category_has_own_validator(
+        client, mixer, urls, post_with_published_location
+):
+    url = urls[1]
+    etag = client.get(url)['ETag']
+    mixer.blend('blog.Post', is_published=True)
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, (
+        'Убедитесь, что пост из другой категории не меняет метку категории.'
+    )
+
+
+@pytest.mark.django_db
+def test_head_with_page_cache(client, urls):
+    for url in urls:
+        response = client.head(url)
+        assert response.status_code == HTTPStatus.OK, (
+            f'Убедитесь, что HEAD `{url}` работает при включённом кеше '
+            'страниц.'
+        )
+        assert response.has_header('ETag')
+        assert client.get(url).status_code == HTTPStatus.OK
+        assert client.head(url).status_code == HTTPStatus.OK
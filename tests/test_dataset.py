@@ -0,0 +1,94 @@
+import io
+from statistics import median
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog import search
+from blog.dataset import DatasetGenerator
+from blog.models import Category, Comment, FeedEntry, Location, Post, User
+
+ARGS = (
+    '--users', '30', '--categories', '4', '--locations', '5',
+    '--posts', '400', '--comments', '4000', '--batch-size', '150',
+    '--future-share', '0.25', '--hidden-share', '0.1',
+    '--anchor', '2024-01-01',
+)
+
+
+def _generate(*args):
+    call_command('generate_dataset', *ARGS, *args, stdout=io.StringIO())
+
+
+def _snapshot():
+    return (
+        list(User.objects.order_by('pk').values_list('username', flat=True)),
+        list(Post.objects.order_by('pk').values_list(
+            'title', 'pub_date', 'author_id', 'category_id', 'is_published'
+        )),
+        list(Comment.objects.order_by('pk').values_list(
+            'post_id', 'author_id', 'created_at', 'text'
+        )),
+    )
+
+
+@pytest.mark.django_db
+def test_dataset_is_reproducible():
+    # Удаление идёт через сигналы, поэтому набор здесь поменьше.
+    small = ('--posts', '40', '--comments', '200')
+    _generate('--seed', '7', *small)
+    first = _snapshot()
+    for model in (Comment, Post, Category, Location, User):
+        model.objects.all().delete()
+    _generate('--seed', '7', *small)
+    assert _snapshot() == first, (
+        'Убедитесь, что один и тот же seed даёт одинаковый набор данных.'
+    )
+    _generate('--seed', '8', *small)
+    assert User.objects.count() == 60
+
+
+@pytest.mark.django_db
+def test_dataset_shape():
+    _generate()
+    assert Comment.objects.count() == 4000
+    anchor = timezone.make_aware(timezone.datetime(2024, 1, 1))
+    future = Post.objects.filter(pub_date__gt=anchor).count()
+    assert 60 < future < 140, (
+        'Убедитесь, что доля отложенных постов задаётся --future-share.'
+    )
+    assert 10 < Post.objects.filter(is_published=False).count() < 80
+    counts = list(Post.objects.values_list('comment_count', flat=True))
+    assert sum(counts) == Comment.objects.filter(is_published=True).count()
+    assert max(counts) > 20 * median(counts), (
+        'Убедитесь, что комментарии распределены по постам неравномерно.'
+    )
+    assert FeedEntry.objects.count() == 400
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'blog_comment'"
+        )
+        assert 'comment_post_created_idx' in {row[0] for row in cursor}
+
+
+@pytest.mark.django_db
+def test_failed_run_restores_search_and_indexes(monkeypatch):
+    def broken(self, total):
+        raise RuntimeError('сбой')
+
+    monkeypatch.setattr(DatasetGenerator, 'comments', broken)
+    with pytest.raises(RuntimeError):
+        _generate('--posts', '40')
+    assert search.ensure_triggers() is False, (
+        'Убедитесь, что триггеры поиска возвращаются и при ошибке.'
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'blog_post'"
+        )
+        assert 'post_updated_idx' in {row[0] for row in cursor}
+    assert FeedEntry.objects.count() == 40
@@ -0,0 +1,82 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.http import StreamingHttpResponse
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Comment, Post
+
+
+def _read(response):
+    assert isinstance(response, StreamingHttpResponse), (
+        'Убедитесь, что выгрузка отдаётся потоком.'
+    )
+    return b''.join(response.streaming_content).decode('utf-8')
+
+
+@pytest.mark.django_db
+def test_admin_exports_posts_as_csv(admin_client, mixer):
+    posts = mixer.cycle(3).blend('blog.Post', title='Пост, "с" запятой')
+    response = admin_client.post('/admin/blog/post/', {
+        'action': 'export_csv',
+        '_selected_action': [post.pk for post in posts[:2]],
+    })
+    assert response.status_code == 200
+    assert 'attachment' in response['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(_read(response))))
+    assert [int(row['id']) for row in rows] == sorted(
+        post.pk for post in posts[:2]
+    )
+    assert rows[0]['title'] == 'Пост, "с" запятой'
+    assert rows[0]['author'] == posts[0].author.username
+
+
+@pytest.mark.django_db
+def test_admin_exports_comments_as_jsonl(admin_client, mixer):
+    comments = mixer.cycle(2).blend('blog.Comment')
+    response = admin_client.post('/admin/blog/comment/', {
+        'action': 'export_jsonl',
+        '_selected_action': [comment.pk for comment in comments],
+    })
+    lines = _read(response).splitlines()
+    assert [json.loads(line)['author'] for line in lines] == [
+        comment.author.username for comment in comments
+    ]
+
+
+@pytest.mark.django_db
+def test_export_query_count_does_not_grow(mixer):
+    def run():
+        out = io.StringIO()
+        with CaptureQueriesContext(connection) as context:
+            call_command(
+                'export_content', 'posts', '--chunk-size', '2', stdout=out
+            )
+        return out.getvalue(), len(context.captured_queries)
+
+    mixer.cycle(3).blend('blog.Post')
+    _, few = run()
+    mixer.cycle(10).blend('blog.Post')
+    output, many = run()
+    assert few == many, (
+        'Убедитесь, что связанные имена выгружаются в том же запросе, '
+        'а не по одному на строку.'
+    )
+    assert len(output.splitlines()) == Post.objects.count()
+
+
+@pytest.mark.django_db
+def test_export_command_writes_file(mixer, tmp_path):
+    mixer.cycle(4).blend('blog.Comment')
+    target = tmp_path / 'comments.csv'
+    call_command(
+        'export_content', 'comments', '--format', 'csv',
+        '--output', str(target), stdout=io.StringIO()
+    )
+    with open(target, encoding='utf-8', newline='') as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == Comment.objects.count()
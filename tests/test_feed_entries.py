@@ -0,0 +1,66 @@
+import re
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import FeedEntry
+
+pytestmark = pytest.mark.usefixtures('disable_page_cache')
+
+
+def _cards(client, url):
+    content = client.get(url).content.decode('utf-8')
+    return re.findall(r'<div class="card".*?</div>\s*</div>\s*</div>',
+                      content, re.S)
+
+
+@pytest.mark.django_db
+def test_feed_served_from_read_model_matches(
+        user_client, mixer, many_posts_with_published_locations,
+        published_category
+):
+    post = many_posts_with_published_locations[0]
+    mixer.cycle(2).blend('blog.Comment', post=post, is_published=True)
+    post.category.title = 'Переименованная категория'
+    post.category.save()
+    post.author.username = 'renamed'
+    post.author.save()
+
+    for url in ('/', f'/category/{published_category.slug}/'):
+        expected = _cards(user_client, url)
+        assert expected
+        with override_settings(FEED_FROM_READ_MODEL=True):
+            assert _cards(user_client, url) == expected, (
+                f'Убедитесь, что лента `{url}` из таблицы записей ленты '
+                'совпадает с лентой из публикаций.'
+            )
+
+
+@pytest.mark.django_db
+def test_feed_query_is_single_table_range_scan(
+        client, many_posts_with_published_locations
+):
+    with override_settings(FEED_FROM_READ_MODEL=True):
+        with CaptureQueriesContext(connection) as ctx:
+            client.get('/')
+    feed_sql = [
+        query['sql'] for query in ctx.captured_queries
+        if 'FROM "blog_feedentry"' in query['sql']
+    ]
+    assert len(feed_sql) == 1 and ' JOIN ' not in feed_sql[0]
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {feed_sql[0]}')
+        plan = ' | '.join(row[-1] for row in cursor.fetchall())
+    assert 'feed_entry_idx' in plan and 'TEMP B-TREE' not in plan, plan
+
+
+@pytest.mark.django_db
+def test_rebuild_feed(many_posts_with_published_locations):
+    FeedEntry.objects.all().delete()
+    call_command('rebuild_feed', batch_size=7)
+    assert FeedEntry.objects.count() == len(
+        many_posts_with_published_locations
+    )
@@ -0,0 +1,108 @@
+import os
+import time
+from io import BytesIO
+
+import pytest
+from django.core.files.images import ImageFile
+from PIL import Image
+
+import blogicum.constans as const
+from blog.models import Post
+from core.storage import content_storage
+
+
+def _image_file(name, color=(10, 20, 30)):
+    buffer = BytesIO()
+    Image.new('RGB', (50, 40), color=color).save(buffer, format='JPEG')
+    return ImageFile(buffer, name=name)
+
+
+def _age(path):
+    # Файл старше срока, в течение которого его нельзя освобождать.
+    past = time.time() - const.IMAGE_RELEASE_GRACE - 60
+    os.utime(path, (past, past))
+
+
+@pytest.mark.django_db
+def test_same_upload_is_stored_once(
+        media_root, mixer, user, published_category,
+        django_capture_on_commit_callbacks
+):
+    first, second = (
+        mixer.blend(
+            'blog.Post', author=user, category=published_category,
+            image=_image_file(name),
+        )
+        for name in ('holiday.jpg', 'HOLIDAY-copy.JPG')
+    )
+    assert first.image.name == second.image.name, (
+        'Убедитесь, что одинаковые загрузки хранятся одним файлом.'
+    )
+    directory, shard1, shard2, filename = first.image.name.split('/')
+    assert directory == 'posts_images'
+    assert filename.startswith(shard1 + shard2)
+    assert filename.endswith('.jpg')
+    path = media_root / first.image.name
+    _age(path)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        first.delete()
+    assert path.exists(), (
+        'Убедитесь, что файл, на который ещё ссылаются, не удаляется.'
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        user.delete()
+    assert not Post.objects.exists()
+    assert not path.exists(), (
+        'Убедитесь, что файл без ссылок удаляется вместе с последней '
+        'публикацией, в том числе при каскадном удалении автора.'
+    )
+
+
+@pytest.mark.django_db
+def test_replaced_image_is_released(
+        media_root, mixer, user, published_category,
+        django_capture_on_commit_callbacks
+):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=_image_file('old.jpg'),
+    )
+    old_path = media_root / post.image.name
+    _age(old_path)
+    with django_capture_on_commit_callbacks(execute=True):
+        post.image = _image_file('new.jpg', color=(200, 100, 0))
+        post.save()
+    assert (media_root / post.image.name).exists()
+    assert not old_path.exists()
+
+
+@pytest.mark.django_db
+def test_reused_image_survives_release_of_old_post(
+        media_root, mixer, user, published_category,
+        django_capture_on_commit_callbacks
+):
+    old = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=_image_file('photo.jpg'),
+    )
+    path = media_root / old.image.name
+    _age(path)
+    # Старую запись удаляют, пока такой же файл загружают заново:
+    # файл уже отдан новой загрузке, а ссылки на него ещё нет.
+    with django_capture_on_commit_callbacks(execute=True):
+        reused = content_storage.save(
+            Post._meta.get_field('image').upload_to + '/again.jpg',
+            _image_file('again.jpg'),
+        )
+        old.delete()
+    assert reused == old.image.name
+    assert path.exists(), (
+        'Убедитесь, что файл, только что отданный повторной загрузке, '
+        'не удаляется при освобождении старой публикации.'
+    )
+    new = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=reused,
+    )
+    assert (media_root / new.image.name).exists()
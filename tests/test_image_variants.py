@@ -0,0 +1,136 @@
+import time
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog import images
+from blog.images import variant_name
+from blog.models import Post
+
+
+def _image_file(width, height, name='wide.jpg'):
+    buffer = BytesIO()
+    Image.new('RGB', (width, height), color=(73, 109, 137)).save(
+        buffer, format='JPEG'
+    )
+    return ImageFile(buffer, name=name)
+
+
+@pytest.mark.django_db
+def test_variants_are_generated_after_commit(
+        media_root, mixer, user, published_category,
+        django_capture_on_commit_callbacks, client
+):
+    with django_capture_on_commit_callbacks(execute=True):
+        post = mixer.blend(
+            'blog.Post', author=user, is_published=True,
+            category=published_category, image=_image_file(1500, 1000),
+        )
+    post.refresh_from_db()
+    assert post.image_meta['variants'] == [640, 960, 1280], (
+        'Убедитесь, что копии нарезаются только уже исходника.'
+    )
+    for width in post.image_meta['variants']:
+        for extension in ('webp', 'jpg'):
+            assert (
+                media_root / variant_name(post.image.name, width, extension)
+            ).exists()
+
+    content = client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert 'type="image/webp"' in content
+    assert f'{variant_name(post.image.name, 1280, "jpg")} 1280w' in content, (
+        'Убедитесь, что на странице публикации есть srcset с копиями фото.'
+    )
+
+
+@pytest.mark.django_db
+def test_original_is_shown_until_variants_are_ready(
+        media_root, mixer, user, published_category, client
+):
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category=published_category, image=_image_file(1500, 1000),
+    )
+    content = client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert f'src="{post.image.url}"' in content
+    assert 'srcset=' not in content
+
+
+@pytest.mark.django_db
+def test_backfill_command(media_root, mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category=published_category, image=_image_file(700, 300),
+    )
+    call_command('generate_image_variants', workers=0, stdout=StringIO())
+    post.refresh_from_db()
+    assert post.image_meta['variants'] == [640]
+
+
+@pytest.mark.django_db
+def test_image_meta_is_stored_on_upload(
+        media_root, mixer, user, published_category, client
+):
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category=published_category, image=_image_file(1500, 1000),
+    )
+    post.refresh_from_db()
+    meta = post.image_meta
+    assert (meta['width'], meta['height']) == (1500, 1000)
+    assert meta['size'] == post.image.size
+    assert meta['placeholder'].startswith('data:image/jpeg;base64,'), (
+        'Убедитесь, что при загрузке фото сохраняются его размеры, вес '
+        'и превью-заглушка.'
+    )
+    content = client.get(f'/posts/{post.id}/').content.decode('utf-8')
+    assert 'width="1500" height="1000"' in content
+    assert 'loading="lazy"' in content
+
+
+@pytest.mark.django_db
+def test_image_meta_backfill_command(
+        media_root, mixer, user, published_category
+):
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category=published_category, image=_image_file(300, 200),
+    )
+    Post.objects.filter(pk=post.pk).update(image_meta={})
+    call_command('backfill_image_meta', workers=0, stdout=StringIO())
+    post.refresh_from_db()
+    assert (post.image_meta['width'], post.image_meta['height']) == (300, 200)
+
+
+@pytest.fixture
+def variant_pool(media_root, settings):
+    settings.IMAGE_VARIANT_WORKERS = 1
+    images._executor = None
+    yield
+    if images._executor is not None:
+        images._executor.shutdown(wait=True)
+        images._executor = None
+
+
+@pytest.mark.django_db(transaction=True)
+def test_variants_are_stored_by_worker_process(
+        variant_pool, media_root, mixer, user, published_category
+):
+    post = mixer.blend(
+        'blog.Post', author=user, is_published=True,
+        category=published_category, image=_image_file(1500, 1000),
+    )
+    deadline = time.monotonic() + 60
+    while 'variants' not in post.image_meta:
+        assert time.monotonic() < deadline, (
+            'Убедитесь, что процесс пула сам записывает ширины копий.'
+        )
+        time.sleep(0.2)
+        post.refresh_from_db()
+    assert post.image_meta['variants'] == [640, 960, 1280]
+    assert (
+        media_root / variant_name(post.image.name, 1280, 'webp')
+    ).exists()
@@ -0,0 +1,189 @@
+import io
+import json
+
+import pytest
+from django.conf import settings
+from django.core.management import CommandError, call_command
+
+from blog import importer, search
+from blog.models import Comment, FeedEntry, Post, PostDateBucket
+
+
+def _fixture():
+    # Пост идёт раньше автора, как в blogicum/db.json.
+    return [
+        {'model': 'blog.category', 'pk': 7, 'fields': {
+            'title': 'Путешествия', 'slug': 'travel', 'description': '',
+            'is_published': True,
+            'created_at': '2022-12-18T23:05:41.354Z',
+        }},
+        {'model': 'blog.post', 'pk': 11, 'fields': {
+            'title': 'Обед', 'text': 'Обед у Морозовой',
+            'pub_date': '1897-02-13T00:00:00Z', 'is_published': True,
+            'created_at': '2022-12-18T23:06:18.993Z',
+            'author': 5, 'category': 7, 'location': None,
+        }},
+        {'model': 'admin.logentry', 'pk': 1, 'fields': {}},
+        {'model': 'auth.user', 'pk': 5, 'fields': {
+            'username': 'chekhov', 'password': '', 'is_active': True,
+            'date_joined': '2022-12-18T23:00:00Z', 'groups': [],
+        }},
+        {'model': 'blog.comment', 'pk': 3, 'fields': {
+            'text': 'Вкусно', 'post': 11, 'author': 5,
+            'is_published': True, 'created_at': '2022-12-19T10:00:00Z',
+        }},
+    ]
+
+
+@pytest.mark.django_db
+def test_import_fixture_in_batches(tmp_path):
+    source = tmp_path / 'db.json'
+    source.write_text(json.dumps(_fixture()), encoding='utf-8')
+    call_command(
+        'import_content', str(source), '--batch-size', '3',
+        stdout=io.StringIO()
+    )
+    post = Post.objects.get(pk=11)
+    assert post.author.username == 'chekhov'
+    assert post.created_at.isoformat().startswith('2022-12-18T23:06:18'), (
+        'Убедитесь, что загрузка не затирает даты из источника.'
+    )
+    assert post.comment_count == 1, (
+        'Убедитесь, что счётчики комментариев пересчитываются после '
+        'загрузки.'
+    )
+    assert FeedEntry.objects.get(pk=11).category_slug == 'travel'
+    assert PostDateBucket.objects.get().post_count == 1
+    assert list(Post.objects.filter(
+        id__in=search.matching_ids(search.match_expression('морозов'))
+    )) == [post]
+
+
+@pytest.mark.django_db
+def test_import_resumes_from_checkpoint(tmp_path):
+    source = tmp_path / 'db.jsonl'
+    source.write_text(
+        '\n'.join(json.dumps(record) for record in _fixture()),
+        encoding='utf-8'
+    )
+    checkpoint = tmp_path / 'checkpoint.json'
+    call_command(
+        'import_content', str(source), '--batch-size', '3',
+        '--checkpoint', str(checkpoint), stdout=io.StringIO()
+    )
+    assert not checkpoint.exists()
+    Comment.objects.all().delete()
+    # Первые четыре записи уже загружены: повтор начнётся с комментария.
+    checkpoint.write_text(json.dumps({'records': 4}), encoding='utf-8')
+    Post.objects.filter(pk=11).update(title='Изменено')
+    call_command(
+        'import_content', str(source), '--checkpoint', str(checkpoint),
+        stdout=io.StringIO()
+    )
+    assert Post.objects.get(pk=11).title == 'Изменено'
+    assert Comment.objects.filter(pk=3).exists()
+
+
+@pytest.mark.django_db
+def test_broken_batch_keeps_checkpoint_and_search(tmp_path):
+    records = _fixture()
+    # Автора нет: пачка с постом и комментарием не проходит проверку.
+    broken = [record for record in records if record['pk'] != 5]
+    source = tmp_path / 'db.jsonl'
+    source.write_text(
+        '\n'.join(json.dumps(record) for record in broken),
+        encoding='utf-8'
+    )
+    checkpoint = tmp_path / 'checkpoint.json'
+    with pytest.raises(CommandError, match='auth.User'):
+        call_command(
+            'import_content', str(source), '--batch-size', '1',
+            '--checkpoint', str(checkpoint), stdout=io.StringIO()
+        )
+    assert not Post.objects.exists(), (
+        'Убедитесь, что пачка со ссылкой в никуда не остаётся в базе.'
+    )
+    assert json.loads(checkpoint.read_text())['records'] == 1
+    assert search.ensure_triggers() is False, (
+        'Убедитесь, что триггеры поиска восстанавливаются и при ошибке.'
+    )
+
+    source.write_text(
+        '\n'.join(json.dumps(record) for record in records),
+        encoding='utf-8'
+    )
+    call_command(
+        'import_content', str(source), '--batch-size', '3',
+        '--checkpoint', str(checkpoint), stdout=io.StringIO()
+    )
+    assert Post.objects.get(pk=11).comment_count == 1
+    assert not checkpoint.exists()
+
+
+@pytest.mark.django_db
+def test_import_round_trips_flat_export(mixer, tmp_path):
+    posts = mixer.cycle(3).blend(
+        'blog.Post', category=mixer.blend('blog.Category'),
+        location=mixer.blend('blog.Location')
+    )
+    source = tmp_path / 'posts.jsonl'
+    call_command(
+        'export_content', 'posts', '--output', str(source),
+        stdout=io.StringIO()
+    )
+    expected = {
+        post.pk: (post.title, post.author_id, post.category_id,
+                  post.location_id)
+        for post in posts
+    }
+    Post.objects.all().delete()
+    call_command(
+        'import_content', str(source), '--target', 'posts',
+        stdout=io.StringIO()
+    )
+    assert {
+        post.pk: (post.title, post.author_id, post.category_id,
+                  post.location_id)
+        for post in Post.objects.all()
+    } == expected
+
+
+def test_iter_records_across_read_boundaries(monkeypatch):
+    monkeypatch.setattr(importer, 'READ_SIZE', 7)
+    records = [{'n': n, 'text': 'ё' * n} for n in range(20)]
+    assert list(importer.iter_records(io.StringIO(json.dumps(records)))) == (
+        records
+    )
+    lines = '\n\n'.join(json.dumps(record) for record in records)
+    assert list(importer.iter_records(io.StringIO(lines))) == records
+
+
+@pytest.mark.django_db
+def test_loaddata_recomputes_derived_data(tmp_path):
+    records = [
+        dict(record, fields=dict(
+            record['fields'], updated_at='2022-12-20T00:00:00Z'
+        )) if record['model'] in ('blog.category', 'blog.post') else record
+        for record in _fixture() if record['model'] != 'admin.logentry'
+    ]
+    source = tmp_path / 'fixture.json'
+    source.write_text(json.dumps(records), encoding='utf-8')
+    call_command('loaddata', str(source), stdout=io.StringIO())
+    post = Post.objects.get(pk=11)
+    assert post.comment_count == 1, (
+        'Убедитесь, что после loaddata счётчики и лента пересчитываются.'
+    )
+    assert FeedEntry.objects.get(pk=11).author_username == 'chekhov'
+    assert PostDateBucket.objects.get().post_count == 1
+
+
+@pytest.mark.django_db
+def test_shipped_fixture_loads():
+    call_command(
+        'loaddata', str(settings.BASE_DIR / 'db.json'), stdout=io.StringIO()
+    )
+    assert Post.objects.exists(), (
+        'Убедитесь, что фикстура blogicum/db.json загружается.'
+    )
+    assert not Post.objects.filter(updated_at__isnull=True).exists()
+    assert FeedEntry.objects.count() == Post.objects.count()
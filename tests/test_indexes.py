@@ -0,0 +1,59 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+def _query_plan(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+        return [row[-1] for row in cursor.fetchall()]
+
+
+def _feed_queries(client, url, params=None):
+    with CaptureQueriesContext(connection) as ctx:
+        client.get(url, params or {})
+    return [
+        query['sql'] for query in ctx.captured_queries
+        if query['sql'].startswith('SELECT')
+        and ' FROM "blog_post"' in query['sql']
+        and ' ORDER BY ' in query['sql']
+    ]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('as_author', (True, False))
+def test_feed_queries_use_indexes(
+        as_author, user_client, another_user_client, published_category,
+        feed_posts, mixer
+):
+    client = user_client if as_author else another_user_client
+    post = feed_posts[0]
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    feeds = (
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{post.author.username}/',
+    )
+    checked = 0
+    for url in feeds:
+        first_page = client.get(url).context['page_obj']
+        for params in (None, {'after': first_page.next_cursor}):
+            for sql in _feed_queries(client, url, params):
+                plan = ' | '.join(_query_plan(sql))
+                assert 'USING INDEX' in plan and 'SCAN blog_post' not in plan, (
+                    f'Убедитесь, что запрос ленты `{url}` использует индекс:'
+                    f'\n{plan}'
+                )
+                assert 'TEMP B-TREE' not in plan, (
+                    f'Убедитесь, что запрос ленты `{url}` не сортирует '
+                    f'строки во временном B-дереве:\n{plan}'
+                )
+                checked += 1
+    assert checked == len(feeds) * 2
+
+    plan = ' | '.join(_query_plan(
+        str(post.comments.order_by('created_at', 'id').query)
+    ))
+    assert 'comment_post_created_idx' in plan and 'TEMP B-TREE' not in plan, (
+        f'Убедитесь, что комментарии к посту читаются по индексу:\n{plan}'
+    )
@@ -0,0 +1,71 @@
+from http import HTTPStatus
+
+import pytest
+
+HASHED_NAME = 'posts_images/ab/cd/' + 'abcd' * 16 + '.jpg'
+CONTENT = bytes(range(256)) * 4
+
+
+@pytest.fixture
+def media_file(media_root):
+    path = media_root / HASHED_NAME
+    path.parent.mkdir(parents=True)
+    path.write_bytes(CONTENT)
+    return f'/media/{HASHED_NAME}'
+
+
+def _body(response):
+    return b''.join(response.streaming_content)
+
+
+def test_media_is_served_with_cache_headers(client, media_file):
+    response = client.get(media_file)
+    assert response.status_code == HTTPStatus.OK
+    assert _body(response) == CONTENT
+    assert response['Content-Type'] == 'image/jpeg'
+    assert 'immutable' in response['Cache-Control'], (
+        'Убедитесь, что файлы с хешем в имени отдаются как неизменяемые.'
+    )
+    response = client.get(
+        media_file, HTTP_IF_NONE_MATCH=response['ETag']
+    )
+    assert response.status_code == HTTPStatus.NOT_MODIFIED
+
+
+def test_media_range_requests(client, media_file):
+    response = client.get(media_file, HTTP_RANGE='bytes=10-19')
+    assert response.status_code == HTTPStatus.PARTIAL_CONTENT
+    assert response['Content-Range'] == f'bytes 10-19/{len(CONTENT)}'
+    assert _body(response) == CONTENT[10:20]
+
+    response = client.get(media_file, HTTP_RANGE='bytes=-6')
+    assert _body(response) == CONTENT[-6:]
+
+    response = client.get(
+        media_file, HTTP_RANGE=f'bytes={len(CONTENT)}-'
+    )
+    assert response.status_code == (
+        HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    )
+
+    response = client.get(
+        media_file, HTTP_RANGE='bytes=0-0', HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == HTTPStatus.OK, (
+        'Убедитесь, что при устаревшем If-Range файл отдаётся целиком.'
+    )
+
+
+def test_media_offload_and_traversal(client, settings, media_file):
+    settings.MEDIA_SENDFILE_BACKEND = 'x-accel-redirect'
+    response = client.get(media_file)
+    assert response['X-Accel-Redirect'] == (
+        f'/protected-media/{HASHED_NAME}'
+    )
+    assert not response.content
+    assert client.get('/media/..%2Fblogicum%2Fsettings.py').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
+    assert client.get('/media/posts_images/missing.jpg').status_code == (
+        HTTPStatus.NOT_FOUND
+    )
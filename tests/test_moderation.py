@@ -0,0 +1,123 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.management.commands.moderate import parse_moment
+from blog.models import Comment, FeedEntry, Post
+from blog.moderation import set_comments_published, set_posts_published
+
+
+def _updates(context, table):
+    return [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith(f'UPDATE "{table}" SET "is_published"')
+    ]
+
+
+@pytest.mark.django_db
+def test_posts_are_moderated_in_batches(mixer):
+    posts = mixer.cycle(5).blend('blog.Post', is_published=True)
+    with CaptureQueriesContext(connection) as context:
+        updated = set_posts_published(
+            Post.objects.all(), False, batch_size=2
+        )
+    assert updated == 5
+    assert len(_updates(context, 'blog_post')) == 3, (
+        'Убедитесь, что посты снимаются с публикации пачками UPDATE.'
+    )
+    assert not Post.objects.filter(is_published=True).exists()
+    assert not FeedEntry.objects.filter(
+        pk__in=[post.pk for post in posts], is_published=True
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_comments_moderation_repairs_counts_once(mixer):
+    post, other = mixer.cycle(2).blend('blog.Post')
+    mixer.cycle(3).blend('blog.Comment', post=post, is_published=True)
+    mixer.cycle(2).blend('blog.Comment', post=other, is_published=True)
+    with CaptureQueriesContext(connection) as context:
+        updated = set_comments_published(
+            Comment.objects.all(), False, batch_size=2
+        )
+    assert updated == 5
+    assert len(_updates(context, 'blog_comment')) == 3
+    recounts = [
+        query['sql'] for query in context.captured_queries
+        if query['sql'].startswith('UPDATE "blog_post" SET "comment_count"')
+    ]
+    assert len(recounts) == 1, (
+        'Убедитесь, что счётчики комментариев пересчитываются один раз '
+        'после всех пачек, а не для каждого комментария.'
+    )
+    assert set(Post.objects.values_list('comment_count', flat=True)) == {0}
+    assert set(FeedEntry.objects.values_list('comment_count', flat=True)) == {
+        0
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('url, model', (
+    ('/admin/blog/post/', Post), ('/admin/blog/comment/', Comment),
+))
+def test_admin_moderation_actions(admin_client, mixer, url, model):
+    objects = mixer.cycle(3).blend(model, is_published=True)
+    response = admin_client.post(url, {
+        'action': 'hide_selected',
+        '_selected_action': [item.pk for item in objects[:2]],
+    })
+    assert response.status_code == 302
+    assert list(
+        model.objects.filter(is_published=True).values_list('pk', flat=True)
+    ) == [objects[2].pk]
+
+
+@pytest.mark.django_db
+def test_moderate_command_filters_by_author_and_dates(mixer):
+    now = timezone.now()
+    spammer, author = mixer.cycle(2).blend('auth.User')
+    spam = mixer.cycle(2).blend(
+        'blog.Post', author=spammer, pub_date=now - timedelta(days=1)
+    )
+    old_spam = mixer.blend(
+        'blog.Post', author=spammer, pub_date=now - timedelta(days=30)
+    )
+    kept = mixer.blend('blog.Post', author=author, pub_date=now)
+    since = (now - timedelta(days=7)).date().isoformat()
+    call_command(
+        'moderate', 'posts', '--unpublish', '--author', spammer.username,
+        '--since', since
+    )
+    assert set(
+        Post.objects.filter(is_published=False).values_list('pk', flat=True)
+    ) == {post.pk for post in spam}
+    assert Post.objects.filter(pk__in=(old_spam.pk, kept.pk)).filter(
+        is_published=True
+    ).count() == 2
+
+
+def test_moderate_dates_are_aware(settings):
+    settings.TIME_ZONE = 'Europe/Moscow'
+    moment = parse_moment('2024-01-01')
+    assert timezone.is_aware(moment), (
+        'Убедитесь, что даты из командной строки сравниваются с учётом '
+        'часового пояса.'
+    )
+    assert moment == datetime(2024, 1, 1, tzinfo=timezone.utc) - timedelta(
+        hours=3
+    )
+    assert parse_moment('2024-01-01T10:00Z') == datetime(
+        2024, 1, 1, 10, tzinfo=timezone.utc
+    )
+    with pytest.raises(CommandError):
+        parse_moment('2024-13-01')
+
+
+@pytest.mark.django_db
+def test_moderate_command_requires_filter():
+    with pytest.raises(CommandError):
+        call_command('moderate', 'comments', '--unpublish')
@@ -0,0 +1,61 @@
+import os
+import time
+from io import BytesIO, StringIO
+
+import pytest
+from django.core.files.images import ImageFile
+from django.core.management import call_command
+from PIL import Image
+
+from blog.images import variant_name
+
+DAY = 24 * 60 * 60
+
+
+def _age(path, seconds=2 * DAY):
+    stamp = time.time() - seconds
+    os.utime(path, (stamp, stamp))
+
+
+def _write(path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b'x' * 100)
+    _age(path)
+    return path
+
+
+@pytest.mark.django_db
+def test_orphans_are_quarantined_after_grace_period(
+        media_root, tmp_path_factory, mixer, user, published_category
+):
+    buffer = BytesIO()
+    Image.new('RGB', (40, 30)).save(buffer, format='JPEG')
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        image=ImageFile(buffer, name='kept.jpg'),
+    )
+    media = media_root
+    quarantine = tmp_path_factory.mktemp('quarantine')
+    kept = media / post.image.name
+    _age(kept)
+    kept_variant = _write(media / variant_name(post.image.name, 640, 'webp'))
+    orphan = _write(media / 'posts_images/ff/ee/orphan.jpg')
+    orphan_variant = _write(media / variant_name('orphan.jpg', 640, 'jpg'))
+    fresh = _write(media / 'posts_images/fresh.jpg')
+    _age(fresh, seconds=60)
+
+    out = StringIO()
+    call_command(
+        'collect_orphan_images', quarantine=str(quarantine),
+        stdout=out,
+    )
+    assert kept.exists() and kept_variant.exists(), (
+        'Убедитесь, что фото, на которые ссылаются публикации, '
+        'и их копии не удаляются.'
+    )
+    assert fresh.exists(), (
+        'Убедитесь, что файлы моложе льготного срока не удаляются.'
+    )
+    assert not orphan.exists() and not orphan_variant.exists()
+    assert (quarantine / 'posts_images/ff/ee/orphan.jpg').exists()
+    assert '(200 байт)' in out.getvalue()
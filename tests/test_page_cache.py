@@ -0,0 +1,113 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.mark.django_db
+def test_anonymous_pages_are_cached(
+        client, user_client, post_with_published_location,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    urls = (
+        '/',
+        f'/category/{post.category.slug}/',
+        f'/profile/{post.author.username}/',
+        f'/posts/{post.id}/',
+    )
+    for url in urls:
+        client.get(url)
+        with django_assert_num_queries(0):
+            response = client.get(url)
+        assert response.status_code == 200
+
+    post.title = 'Обновлённый заголовок'
+    post.save()
+    for url in urls:
+        assert 'Обновлённый заголовок' in client.get(url).content.decode(), (
+            'Убедитесь, что кеш страниц сбрасывается при изменении поста.'
+        )
+
+    user_client.get('/')
+    with django_assert_num_queries(4):
+        user_client.get('/')
+
+
+@pytest.mark.django_db
+def test_scheduled_post_appears_in_cached_feed(
+        client, mixer, user, published_category
+):
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, title='Уже опубликован',
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, title='Отложенный пост',
+        pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    assert 'Отложенный пост' not in client.get('/').content.decode()
+    time.sleep(1.1)
+    assert 'Отложенный пост' in client.get('/').content.decode(), (
+        'Убедитесь, что кеш страницы истекает к моменту публикации '
+        'отложенного поста.'
+    )
+
+
+@pytest.mark.django_db
+def test_page_cache_invalidation_is_scoped(
+        client, mixer, user, post_with_published_location,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    other_category = mixer.blend('blog.Category', is_published=True)
+    mixer.blend(
+        'blog.Post', author=user, category=other_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    comment = mixer.blend('blog.Comment', post=post)
+    urls = {
+        'index': '/',
+        'category': f'/category/{post.category.slug}/',
+        'other_category': f'/category/{other_category.slug}/',
+        'profile': f'/profile/{post.author.username}/',
+        'detail': f'/posts/{post.id}/',
+    }
+
+    def cached():
+        result = set()
+        for name, url in urls.items():
+            with CaptureQueriesContext(connection) as queries:
+                client.get(url)
+            if not queries:
+                result.add(name)
+        return result
+
+    cached()
+    assert cached() == set(urls)
+    mixer.blend('auth.User')
+    assert cached() == set(urls), (
+        'Убедитесь, что регистрация пользователя не сбрасывает кеш страниц.'
+    )
+    comment.text = 'Новый текст'
+    comment.save()
+    assert cached() == set(urls) - {'detail'}, (
+        'Убедитесь, что правка комментария сбрасывает только страницу поста.'
+    )
+    post.title = 'Новый заголовок'
+    post.save()
+    assert cached() == {'other_category'}, (
+        'Убедитесь, что изменение поста не сбрасывает чужие категории.'
+    )
+    mixer.blend(
+        'blog.Post', author=user, category=other_category,
+        is_published=False,
+    )
+    assert cached() == {'index', 'detail', 'category'}, (
+        'Убедитесь, что скрытый пост не сбрасывает главную.'
+    )
@@ -0,0 +1,83 @@
+import base64
+import json
+from http import HTTPStatus
+
+import pytest
+
+
+def _walk(client, url, direction, cursor=None):
+    seen = []
+    while True:
+        query = {direction: cursor} if cursor else {}
+        response = client.get(url, query)
+        assert response.status_code == HTTPStatus.OK
+        page = response.context['page_obj']
+        ids = [post.id for post in page]
+        seen = seen + ids if direction == 'after' else ids + seen
+        cursor = (
+            page.next_cursor if direction == 'after'
+            else page.previous_cursor
+        )
+        if cursor is None:
+            return seen, page
+
+
+@pytest.mark.django_db
+def test_cursor_pagination_walks_whole_feed(
+        user_client, feed_posts, published_category
+):
+    expected = [
+        post.id for post in sorted(
+            feed_posts, key=lambda post: (-post.pub_date.timestamp(),
+                                          post.title, post.id)
+        )
+    ]
+    for url in (
+        '/',
+        f'/category/{published_category.slug}/',
+        f'/profile/{feed_posts[0].author.username}/',
+    ):
+        forward, last_page = _walk(user_client, url, 'after')
+        assert forward == expected, (
+            'Убедитесь, что переход по ссылкам `?after=` проходит ленту '
+            'целиком, без пропусков и повторов.'
+        )
+        backward, _ = _walk(
+            user_client, url, 'before', last_page.previous_cursor
+        )
+        assert backward + [post.id for post in last_page] == expected, (
+            'Убедитесь, что переход по ссылкам `?before=` возвращает '
+            'к началу ленты.'
+        )
+
+
+@pytest.mark.django_db
+def test_offset_pagination_fallback(user_client, feed_posts):
+    response = user_client.get('/', {'page': 3})
+    assert response.status_code == HTTPStatus.OK
+    assert len(response.context['page_obj']) == 5, (
+        'Убедитесь, что старые ссылки вида `?page=` продолжают работать.'
+    )
+
+
+@pytest.mark.django_db
+def test_invalid_cursor_returns_404(user_client, feed_posts):
+    for query in ({'after': 'not-a-cursor'}, {'before': 'W10'}):
+        response = user_client.get('/', query)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_cursor_with_wrong_value_types_returns_404(user_client, feed_posts):
+    for raw in ([123, 'a', 1], [{'a': 1}, 'a', 1], [True, 'a', 1]):
+        cursor = base64.urlsafe_b64encode(
+            json.dumps(raw).encode()
+        ).decode().rstrip('=')
+        response = user_client.get('/', {'after': cursor})
+        assert response.status_code == HTTPStatus.NOT_FOUND, (
+            'Убедитесь, что курсор с неверными типами значений даёт 404.'
+        )
+        response = user_client.get(
+            f'/posts/{feed_posts[0].pk}/', {'comments_after': cursor}
+        )
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,49 @@
+import pytest
+from django.template.defaultfilters import truncatewords
+
+import blogicum.constans as const
+from blog.cache import card_cache_stats
+
+
+@pytest.mark.django_db
+def test_post_card_cache_hits_and_invalidation(
+        user_client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get('/')
+    hits = card_cache_stats['hits']
+    user_client.get('/')
+    assert card_cache_stats['hits'] == hits + 1, (
+        'Убедитесь, что повторный показ ленты берёт карточку из кеша.'
+    )
+
+    post.category.title = 'Совсем новое название категории'
+    post.category.save()
+    post.author.username = 'renamed_author'
+    post.author.save()
+    content = user_client.get('/').content.decode('utf-8')
+    assert 'Совсем новое название категории' in content
+    assert '@renamed_author' in content, (
+        'Убедитесь, что карточка перерисовывается после изменения '
+        'категории или имени автора.'
+    )
+
+
+@pytest.mark.django_db
+def test_cache_metrics_are_exposed(client):
+    response = client.get('/metrics/', REMOTE_ADDR='127.0.0.1')
+    content = response.content.decode('utf-8')
+    assert 'blog_post_card_cache_hits_total' in content
+    assert 'blog_post_card_cache_misses_total' in content
+    assert client.get('/metrics/', REMOTE_ADDR='10.0.0.1').status_code == 404
+
+
+@pytest.mark.django_db
+def test_card_excerpt_matches_truncatewords(mixer, user, published_category):
+    text = ' '.join(f'слово{n}' for n in range(30))
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category, text=text
+    )
+    assert post.excerpt == truncatewords(
+        text, const.COUNT_WORDS_IN_EXCERPT
+    ), 'Убедитесь, что отрывок в карточке обрезается как truncatewords.'
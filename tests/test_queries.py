@@ -0,0 +1,72 @@
+import pytest
+
+pytestmark = pytest.mark.usefixtures('disable_page_cache')
+
+# Для авторизованного клиента два запроса уходят на сессию и пользователя,
+# главная делает ещё один запрос метки изменений; у категории, профиля и
+# поста метка приходит вместе с объектом.
+EXPECTED_QUERIES = {
+    'author': {
+        'index': 4,
+        'category': 4,
+        'profile': 4,
+        'detail': 4,
+        'edit_post': 6,
+        'delete_post': 5,
+        'edit_comment': 4,
+        'delete_comment': 4,
+    },
+    'another': {
+        'index': 4,
+        'category': 4,
+        'profile': 4,
+        'detail': 4,
+        'edit_post': 4,
+        'delete_post': 4,
+        'edit_comment': 4,
+        'delete_comment': 4,
+    },
+    'anonymous': {
+        'index': 2,
+        'category': 2,
+        'profile': 2,
+        'detail': 2,
+        'edit_post': 2,
+        'delete_post': 2,
+        'edit_comment': 2,
+        'delete_comment': 2,
+    },
+}
+
+
+@pytest.fixture
+def urls(mixer, user, post_with_published_location):
+    post = post_with_published_location
+    comment = mixer.blend('blog.Comment', post=post, author=user)
+    mixer.cycle(2).blend('blog.Comment', post=post)
+    return {
+        'index': '/',
+        'category': f'/category/{post.category.slug}/',
+        'profile': f'/profile/{user.username}/',
+        'detail': f'/posts/{post.id}/',
+        'edit_post': f'/posts/{post.id}/edit/',
+        'delete_post': f'/posts/{post.id}/delete/',
+        'edit_comment': f'/posts/{post.id}/edit_comment/{comment.id}',
+        'delete_comment': f'/posts/{post.id}/delete_comment/{comment.id}',
+    }
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('viewer', EXPECTED_QUERIES)
+def test_query_count_per_url(
+        viewer, urls, user_client, another_user_client, client,
+        django_assert_num_queries
+):
+    viewer_client = {
+        'author': user_client,
+        'another': another_user_client,
+        'anonymous': client,
+    }[viewer]
+    for name, expected in EXPECTED_QUERIES[viewer].items():
+        with django_assert_num_queries(expected):
+            viewer_client.get(urls[name])
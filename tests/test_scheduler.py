@@ -0,0 +1,60 @@
+import time
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from blog.models import Post
+from blog.scheduler import get_visibility
+
+
+@pytest.mark.django_db
+def test_epoch_changes_only_on_visibility_changes(
+        post_with_published_location
+):
+    post = post_with_published_location
+    epoch = get_visibility().epoch
+    first_sql = str(Post.published_posts.all().query)
+    assert str(Post.published_posts.all().query) == first_sql, (
+        'Убедитесь, что в пределах эпохи запрос опубликованных постов '
+        'не меняется от вызова к вызову.'
+    )
+
+    post.title = 'Новый заголовок'
+    post.save()
+    assert get_visibility().epoch == epoch, (
+        'Убедитесь, что правка текста поста не меняет эпоху видимости.'
+    )
+
+    post.is_published = False
+    post.save()
+    assert get_visibility().epoch != epoch, (
+        'Убедитесь, что снятие поста с публикации меняет эпоху видимости.'
+    )
+
+    epoch = get_visibility().epoch
+    post.category.is_published = False
+    post.category.save()
+    assert get_visibility().epoch != epoch, (
+        'Убедитесь, что снятие категории с публикации меняет эпоху.'
+    )
+
+
+@pytest.mark.django_db
+def test_epoch_advances_at_next_publication(mixer, user, published_category):
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(seconds=1),
+    )
+    state = get_visibility()
+    assert state.next_publication == post.pub_date
+    assert not Post.published_posts.filter(pk=post.pk).exists()
+
+    time.sleep(1.1)
+    call_command('run_publication_scheduler', once=True)
+    assert get_visibility().epoch != state.epoch
+    assert Post.published_posts.filter(pk=post.pk).exists(), (
+        'Убедитесь, что отложенный пост виден после наступления даты '
+        'публикации.'
+    )
@@ -0,0 +1,110 @@
+from datetime import timedelta
+from http import HTTPStatus
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
+
+from blog.models import Post
+
+
+@pytest.fixture
+def searchable_posts(mixer, user, published_category):
+    now = timezone.now()
+    common = dict(author=user, category=published_category)
+    return {
+        'title': mixer.blend(
+            'blog.Post', title='Сплав по горной реке', text='Отчёт.',
+            is_published=True, pub_date=now, **common
+        ),
+        'text': mixer.blend(
+            'blog.Post', title='Выходные',
+            text='Длинный рассказ о том, как мы ходили по реке на байдарке.',
+            is_published=True, pub_date=now, **common
+        ),
+        'hidden': mixer.blend(
+            'blog.Post', title='Река в черновике', text='Не показывать.',
+            is_published=False, pub_date=now, **common
+        ),
+        'future': mixer.blend(
+            'blog.Post', title='Река завтра', text='Отложенная публикация.',
+            is_published=True, pub_date=now + timedelta(days=1), **common
+        ),
+    }
+
+
+@pytest.mark.django_db
+def test_search_ranks_and_highlights(client, searchable_posts):
+    response = client.get('/search/', {'q': 'рек'})
+    assert response.status_code == HTTPStatus.OK
+    found = list(response.context['page_obj'])
+    assert [post.id for post in found] == [
+        searchable_posts['title'].id, searchable_posts['text'].id
+    ], (
+        'Убедитесь, что поиск находит только видимые публикации и ставит '
+        'совпадения в заголовке выше совпадений в тексте.'
+    )
+    content = response.content.decode('utf-8')
+    assert '<mark>реке</mark>' in content
+    assert '<mark>реке</mark> на байдарке' in content
+
+
+@pytest.mark.django_db
+def test_search_index_follows_changes(client, searchable_posts):
+    post = searchable_posts['text']
+    post.text = 'Теперь про <b>озеро</b>.'
+    post.save()
+    response = client.get('/search/', {'q': 'озеро'})
+    assert [p.id for p in response.context['page_obj']] == [post.id]
+    assert '&lt;b&gt;<mark>озеро</mark>&lt;/b&gt;' in (
+        response.content.decode('utf-8')
+    ), 'Убедитесь, что текст в сниппетах экранируется.'
+    post.delete()
+    response = client.get('/search/', {'q': 'озеро'})
+    assert not response.context['page_obj']
+
+
+@pytest.mark.django_db
+def test_search_keyset_pagination(client, mixer, user, published_category):
+    mixer.cycle(25).blend(
+        'blog.Post', title='Поход', text=(f'поход {n}' for n in range(25)),
+        author=user, category=published_category, is_published=True,
+        pub_date=timezone.now(),
+    )
+    seen, cursor = [], None
+    while True:
+        query = {'q': 'поход'}
+        if cursor:
+            query['after'] = cursor
+        page = client.get('/search/', query).context['page_obj']
+        seen += [post.id for post in page]
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(
+        Post.objects.values_list('id', flat=True)
+    )
+    assert len(seen) == len(set(seen))
+
+
+@pytest.mark.django_db
+def test_search_rejects_fts_syntax_and_rebuilds(client, searchable_posts):
+    response = client.get('/search/', {'q': '"рек* OR NEAR('})
+    assert response.status_code == HTTPStatus.OK
+    with connection.cursor() as cursor:
+        cursor.execute('DELETE FROM blog_post_fts')
+    call_command('rebuild_search_index', stdout=StringIO())
+    response = client.get('/search/', {'q': 'байдарке'})
+    assert [p.id for p in response.context['page_obj']] == [
+        searchable_posts['text'].id
+    ]
+
+
+@pytest.mark.django_db
+def test_admin_search_uses_index(admin_client, searchable_posts):
+    response = admin_client.get('/admin/blog/post/', {'q': 'байдарк'})
+    assert list(response.context['cl'].result_list) == [
+        searchable_posts['text']
+    ]
@@ -0,0 +1,87 @@
+import logging
+import re
+import time
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from core import timing
+from core.timing import measure
+
+SERVER_TIMING = re.compile(
+    r'^db;dur=[\d.]+;desc="(\d+) queries", tpl;dur=([\d.]+), '
+    r'view;dur=[\d.]+, total;dur=[\d.]+$'
+)
+
+
+@pytest.fixture(autouse=True)
+def sample_every_request(settings):
+    settings.SERVER_TIMING_SAMPLE_RATE = 1
+
+
+@pytest.mark.django_db
+def test_server_timing_header(client, post_with_published_location):
+    with CaptureQueriesContext(connection) as queries:
+        response = client.get(f'/posts/{post_with_published_location.pk}/')
+    assert response.status_code == 200
+    match = SERVER_TIMING.match(response['Server-Timing'])
+    assert match, (
+        'Убедитесь, что ответ содержит заголовок Server-Timing '
+        'с временем БД, шаблонов и обработки.'
+    )
+    assert int(match[1]) == len(queries)
+    assert float(match[2]) > 0
+
+
+@pytest.mark.django_db
+def test_server_timing_log_line(client, caplog):
+    with caplog.at_level(logging.INFO, logger='core.middleware'):
+        client.get('/pages/about/')
+    record, = caplog.records
+    assert record.getMessage().startswith('method=GET path=/pages/about/ ')
+    assert record.timing['status'] == 200
+    assert record.timing['template_ms'] > 0
+
+
+@pytest.mark.django_db
+def test_queries_from_templates_are_counted_once(
+        user_client, caplog, monkeypatch
+):
+    record_query = timing._record_query
+
+    def slow_query(execute, *args):
+        def slow_execute(*args):
+            time.sleep(0.02)
+            return execute(*args)
+        return record_query(slow_execute, *args)
+
+    monkeypatch.setattr(timing, '_record_query', slow_query)
+    # Пользователь сессии загружается, только когда шаблон к нему обратится.
+    with caplog.at_level(logging.INFO, logger='core.middleware'):
+        user_client.get('/pages/about/')
+    fields = caplog.records[-1].timing
+    assert fields['queries'] > 0
+    parts = fields['db_ms'] + fields['template_ms'] + fields['view_ms']
+    assert parts == pytest.approx(fields['total_ms'], abs=5), (
+        'Убедитесь, что запросы из шаблонов не попадают одновременно '
+        'во время БД и во время шаблонов.'
+    )
+
+
+@pytest.mark.django_db
+def test_server_timing_sampling(client, settings, caplog):
+    settings.SERVER_TIMING_SAMPLE_RATE = 0
+    with caplog.at_level(logging.INFO, logger='core.middleware'):
+        response = client.get('/pages/about/')
+    assert 'Server-Timing' not in response
+    assert not caplog.records
+
+
+@pytest.mark.django_db
+def test_nested_measure_adds_to_outer(client):
+    with measure() as outer:
+        response = client.get('/')
+    inner = SERVER_TIMING.match(response['Server-Timing'])
+    assert outer.queries == int(inner[1]) > 0
+    assert outer.template_time > 0